@@ -0,0 +1,134 @@
+# Benchmark de los índices de la migración v003.
+# Genera un conjunto de datos sintético, mide las consultas frecuentes sin los
+# índices (base "anterior" a la migración), aplica las migraciones y vuelve a medir.
+# Muestra el plan de ejecución (EXPLAIN) y la mediana de tiempo de cada consulta.
+#
+# Uso (desde backend/):
+#   python benchmarks/bench_indices.py                       SQLite temporal
+#   python benchmarks/bench_indices.py --url mysql+pymysql://u:p@localhost/bench --egresados 100000
+# La URL debe apuntar a una base de pruebas vacía: el script crea y borra todas las tablas.
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, time as hora, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine, insert, select, text
+from src.config.db import Base
+from src.migrations.runner import migrar, Egresado, Reunion, Notificacion, Auditoria
+from src.migrations.versiones.v003_indices_consultas_frecuentes import INDICES
+
+CARRERAS = ["Ingeniería de Sistemas", "Derecho", "Medicina", "Contabilidad", "Arquitectura", "Psicología", "Educación", "Enfermería"]
+CIUDADES = ["Lima", "Arequipa", "Cusco", "Trujillo", "Piura", "Chiclayo", "Iquitos", "Tacna", "Puno", "Huancayo"]
+ESTADOS = ["pendiente", "confirmada", "cancelada", "realizada"]
+
+
+def generar_datos(engine, n_egresados, lote=5000):
+    rnd = random.Random(42)
+    inicio = date(2024, 1, 1)
+    with engine.begin() as conn:
+        for desde in range(0, n_egresados, lote):
+            conn.execute(insert(Egresado), [{
+                "id": f"E{i}", "usuario_dni": f"{10000000 + i}", "nombres": "Nombre", "apellidos": "Apellido",
+                "email": f"egresado{i}@correo.com", "password": "x", "carrera_profesional": rnd.choice(CARRERAS),
+                "anio_egreso": rnd.randint(1995, 2024), "ciudad": rnd.choice(CIUDADES), "genero": rnd.choice(["Masculino", "Femenino"])
+            } for i in range(desde, min(desde + lote, n_egresados))])
+        for desde in range(0, n_egresados * 2, lote):
+            conn.execute(insert(Reunion), [{
+                "egresado_id": f"E{rnd.randrange(n_egresados)}",
+                "fecha": inicio + timedelta(days=rnd.randrange(365)),
+                "hora": hora(rnd.randint(8, 17), rnd.choice([0, 30])),
+                "estado": rnd.choice(ESTADOS)
+            } for _ in range(lote)])
+            conn.execute(insert(Notificacion), [{
+                "usuario_id": f"E{rnd.randrange(n_egresados)}", "tipo_usuario": "egresado", "titulo": "t", "mensaje": "m",
+                "fecha_envio": datetime(2024, 1, 1) + timedelta(minutes=rnd.randrange(525600))
+            } for _ in range(lote)])
+            conn.execute(insert(Auditoria), [{
+                "usuario_id": rnd.randrange(500), "accion": "accion", "fecha": datetime(2024, 1, 1)
+            } for _ in range(lote)])
+
+
+CONSULTAS = {
+    "egresados por carrera y año": select(Egresado).where(Egresado.carrera_profesional == "Derecho", Egresado.anio_egreso == 2020),
+    "egresados por año": select(Egresado).where(Egresado.anio_egreso == 2010),
+    "egresados por ciudad": select(Egresado).where(Egresado.ciudad == "Tacna"),
+    "reuniones pendientes": select(Reunion).where(Reunion.estado == "pendiente"),
+    "reservar_reunion (fecha, hora, estado)": select(Reunion).where(
+        Reunion.fecha == date(2024, 6, 3), Reunion.hora == hora(10, 30), Reunion.estado == "pendiente"
+    ).limit(1),
+    "historial de un egresado": select(Reunion).where(Reunion.egresado_id == "E123"),
+    "notificaciones de usuario": select(Notificacion).where(
+        Notificacion.usuario_id == "E123", Notificacion.tipo_usuario == "egresado"
+    ).order_by(Notificacion.fecha_envio.desc()),
+    "auditoría de usuario": select(Auditoria).where(Auditoria.usuario_id == 42),
+}
+
+
+def plan(conn, consulta):
+    sql = str(consulta.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+    prefijo = "EXPLAIN QUERY PLAN" if conn.dialect.name == "sqlite" else "EXPLAIN"
+    filas = conn.execute(text(f"{prefijo} {sql}")).all()
+    if conn.dialect.name == "sqlite":
+        return "; ".join(f[-1] for f in filas)
+    return "; ".join(str(dict(f._mapping)) for f in filas)
+
+
+def medir(engine, repeticiones):
+    resultados = {}
+    with engine.connect() as conn:
+        for nombre, consulta in CONSULTAS.items():
+            tiempos = []
+            for _ in range(repeticiones):
+                inicio = time.perf_counter()
+                conn.execute(consulta).all()
+                tiempos.append((time.perf_counter() - inicio) * 1000)
+            resultados[nombre] = (statistics.median(tiempos), plan(conn, consulta))
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de índices antes y después de las migraciones")
+    parser.add_argument("--url", help="URL de una base de pruebas vacía (por defecto, SQLite temporal)")
+    parser.add_argument("--egresados", type=int, default=50000)
+    parser.add_argument("--repeticiones", type=int, default=20)
+    args = parser.parse_args()
+
+    directorio = None
+    if not args.url:
+        directorio = tempfile.TemporaryDirectory()
+        args.url = f"sqlite:///{os.path.join(directorio.name, 'bench.db')}"
+    engine = create_engine(args.url)
+    try:
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            # Estado anterior a la migración: sin los índices de v003
+            for nombre in INDICES:
+                indice = next(i for t in Base.metadata.tables.values() for i in t.indexes if i.name == nombre)
+                indice.drop(conn)
+        print(f"Generando {args.egresados} egresados, {args.egresados * 2} reuniones/notificaciones/auditorías...")
+        generar_datos(engine, args.egresados)
+        antes = medir(engine, args.repeticiones)
+        migrar(engine)
+        despues = medir(engine, args.repeticiones)
+
+        for nombre in CONSULTAS:
+            ms_antes, plan_antes = antes[nombre]
+            ms_despues, plan_despues = despues[nombre]
+            print(f"\n{nombre}: {ms_antes:.2f} ms -> {ms_despues:.2f} ms (x{ms_antes / max(ms_despues, 1e-6):.1f})")
+            print(f"  antes:   {plan_antes}")
+            print(f"  después: {plan_despues}")
+    finally:
+        Base.metadata.drop_all(engine)
+        engine.dispose()
+        if directorio:
+            directorio.cleanup()
+
+
+if __name__ == "__main__":
+    main()
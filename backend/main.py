@@ -1,4 +1,4 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from src.feacture.egresado.controller.egresado_controller import router as egresado_router
 from src.feacture.egresado.controller.importacion_egresado_controller import router as importacion_egresado_router
@@ -9,6 +9,10 @@ from src.feacture.usuario.controller.usuario_controller import router as usuario
 from src.feacture.auditoria.controller.auditoria_controller import router as auditoria_router
 from src.feacture.taller.controller.taller_controller import router as taller_router
 from src.utils.scheduler import scheduler
+from src.feacture.notificacion.service.notificacion_service import entrega_correos
+from src.config.db_async import DB_ASYNC
+from src.config import metricas as metricas_config
+from src.utils.sql_metrics import iniciar_medicion, finalizar_medicion, agregar_al_terminar
 
 app = FastAPI(
     title="FastAPI App",
@@ -23,8 +27,47 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allows all methods
     allow_headers=["*"],  # Allows all headers
+    expose_headers=["X-DB-Query-Count", "X-DB-Time-ms", "X-DB-Repeated-Queries", "X-Next-Cursor"],
 )
 
+# Métricas de SQL por petición: cabeceras X-DB-* y acumulado en /auditoria/metricas-sql.
+# Las respuestas en streaming (sin Content-Length: exportaciones CSV/NDJSON, Excel,
+# PDF) consultan la BD mientras se envía el cuerpo, después de las cabeceras; para
+# ellas no se envían X-DB-* y la medición se acumula al terminar el envío.
+if metricas_config.SQL_METRICAS:
+    def _nombre_ruta(request):
+        ruta = request.scope.get("route")
+        # Se agrupa por plantilla de ruta (/egresado/{dni}), no por URL concreta
+        return f"{request.method} {ruta.path}" if ruta else None
+
+    @app.middleware("http")
+    async def medir_sql(request: Request, call_next):
+        medicion, token = iniciar_medicion("sin ruta")
+        try:
+            response = await call_next(request)
+        except Exception:
+            finalizar_medicion(medicion, token, _nombre_ruta(request))
+            raise
+        if "content-length" in response.headers:
+            finalizar_medicion(medicion, token, _nombre_ruta(request))
+            response.headers.update(medicion.cabeceras())
+        else:
+            finalizar_medicion(medicion, token, _nombre_ruta(request), agregar=False)
+            response.body_iterator = agregar_al_terminar(response.body_iterator, medicion)
+        return response
+
+# Con DB_ASYNC=true las lecturas más usadas se atienden con el motor asíncrono;
+# sus routers van primero para tomar las rutas que comparten con los síncronos
+if DB_ASYNC:
+    from src.feacture.egresado.controller.egresado_controller_async import router as egresado_async_router
+    from src.feacture.calendario_encargado.controller.calendario_controller_async import router as calendario_async_router
+    from src.feacture.notificacion.controller.notificacion_controller_async import router as notificacion_async_router
+    from src.feacture.reporte.controller.reporte_controller_async import router as reporte_async_router
+    app.include_router(egresado_async_router, prefix="/egresado", tags=["Egresado"])
+    app.include_router(calendario_async_router, prefix="/calendario", tags=["Calendario y Reuniones"])
+    app.include_router(notificacion_async_router, prefix="/notificacion", tags=["Notificaciones"])
+    app.include_router(reporte_async_router, prefix="/reporte", tags=["Reportes y Estadísticas"])
+
 app.include_router(egresado_router, prefix="/egresado", tags=["Egresado"])
 app.include_router(importacion_egresado_router, prefix="/egresado/importacion", tags=["Importación Egresados"])
 app.include_router(calendario_router, prefix="/calendario", tags=["Calendario y Reuniones"])
@@ -37,6 +80,9 @@ app.include_router(taller_router, prefix="/taller", tags=["Talleres"])
 # Iniciar el scheduler de tareas automáticas
 scheduler.start()
 
+# Iniciar los workers que entregan la bandeja de salida de correos
+entrega_correos.iniciar()
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to FastAPI"}
@@ -0,0 +1,9 @@
+# Configuración del índice de búsqueda de egresados en memoria
+import os
+
+# Cada cuánto se reconstruye desde la BD (recoge cambios hechos por otros procesos/workers)
+INDICE_BUSQUEDA_REFRESCO_MINUTOS = int(os.getenv("INDICE_BUSQUEDA_REFRESCO_MINUTOS", 30))
+
+# Caché de facetas (conteos por carrera/género/ciudad/año) por combinación de filtros
+FACETAS_CACHE_SEGUNDOS = int(os.getenv("FACETAS_CACHE_SEGUNDOS", 300))
+FACETAS_CACHE_ENTRADAS = int(os.getenv("FACETAS_CACHE_ENTRADAS", 256))
@@ -0,0 +1,50 @@
+# Motor asíncrono de SQLAlchemy 2.0 para los endpoints de solo lectura más usados.
+# Se activa con DB_ASYNC=true; si no, la API usa únicamente el motor síncrono de db.py.
+import os
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from src.config.db import DATABASE_URL, opciones_engine
+
+DB_ASYNC = os.getenv("DB_ASYNC", "false").lower() == "true"
+
+
+def _url_async(url):
+    # mysql+pymysql -> mysql+aiomysql, sqlite -> sqlite+aiosqlite
+    if url.startswith("mysql+pymysql://"):
+        return url.replace("mysql+pymysql://", "mysql+aiomysql://", 1)
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    return url
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _url_async(DATABASE_URL)
+
+_async_engine = None
+_AsyncSessionLocal = None
+
+
+def crear_async_engine(url=None):
+    url = url or ASYNC_DATABASE_URL
+    opciones = opciones_engine(url)
+    opciones.pop("connect_args", None)
+    return create_async_engine(url, **opciones)
+
+
+def obtener_async_sessionmaker():
+    # El motor se crea recién al primer uso, así aiomysql/aiosqlite solo son
+    # necesarios cuando el modo asíncrono está activo
+    global _async_engine, _AsyncSessionLocal
+    if _AsyncSessionLocal is None:
+        _async_engine = crear_async_engine()
+        _AsyncSessionLocal = async_sessionmaker(_async_engine, class_=AsyncSession, expire_on_commit=False)
+    return _AsyncSessionLocal
+
+
+async def get_async_db():
+    """Dependencia de FastAPI: una AsyncSession por petición."""
+    async with obtener_async_sessionmaker()() as session:
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
@@ -1,6 +1,16 @@
 # Configuración de correo para notificaciones automáticas
+import os
+
 EMAIL_SMTP_SERVER = "smtp.gmail.com"
 EMAIL_SMTP_PORT = 587
 EMAIL_SMTP_USER = "tucorreo@gmail.com"  # Cambia por el correo real
 EMAIL_SMTP_PASSWORD = "tu_contraseña"   # Cambia por la contraseña real
 EMAIL_FROM_NAME = "Sistema Egresados"
+EMAIL_STARTTLS = os.getenv("EMAIL_STARTTLS", "true").lower() == "true"
+
+# Pool de conexiones SMTP autenticadas compartido por todo el proceso
+EMAIL_POOL_SIZE = int(os.getenv("EMAIL_POOL_SIZE", 3))
+EMAIL_POOL_TIMEOUT = float(os.getenv("EMAIL_POOL_TIMEOUT", 30))         # espera por una conexión libre
+EMAIL_POOL_IDLE_SECONDS = float(os.getenv("EMAIL_POOL_IDLE_SECONDS", 60))  # se cierran tras este tiempo sin uso
+EMAIL_POOL_CHECK_SECONDS = float(os.getenv("EMAIL_POOL_CHECK_SECONDS", 10))  # NOOP antes de reusar una conexión ociosa
+EMAIL_SMTP_TIMEOUT = float(os.getenv("EMAIL_SMTP_TIMEOUT", 20))
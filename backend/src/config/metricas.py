@@ -0,0 +1,6 @@
+# Configuración de la instrumentación de SQL por petición
+import os
+
+SQL_METRICAS = os.getenv("SQL_METRICAS", "true").lower() == "true"
+SQL_CONSULTAS_LENTAS = int(os.getenv("SQL_CONSULTAS_LENTAS", 5))  # sentencias más lentas que se guardan
+SQL_UMBRAL_REPETIDAS = int(os.getenv("SQL_UMBRAL_REPETIDAS", 5))  # misma sentencia N veces => posible N+1
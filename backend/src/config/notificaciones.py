@@ -0,0 +1,12 @@
+# Configuración de la bandeja de salida de correos (outbox) y sus workers de entrega
+import os
+
+OUTBOX_WORKERS = int(os.getenv("OUTBOX_WORKERS", 1))            # hilos de entrega (0 = no se inician)
+OUTBOX_LOTE = int(os.getenv("OUTBOX_LOTE", 50))                 # correos reclamados y enviados por vuelta
+OUTBOX_INTERVALO_SEGUNDOS = float(os.getenv("OUTBOX_INTERVALO_SEGUNDOS", 5))  # espera cuando no hay pendientes
+OUTBOX_MAX_INTENTOS = int(os.getenv("OUTBOX_MAX_INTENTOS", 6))  # luego pasa a 'fallido' (dead-letter)
+OUTBOX_BACKOFF_SEGUNDOS = float(os.getenv("OUTBOX_BACKOFF_SEGUNDOS", 30))  # 30s, 60s, 120s, ...
+OUTBOX_BACKOFF_MAX_SEGUNDOS = float(os.getenv("OUTBOX_BACKOFF_MAX_SEGUNDOS", 3600))
+OUTBOX_LEASE_SEGUNDOS = int(os.getenv("OUTBOX_LEASE_SEGUNDOS", 300))  # 'enviando' más antiguo se vuelve a reclamar
+OUTBOX_RETENCION_DIAS = int(os.getenv("OUTBOX_RETENCION_DIAS", 30))  # correos enviados que se conservan
+OUTBOX_PURGA_HORA = int(os.getenv("OUTBOX_PURGA_HORA", 3))  # hora del día en que se purgan los enviados
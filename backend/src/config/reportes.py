@@ -0,0 +1,26 @@
+# Configuración de los reportes (/reporte/*)
+import os
+
+# Caché de resultados; se invalida ante cualquier alta/cambio de reuniones o egresados
+REPORTES_CACHE_SEGUNDOS = int(os.getenv("REPORTES_CACHE_SEGUNDOS", 120))
+REPORTES_CACHE_ENTRADAS = int(os.getenv("REPORTES_CACHE_ENTRADAS", 512))
+
+# Exportación a Excel/PDF: pool de render acotado (si está lleno se responde 503)
+REPORTES_EXPORTACION_WORKERS = int(os.getenv("REPORTES_EXPORTACION_WORKERS", 2))
+REPORTES_EXPORTACION_MAX_PENDIENTES = int(os.getenv("REPORTES_EXPORTACION_MAX_PENDIENTES", 8))
+# Hasta este tamaño el archivo se arma en memoria; por encima pasa a un temporal propio de la petición
+REPORTES_EXPORTACION_MEMORIA_BYTES = int(os.getenv("REPORTES_EXPORTACION_MEMORIA_BYTES", 5 * 1024 * 1024))
+
+# Rollup diario de reuniones (reuniones_diarias): hora de la compactación nocturna
+REPORTES_ROLLUP_HORA_COMPACTACION = int(os.getenv("REPORTES_ROLLUP_HORA_COMPACTACION", 3))
+# Rango por defecto de /reporte/rango, /tendencia y /participacion-carreras
+REPORTES_RANGO_DIAS_POR_DEFECTO = int(os.getenv("REPORTES_RANGO_DIAS_POR_DEFECTO", 365))
+
+# Snapshot en memoria egresados × reuniones para /reporte/cohortes
+REPORTES_SNAPSHOT_REFRESCO_MINUTOS = int(os.getenv("REPORTES_SNAPSHOT_REFRESCO_MINUTOS", 15))
+
+# Reportes pesados en segundo plano (POST /reporte/trabajos) y sus archivos generados
+REPORTES_TRABAJOS_WORKERS = int(os.getenv("REPORTES_TRABAJOS_WORKERS", 1))
+REPORTES_TRABAJOS_MAX_PENDIENTES = int(os.getenv("REPORTES_TRABAJOS_MAX_PENDIENTES", 5))
+REPORTES_ARTEFACTOS_DIR = os.getenv("REPORTES_ARTEFACTOS_DIR", "artefactos/reportes")
+REPORTES_ARTEFACTOS_RETENCION_HORAS = int(os.getenv("REPORTES_ARTEFACTOS_RETENCION_HORAS", 24))
@@ -0,0 +1,15 @@
+# Configuración de verificación de contraseñas y control de admisión del login
+import os
+
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", min(4, os.cpu_count() or 1)))  # hilos dedicados a bcrypt
+HASH_MAX_PENDIENTES = int(os.getenv("HASH_MAX_PENDIENTES", 64))  # en cola + en proceso; más => 503
+
+# Cubos de tokens: capacidad = ráfaga permitida, recarga = intentos por segundo sostenidos
+LOGIN_CUENTA_CAPACIDAD = int(os.getenv("LOGIN_CUENTA_CAPACIDAD", 5))
+LOGIN_CUENTA_POR_SEGUNDO = float(os.getenv("LOGIN_CUENTA_POR_SEGUNDO", 1 / 12))  # 5 por minuto
+LOGIN_GLOBAL_CAPACIDAD = int(os.getenv("LOGIN_GLOBAL_CAPACIDAD", 100))
+LOGIN_GLOBAL_POR_SEGUNDO = float(os.getenv("LOGIN_GLOBAL_POR_SEGUNDO", 30))
+LOGIN_MAX_CUENTAS = int(os.getenv("LOGIN_MAX_CUENTAS", 10000))  # cubos por cuenta en memoria (LRU)
+
+# Lista de revocación de JWT: cada cuánto se recarga de la BD (cambios hechos por otros procesos)
+REVOCACION_REFRESCO_SEGUNDOS = int(os.getenv("REVOCACION_REFRESCO_SEGUNDOS", 30))
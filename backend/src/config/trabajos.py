@@ -0,0 +1,7 @@
+# Configuración de los trabajos de importación en segundo plano
+import os
+
+IMPORTACION_WORKERS = int(os.getenv("IMPORTACION_WORKERS", 2))  # importaciones simultáneas
+IMPORTACION_MAX_PENDIENTES = int(os.getenv("IMPORTACION_MAX_PENDIENTES", 10))  # en cola + en proceso
+IMPORTACION_UPLOAD_DIR = os.getenv("IMPORTACION_UPLOAD_DIR", "uploads/importaciones")
+IMPORTACION_PROCESOS = int(os.getenv("IMPORTACION_PROCESOS", os.cpu_count() or 1))  # procesos del pool compartido de importación por lote
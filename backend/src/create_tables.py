@@ -1,15 +1,9 @@
-# Script para crear las tablas de la base de datos usando SQLAlchemy
-from src.config.db import Base, engine
-from src.feacture.egresado.model.egresado import Egresado
-from src.feacture.egresado.model.importacion_egresado import ImportacionEgresado
-from src.feacture.taller.model.taller import Taller
-from src.feacture.reunion.model.reunion import Reunion
-from src.feacture.notificacion.model.notificacion import Notificacion
-from src.feacture.usuario.model.usuario import Usuario
-from src.feacture.rol.model.rol import Rol
-from src.feacture.auditoria.model.auditoria import Auditoria
+# Script para crear o actualizar las tablas de la base de datos.
+# Aplica las migraciones pendientes (ver src/migrations); equivale a `python -m src.migrations`.
+from src.config.db import engine
+from src.migrations.runner import migrar
 
 if __name__ == "__main__":
-    print("Creando tablas en la base de datos...")
-    Base.metadata.create_all(bind=engine)
-    print("¡Tablas creadas!")
+    print("Aplicando migraciones en la base de datos...")
+    aplicadas = migrar(engine)
+    print(f"¡Tablas actualizadas! Migraciones aplicadas: {aplicadas or 'ninguna pendiente'}")
@@ -1,12 +1,21 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
 from src.feacture.auditoria.service.auditoria_service import AuditoriaService
 from src.feacture.auditoria.dto.auditoria_dto import AuditoriaDTO
+from sqlalchemy.orm import Session
+from src.config.db import get_db
+from src.feacture.auditoria.repository.auditoria_repository import AuditoriaRepository
+from src.utils.auth import AuthService, limitador_login
+from src.utils.sql_metrics import metricas_sql
+from src.utils.hashing import pool_hash
 
 router = APIRouter()
-service = AuditoriaService()
+auth_service = AuthService()
+
+def get_service(db: Session = Depends(get_db)):
+    return AuditoriaService(AuditoriaRepository(db))
 
 @router.post('/')
-def registrar_auditoria(data: dict):
+def registrar_auditoria(data: dict, service=Depends(get_service)):
     try:
         auditoria_dto = AuditoriaDTO(**data)
         return service.registrar(auditoria_dto)
@@ -14,9 +23,22 @@ def registrar_auditoria(data: dict):
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get('/')
-def listar_auditoria():
+def listar_auditoria(service=Depends(get_service)):
     return service.listar()
 
 @router.get('/usuario/{usuario_id}')
-def listar_auditoria_usuario(usuario_id: int):
+def listar_auditoria_usuario(usuario_id: int, service=Depends(get_service)):
     return service.listar_por_usuario(usuario_id)
+
+@router.get('/metricas-sql')
+def metricas_sql_por_ruta(user=Depends(auth_service.require_role("admin"))):
+    return metricas_sql.resumen()
+
+@router.delete('/metricas-sql')
+def reiniciar_metricas_sql(user=Depends(auth_service.require_role("admin"))):
+    metricas_sql.reiniciar()
+    return {"msg": "Métricas reiniciadas"}
+
+@router.get('/metricas-login')
+def metricas_login(user=Depends(auth_service.require_role("admin"))):
+    return {"hash": pool_hash.estadisticas(), "admision": limitador_login.estadisticas()}
@@ -1,9 +1,10 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index
 from src.config.db import Base
 from datetime import datetime
 
 class Auditoria(Base):
     __tablename__ = "auditoria"
+    __table_args__ = (Index("ix_auditoria_usuario_id", "usuario_id"),)
     id = Column(Integer, primary_key=True, autoincrement=True)
     usuario_id = Column(Integer, nullable=False)
     accion = Column(String(100), nullable=False)
@@ -3,8 +3,8 @@ from src.config.db import SessionLocal
 from sqlalchemy.orm import Session
 
 class AuditoriaRepository:
-    def __init__(self):
-        self.db: Session = SessionLocal()
+    def __init__(self, db: Session = None):
+        self.db: Session = db or SessionLocal()
 
     def registrar(self, auditoria_dto):
         auditoria = Auditoria(
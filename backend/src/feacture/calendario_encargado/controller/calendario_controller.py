@@ -1,7 +1,10 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
 
 from src.feacture.calendario_encargado.service.calendario_service import CalendarioService
 from src.feacture.calendario_encargado.dto.calendario_dto import FechaDisponibleDTO, SolicitudReunionDTO, EstadoReunionDTO
+from sqlalchemy.orm import Session
+from src.config.db import get_db
+from src.feacture.calendario_encargado.repository.calendario_repository import CalendarioRepository
 
 """
 Controlador de la API para la gestión del calendario de reuniones de encargados.
@@ -16,14 +19,16 @@ Este controlador utiliza el servicio CalendarioService para manejar la lógica d
 """
 
 router = APIRouter()
-service = CalendarioService()
+
+def get_service(db: Session = Depends(get_db)):
+    return CalendarioService(CalendarioRepository(db))
 
 @router.get('/fechas-disponibles')
-def listar_fechas_disponibles():
+def listar_fechas_disponibles(service=Depends(get_service)):
     return service.listar_fechas_disponibles()
 
 @router.post('/solicitar-reunion')
-def solicitar_reunion(data: dict):
+def solicitar_reunion(data: dict, service=Depends(get_service)):
     try:
         solicitud_dto = SolicitudReunionDTO(**data)
         return service.solicitar_reunion(solicitud_dto)
@@ -31,7 +36,7 @@ def solicitar_reunion(data: dict):
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.put('/cambiar-estado-reunion')
-def cambiar_estado_reunion(data: dict):
+def cambiar_estado_reunion(data: dict, service=Depends(get_service)):
     try:
         estado_dto = EstadoReunionDTO(**data)
         return service.cambiar_estado_reunion(estado_dto)
@@ -39,5 +44,5 @@ def cambiar_estado_reunion(data: dict):
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get('/historial-reuniones/{egresado_id}')
-def historial_reuniones_egresado(egresado_id: str):
+def historial_reuniones_egresado(egresado_id: str, service=Depends(get_service)):
     return service.historial_reuniones_egresado(egresado_id)
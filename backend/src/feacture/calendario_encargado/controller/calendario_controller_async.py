@@ -0,0 +1,19 @@
+# Endpoints de disponibilidad del calendario sobre el motor asíncrono (DB_ASYNC=true).
+from fastapi import APIRouter, Depends
+from src.feacture.calendario_encargado.service.calendario_service import CalendarioService
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.config.db_async import get_async_db
+from src.feacture.calendario_encargado.repository.calendario_repository_async import CalendarioRepositoryAsync
+
+router = APIRouter()
+
+def get_service(db: AsyncSession = Depends(get_async_db)):
+    return CalendarioService(CalendarioRepositoryAsync(db))
+
+@router.get('/fechas-disponibles')
+async def listar_fechas_disponibles(service=Depends(get_service)):
+    return await service.listar_fechas_disponibles()
+
+@router.get('/historial-reuniones/{egresado_id}')
+async def historial_reuniones_egresado(egresado_id: str, service=Depends(get_service)):
+    return await service.historial_reuniones_egresado(egresado_id)
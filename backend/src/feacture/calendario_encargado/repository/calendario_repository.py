@@ -1,12 +1,16 @@
 from src.feacture.calendario_encargado.model.calendario import FechasDisponibles, HistorialEstado
 from src.feacture.reunion.model.reunion import Reunion
+from src.feacture.reunion.repository.reunion_repository import REUNIONES_MODIFICADAS
+from src.feacture.reporte.repository.resumen_reunion_repository import ResumenReunionRepository, foto
 from src.config.db import SessionLocal
+from src.utils.eventos import emitir
 from sqlalchemy.orm import Session
 from datetime import date, time
 
 class CalendarioRepository:
-    def __init__(self):
-        self.db: Session = SessionLocal()
+    def __init__(self, db: Session = None):
+        self.db: Session = db or SessionLocal()
+        self.resumen = ResumenReunionRepository(self.db)
 
     def listar_fechas_disponibles(self):
         return self.db.query(FechasDisponibles).filter_by(estado="disponible").all()
@@ -16,22 +20,26 @@ class CalendarioRepository:
         existe = self.db.query(Reunion).filter_by(fecha=fecha, hora=hora, estado="pendiente").first()
         if existe:
             raise ValueError("La fecha y hora ya están reservadas")
-        reunion = Reunion(egresado_id=egresado_id, fecha=fecha, hora=hora, observaciones=observaciones)
+        reunion = Reunion(egresado_id=egresado_id, fecha=fecha, hora=hora, observaciones=observaciones, estado="pendiente")
         self.db.add(reunion)
+        self.resumen.ajustar(None, foto(reunion))
         self.db.commit()
         self.db.refresh(reunion)
+        emitir(REUNIONES_MODIFICADAS, reunion_id=reunion.id)
         return reunion
 
     def cambiar_estado_reunion(self, reunion_id, estado, observaciones=None):
         reunion = self.db.query(Reunion).filter_by(id=reunion_id).first()
         if not reunion:
             raise ValueError("Reunión no encontrada")
+        anterior = foto(reunion)
         reunion.estado = estado
-        self.db.commit()
-        # Registrar en historial
+        self.resumen.ajustar(anterior, foto(reunion))
+        # Registrar en historial (misma transacción que el cambio de estado y los contadores)
         historial = HistorialEstado(reunion_id=reunion_id, estado=estado, fecha_cambio=date.today(), observaciones=observaciones)
         self.db.add(historial)
         self.db.commit()
+        emitir(REUNIONES_MODIFICADAS, reunion_id=reunion_id)
         return True
 
     def historial_reuniones_egresado(self, egresado_id):
@@ -0,0 +1,18 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.feacture.calendario_encargado.model.calendario import FechasDisponibles
+from src.feacture.reunion.model.reunion import Reunion
+
+# Variante asíncrona (DB_ASYNC=true) de las consultas de disponibilidad de CalendarioRepository
+
+class CalendarioRepositoryAsync:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def listar_fechas_disponibles(self):
+        result = await self.db.execute(select(FechasDisponibles).where(FechasDisponibles.estado == "disponible"))
+        return result.scalars().all()
+
+    async def historial_reuniones_egresado(self, egresado_id):
+        result = await self.db.execute(select(Reunion).where(Reunion.egresado_id == egresado_id))
+        return result.scalars().all()
@@ -1,16 +1,23 @@
 # Controlador de egresados (FastAPI ejemplo)
 # Autor: GitHub Copilot
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from src.feacture.egresado.service.egresado_service import EgresadoService
-from src.feacture.egresado.repository.egresado_repository import EgresadoRepository
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from fastapi.responses import StreamingResponse
+from src.feacture.egresado.service.egresado_service import EgresadoService, FORMATOS_EXPORTACION
+from src.feacture.egresado.repository.egresado_repository import EgresadoRepository, LIMITE_POR_DEFECTO, LIMITE_MAXIMO
 from src.feacture.egresado.dto.egresado_dto import EgresadoRegistroDTO, EgresadoContactoDTO
+from sqlalchemy.orm import Session
+from src.config.db import get_db
+from src.utils.auth import AuthService
 
 router = APIRouter()
-service = EgresadoService(EgresadoRepository())
+auth_service = AuthService()
+
+def get_service(db: Session = Depends(get_db)):
+    return EgresadoService(EgresadoRepository(db))
 
 @router.post('/registro', status_code=201)
-def registrar_egresado(data: dict):
+def registrar_egresado(data: dict, service=Depends(get_service)):
     try:
         egresado_dto = EgresadoRegistroDTO(**data)
         service.registrar_egresado(egresado_dto)
@@ -19,7 +26,7 @@ def registrar_egresado(data: dict):
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.put('/perfil')
-def editar_perfil(dni: str, data: dict):
+def editar_perfil(dni: str, data: dict, service=Depends(get_service)):
     try:
         egresado_dto = EgresadoRegistroDTO(**data)
         service.editar_perfil(dni, egresado_dto)
@@ -28,7 +35,7 @@ def editar_perfil(dni: str, data: dict):
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.put('/contacto')
-def actualizar_contacto(dni: str, data: dict):
+def actualizar_contacto(dni: str, data: dict, service=Depends(get_service)):
     try:
         contacto_dto = EgresadoContactoDTO(**data)
         service.actualizar_contacto(dni, contacto_dto)
@@ -38,21 +45,75 @@ def actualizar_contacto(dni: str, data: dict):
 
 @router.get('/')
 def filtrar_egresados(
+    response: Response,
     carrera: str = Query(None),
     genero: str = Query(None),
     anio_egreso: int = Query(None),
-    ciudad: str = Query(None)
+    ciudad: str = Query(None),
+    campos: str = Query(None, description="Campos separados por coma; cv solo se incluye si se pide"),
+    limite: int = Query(LIMITE_POR_DEFECTO, ge=1, le=LIMITE_MAXIMO),
+    cursor: str = Query(None, description="Valor de X-Next-Cursor de la página anterior"),
+    service=Depends(get_service)
 ):
     filtros = {"carrera": carrera, "genero": genero, "anio_egreso": anio_egreso, "ciudad": ciudad}
-    return service.filtrar_egresados(filtros)
+    lista_campos = [c.strip() for c in campos.split(",") if c.strip()] if campos else None
+    try:
+        egresados, siguiente = service.filtrar_egresados(filtros, lista_campos, limite, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if siguiente:
+        response.headers["X-Next-Cursor"] = siguiente
+    return egresados
+
+@router.get('/exportar')
+def exportar_egresados(
+    formato: str = Query("csv", description="csv o ndjson"),
+    carrera: str = Query(None),
+    genero: str = Query(None),
+    anio_egreso: int = Query(None),
+    ciudad: str = Query(None),
+    campos: str = Query(None, description="Campos separados por coma; cv solo se incluye si se pide"),
+    user=Depends(auth_service.require_role("admin")),
+    service=Depends(get_service)
+):
+    filtros = {"carrera": carrera, "genero": genero, "anio_egreso": anio_egreso, "ciudad": ciudad}
+    lista_campos = [c.strip() for c in campos.split(",") if c.strip()] if campos else None
+    try:
+        fragmentos = service.exportar_egresados(filtros, formato, lista_campos)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return StreamingResponse(
+        fragmentos,
+        media_type=FORMATOS_EXPORTACION[formato],
+        headers={"Content-Disposition": f'attachment; filename="egresados.{formato}"'}
+    )
+
+@router.get('/facetas')
+def facetas_egresados(
+    carrera: str = Query(None),
+    genero: str = Query(None),
+    anio_egreso: int = Query(None),
+    ciudad: str = Query(None),
+    service=Depends(get_service)
+):
+    filtros = {"carrera": carrera, "genero": genero, "anio_egreso": anio_egreso, "ciudad": ciudad}
+    return service.facetas_egresados(filtros)
+
+@router.get('/buscar')
+def buscar_egresados(
+    q: str = Query(..., min_length=2, description="Nombre o apellido parcial, o prefijo de DNI"),
+    limite: int = Query(20, ge=1, le=100),
+    service=Depends(get_service)
+):
+    return service.buscar_egresados(q, limite)
 
 @router.post('/login')
-def login_egresado(data: dict):
+def login_egresado(data: dict, service=Depends(get_service)):
     email = data.get("email")
     password = data.get("password")
     return service.autenticar_egresado(email, password)
 
 @router.post('/recuperar-password')
-def recuperar_password(data: dict):
+def recuperar_password(data: dict, service=Depends(get_service)):
     email = data.get("email")
     return service.recuperar_password(email)
@@ -0,0 +1,36 @@
+# Endpoints de lectura de egresados sobre el motor asíncrono (DB_ASYNC=true).
+# Se registran antes que egresado_controller y atienden las mismas rutas.
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from src.feacture.egresado.service.egresado_service import EgresadoService
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.config.db_async import get_async_db
+from src.feacture.egresado.repository.egresado_repository_async import EgresadoRepositoryAsync
+from src.feacture.egresado.repository.egresado_repository import LIMITE_POR_DEFECTO, LIMITE_MAXIMO
+
+router = APIRouter()
+
+def get_service(db: AsyncSession = Depends(get_async_db)):
+    return EgresadoService(EgresadoRepositoryAsync(db))
+
+@router.get('/')
+async def filtrar_egresados(
+    response: Response,
+    carrera: str = Query(None),
+    genero: str = Query(None),
+    anio_egreso: int = Query(None),
+    ciudad: str = Query(None),
+    campos: str = Query(None, description="Campos separados por coma; cv solo se incluye si se pide"),
+    limite: int = Query(LIMITE_POR_DEFECTO, ge=1, le=LIMITE_MAXIMO),
+    cursor: str = Query(None, description="Valor de X-Next-Cursor de la página anterior"),
+    service=Depends(get_service)
+):
+    filtros = {"carrera": carrera, "genero": genero, "anio_egreso": anio_egreso, "ciudad": ciudad}
+    lista_campos = [c.strip() for c in campos.split(",") if c.strip()] if campos else None
+    try:
+        egresados, siguiente = await service.filtrar_egresados(filtros, lista_campos, limite, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if siguiente:
+        response.headers["X-Next-Cursor"] = siguiente
+    return egresados
@@ -1,32 +1,106 @@
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends, Response
+from typing import List
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends
+from fastapi.responses import FileResponse
 from src.feacture.egresado.service.importacion_egresado_service import ImportacionEgresadoService
+from src.feacture.egresado.service.importacion_job_service import ImportacionJobService
 from src.utils.auth import AuthService
-import shutil
+from sqlalchemy.orm import Session
+from src.config.db import get_db
+from src.feacture.egresado.repository.importacion_egresado_repository import ImportacionEgresadoRepository
 import os
 
 router = APIRouter()
-service = ImportacionEgresadoService()
+job_service = ImportacionJobService()
 auth_service = AuthService()
 
+def get_service(db: Session = Depends(get_db)):
+    return ImportacionEgresadoService(ImportacionEgresadoRepository(db))
+
 @router.post('/importar-excel')
 def importar_excel(
     file: UploadFile = File(...),
     usuario_id: int = Form(...),
-    user=Depends(auth_service.require_role("admin"))
+    user=Depends(auth_service.require_role("admin")),
+    service=Depends(get_service)
 ):
     if not file.filename.endswith('.xlsx'):
         raise HTTPException(status_code=400, detail="El archivo debe ser .xlsx")
-    temp_path = f"temp_{file.filename}"
-    with open(temp_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-    resultado = service.importar_excel(temp_path, usuario_id)
-    os.remove(temp_path)
-    return resultado
+    temp_path = job_service.guardar_archivo(file.file, file.filename)
+    try:
+        return service.importar_excel(temp_path, usuario_id)
+    finally:
+        os.remove(temp_path)
+
+@router.post('/importar-streaming')
+def importar_streaming(
+    file: UploadFile = File(...),
+    usuario_id: int = Form(...),
+    tamanio_lote: int = Form(None),
+    incremental: bool = Form(False),
+    user=Depends(auth_service.require_role("admin")),
+    service=Depends(get_service)
+):
+    if not file.filename.endswith(('.xlsx', '.csv')):
+        raise HTTPException(status_code=400, detail="El archivo debe ser .xlsx o .csv")
+    temp_path = job_service.guardar_archivo(file.file, file.filename)
+    try:
+        return service.importar_streaming(temp_path, usuario_id, tamanio_lote, incremental=incremental)
+    finally:
+        os.remove(temp_path)
+
+@router.post('/importar-lote')
+def importar_lote(
+    files: List[UploadFile] = File(...),
+    usuario_id: int = Form(...),
+    user=Depends(auth_service.require_role("admin")),
+    service=Depends(get_service)
+):
+    if not all(f.filename.endswith(('.xlsx', '.csv')) for f in files):
+        raise HTTPException(status_code=400, detail="Los archivos deben ser .xlsx o .csv")
+    archivos = []
+    try:
+        for file in files:
+            archivos.append((job_service.guardar_archivo(file.file, file.filename), file.filename))
+        return service.importar_lote(archivos, usuario_id)
+    finally:
+        for temp_path, _ in archivos:
+            os.remove(temp_path)
+
+@router.post('/importar-async', status_code=202)
+def importar_async(
+    file: UploadFile = File(...),
+    usuario_id: int = Form(...),
+    tamanio_lote: int = Form(None),
+    incremental: bool = Form(False),
+    user=Depends(auth_service.require_role("admin"))
+):
+    if not file.filename.endswith(('.xlsx', '.csv')):
+        raise HTTPException(status_code=400, detail="El archivo debe ser .xlsx o .csv")
+    ruta = job_service.guardar_archivo(file.file, file.filename)
+    try:
+        trabajo = job_service.encolar(ruta, usuario_id, tamanio_lote, incremental)
+    except ValueError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return {"job_id": trabajo.id, "estado": trabajo.estado}
+
+@router.get('/trabajos/{job_id}')
+def estado_importacion(job_id: str, user=Depends(auth_service.require_role("admin"))):
+    estado = job_service.estado(job_id)
+    if not estado:
+        raise HTTPException(status_code=404, detail="Trabajo no encontrado")
+    return estado
+
+@router.post('/trabajos/{job_id}/cancelar')
+def cancelar_importacion(job_id: str, user=Depends(auth_service.require_role("admin"))):
+    estado = job_service.cancelar(job_id)
+    if not estado:
+        raise HTTPException(status_code=404, detail="Trabajo no encontrado")
+    return estado
 
 @router.get('/descargar-rechazados')
 def descargar_rechazados(nombre: str, user=Depends(auth_service.require_role("admin"))):
     if not os.path.exists(nombre):
         raise HTTPException(status_code=404, detail="Archivo no encontrado")
-    with open(nombre, "rb") as f:
-        content = f.read()
-    return Response(content, media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+    if nombre.endswith('.csv'):
+        return FileResponse(nombre, media_type="text/csv", filename=os.path.basename(nombre))
+    return FileResponse(nombre, media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", filename=os.path.basename(nombre))
@@ -1,5 +1,6 @@
 class ImportacionEgresadoDAO:
-    def __init__(self, id, usuario_id, fecha, total_registros, exitosos, rechazados, resultado, detalle, archivo_rechazados):
+    def __init__(self, id, usuario_id, fecha, total_registros, exitosos, rechazados, resultado, detalle, archivo_rechazados,
+                 hash_archivo=None, insertados=None, actualizados=None, sin_cambios=None):
         self.id = id
         self.usuario_id = usuario_id
         self.fecha = fecha
@@ -9,6 +10,10 @@ class ImportacionEgresadoDAO:
         self.resultado = resultado
         self.detalle = detalle
         self.archivo_rechazados = archivo_rechazados
+        self.hash_archivo = hash_archivo
+        self.insertados = insertados
+        self.actualizados = actualizados
+        self.sin_cambios = sin_cambios
 
     @classmethod
     def from_model(cls, imp):
@@ -21,5 +26,9 @@ class ImportacionEgresadoDAO:
             rechazados=imp.rechazados,
             resultado=imp.resultado,
             detalle=imp.detalle,
-            archivo_rechazados=imp.archivo_rechazados
+            archivo_rechazados=imp.archivo_rechazados,
+            hash_archivo=imp.hash_archivo,
+            insertados=imp.insertados,
+            actualizados=imp.actualizados,
+            sin_cambios=imp.sin_cambios
         )
@@ -16,6 +16,11 @@ class EgresadoRegistroDTO:
             raise ValueError("Género inválido")
         if fecha_nacimiento and not isinstance(fecha_nacimiento, (str, date)):
             raise ValueError("Fecha de nacimiento inválida")
+        if fecha_nacimiento and isinstance(fecha_nacimiento, str):
+            try:
+                fecha_nacimiento = date.fromisoformat(fecha_nacimiento)
+            except ValueError:
+                raise ValueError("Fecha de nacimiento inválida")
         self.nombres = nombres
         self.apellidos = apellidos
         self.dni = dni
@@ -1,5 +1,6 @@
 class ImportacionEgresadoDTO:
-    def __init__(self, usuario_id, total_registros, exitosos, rechazados, resultado, detalle=None, archivo_rechazados=None):
+    def __init__(self, usuario_id, total_registros, exitosos, rechazados, resultado, detalle=None, archivo_rechazados=None,
+                 hash_archivo=None, insertados=None, actualizados=None, sin_cambios=None):
         self.usuario_id = usuario_id
         self.total_registros = total_registros
         self.exitosos = exitosos
@@ -7,3 +8,7 @@ class ImportacionEgresadoDTO:
         self.resultado = resultado
         self.detalle = detalle
         self.archivo_rechazados = archivo_rechazados
+        self.hash_archivo = hash_archivo
+        self.insertados = insertados
+        self.actualizados = actualizados
+        self.sin_cambios = sin_cambios
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Date, Text
+from sqlalchemy import Column, String, Integer, Date, Text, Index
 from src.config.db import Base
 
 # Modelo de datos para Egresado
@@ -6,6 +6,12 @@ from src.config.db import Base
 
 class Egresado(Base):
     __tablename__ = "egresados"
+    __table_args__ = (
+        # Filtros de GET /egresado/: carrera (+ año), año y ciudad
+        Index("ix_egresados_carrera_anio", "carrera_profesional", "anio_egreso"),
+        Index("ix_egresados_anio_egreso", "anio_egreso"),
+        Index("ix_egresados_ciudad", "ciudad"),
+    )
 
     id = Column(String(20), primary_key=True, index=True)
     usuario_dni = Column(String(20), unique=True, index=True)
@@ -22,3 +28,4 @@ class Egresado(Base):
     fecha_nacimiento = Column(Date, nullable=True)
     email_alternativo = Column(String(255), nullable=True)
     telefono = Column(String(20), nullable=True)
+    hash_importacion = Column(String(32), nullable=True)  # hash de la fila importada, para re-importaciones incrementales
@@ -10,6 +10,10 @@ class ImportacionEgresado(Base):
     total_registros = Column(Integer, nullable=False)
     exitosos = Column(Integer, nullable=False)
     rechazados = Column(Integer, nullable=False)
-    resultado = Column(String(50), nullable=False)  # 'exitoso', 'parcial', 'fallido'
+    resultado = Column(String(50), nullable=False)  # 'exitoso', 'parcial', 'fallido', 'cancelado'
     detalle = Column(Text, nullable=True)  # Resumen o errores
     archivo_rechazados = Column(String(255), nullable=True)  # Ruta o nombre del archivo generado
+    hash_archivo = Column(String(64), nullable=True, index=True)  # sha256 del archivo (importación incremental)
+    insertados = Column(Integer, nullable=True)
+    actualizados = Column(Integer, nullable=True)
+    sin_cambios = Column(Integer, nullable=True)
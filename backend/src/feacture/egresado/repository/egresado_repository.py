@@ -1,13 +1,91 @@
+import base64
+import json
+from sqlalchemy import insert, update, select, func, literal, cast, String, union_all
 from sqlalchemy.orm import Session
 from src.config.db import SessionLocal
 from src.feacture.egresado.model.egresado import Egresado
+from src.utils.eventos import emitir
 
 # Repositorio de egresados
 # Autor: GitHub Copilot
 
+# Máximo de valores por cláusula IN (...) en las búsquedas masivas
+TAMANIO_IN = 500
+
+# Evento emitido tras confirmar altas/cambios de egresados; datos: egresados=[dict con 'id' y columnas cambiadas]
+EGRESADOS_GUARDADOS = "egresados_guardados"
+
+# Paginación por cursor (keyset sobre la PK) de filtrar()
+LIMITE_POR_DEFECTO = 50
+LIMITE_MAXIMO = 500
+
+# Filas que trae cada viaje del cursor del servidor en exportar()
+TAMANIO_LOTE_EXPORTACION = 1000
+
+# Proyección de filtrar(): cv solo si se pide; password y hash_importacion nunca se devuelven
+CAMPOS_OCULTOS = ("password", "hash_importacion")
+CAMPOS_SELECCIONABLES = tuple(c.name for c in Egresado.__table__.columns if c.name not in CAMPOS_OCULTOS)
+CAMPOS_POR_DEFECTO = tuple(c for c in CAMPOS_SELECCIONABLES if c != "cv")
+
+
+def _a_dict(egresado):
+    return {c: getattr(egresado, c) for c in CAMPOS_SELECCIONABLES}
+
+
+def columnas_proyeccion(campos=None):
+    campos = campos or CAMPOS_POR_DEFECTO
+    invalidos = [c for c in campos if c not in CAMPOS_SELECCIONABLES]
+    if invalidos:
+        raise ValueError(f"Campos no válidos: {', '.join(invalidos)}")
+    # El id siempre se carga: es la clave del cursor
+    campos = ["id"] + [c for c in campos if c != "id"]
+    return [Egresado.__table__.c[c] for c in campos]
+
+
+def aplicar_filtros(query, filtros):
+    if filtros.get("carrera"):
+        query = query.where(Egresado.carrera_profesional == filtros["carrera"])
+    if filtros.get("genero"):
+        query = query.where(Egresado.genero == filtros["genero"])
+    if filtros.get("anio_egreso"):
+        query = query.where(Egresado.anio_egreso == filtros["anio_egreso"])
+    if filtros.get("ciudad"):
+        query = query.where(Egresado.ciudad == filtros["ciudad"])
+    return query
+
+
+FACETAS = ("carrera_profesional", "genero", "ciudad", "anio_egreso")
+
+
+def codificar_cursor(ultimo_id):
+    return base64.urlsafe_b64encode(json.dumps({"id": ultimo_id}).encode()).decode()
+
+
+def decodificar_cursor(cursor):
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode()))["id"]
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Cursor inválido")
+
+
+def consulta_pagina(filtros, campos=None, limite=None, cursor=None):
+    """SELECT de una página ordenada por id; trae limite + 1 filas para saber si hay siguiente."""
+    limite = min(limite or LIMITE_POR_DEFECTO, LIMITE_MAXIMO)
+    query = aplicar_filtros(select(*columnas_proyeccion(campos)), filtros)
+    if cursor:
+        query = query.where(Egresado.id > decodificar_cursor(cursor))
+    return query.order_by(Egresado.id).limit(limite + 1), limite
+
+
+def armar_pagina(filas, limite):
+    """Retorna (egresados, cursor de la siguiente página o None)."""
+    egresados = [dict(f._mapping) for f in filas[:limite]]
+    siguiente = codificar_cursor(egresados[-1]["id"]) if len(filas) > limite else None
+    return egresados, siguiente
+
 class EgresadoRepository:
-    def __init__(self):
-        self.db: Session = SessionLocal()
+    def __init__(self, db: Session = None):
+        self.db: Session = db or SessionLocal()
 
     def registrar(self, egresado_dto):
         if self.db.query(Egresado).filter_by(usuario_dni=egresado_dto.dni).first():
@@ -28,6 +106,7 @@ class EgresadoRepository:
         self.db.add(egresado)
         self.db.commit()
         self.db.refresh(egresado)
+        emitir(EGRESADOS_GUARDADOS, egresados=[_a_dict(egresado)])
         return True
 
     def editar(self, dni, egresado_dto):
@@ -41,6 +120,7 @@ class EgresadoRepository:
         egresado.genero = egresado_dto.genero
         egresado.fecha_nacimiento = egresado_dto.fecha_nacimiento
         self.db.commit()
+        emitir(EGRESADOS_GUARDADOS, egresados=[_a_dict(egresado)])
         return True
 
     def actualizar_contacto(self, dni, contacto_dto):
@@ -52,21 +132,105 @@ class EgresadoRepository:
         self.db.commit()
         return True
 
-    def filtrar(self, filtros):
-        query = self.db.query(Egresado)
-        if filtros["carrera"]:
-            query = query.filter(Egresado.carrera_profesional == filtros["carrera"])
-        if filtros["genero"]:
-            query = query.filter(Egresado.genero == filtros["genero"])
-        if filtros["anio_egreso"]:
-            query = query.filter(Egresado.anio_egreso == filtros["anio_egreso"])
-        if filtros["ciudad"]:
-            query = query.filter(Egresado.ciudad == filtros["ciudad"])
-        return [e.__dict__ for e in query.all()]
+    def filtrar(self, filtros, campos=None, limite=None, cursor=None):
+        """Una página de egresados como dicts con solo los campos pedidos: (egresados, siguiente_cursor)."""
+        query, limite = consulta_pagina(filtros, campos, limite, cursor)
+        return armar_pagina(self.db.execute(query).all(), limite)
+
+    def exportar(self, filtros, campos=None, tamanio_lote=None):
+        """
+        Generador de dicts con todos los egresados filtrados, leídos con un cursor del
+        servidor (stream_results + yield_per): la memoria no depende del total.
+        La consulta se arma (y valida) antes de devolver el generador.
+        """
+        query = aplicar_filtros(select(*columnas_proyeccion(campos)), filtros).order_by(Egresado.id)
+        query = query.execution_options(stream_results=True, yield_per=tamanio_lote or TAMANIO_LOTE_EXPORTACION)
+
+        def filas():
+            resultado = self.db.execute(query)
+            try:
+                for fila in resultado.mappings():
+                    yield dict(fila)
+            finally:
+                resultado.close()
+        return filas()
+
+    def facetas(self, filtros):
+        """Conteos por valor de cada faceta con un solo UNION ALL de GROUP BY: {faceta: [(valor, total)]}."""
+        consultas = []
+        for faceta in FACETAS:
+            columna = Egresado.__table__.c[faceta]
+            consultas.append(aplicar_filtros(
+                select(literal(faceta).label("faceta"), cast(columna, String).label("valor"), func.count().label("total")),
+                filtros
+            ).group_by(columna))
+        resultado = {faceta: [] for faceta in FACETAS}
+        for faceta, valor, total in self.db.execute(union_all(*consultas)):
+            resultado[faceta].append((valor, total))
+        return resultado
 
     def buscar_por_dni(self, dni):
         return self.db.query(Egresado).filter_by(usuario_dni=dni).first()
 
+    def buscar_existentes(self, dnis, emails):
+        """Retorna (dnis, emails) ya registrados usando consultas IN (...) por bloques."""
+        dnis_existentes = set()
+        emails_existentes = set()
+        dnis = list(dnis)
+        # Los emails se comparan sin distinguir mayúsculas, sea cual sea la collation de la BD
+        emails = list({email.lower() for email in emails})
+        for inicio in range(0, len(dnis), TAMANIO_IN):
+            bloque = dnis[inicio:inicio + TAMANIO_IN]
+            filas = self.db.query(Egresado.usuario_dni).filter(Egresado.usuario_dni.in_(bloque)).all()
+            dnis_existentes.update(fila[0] for fila in filas)
+        for inicio in range(0, len(emails), TAMANIO_IN):
+            bloque = emails[inicio:inicio + TAMANIO_IN]
+            filas = self.db.query(Egresado.email).filter(func.lower(Egresado.email).in_(bloque)).all()
+            emails_existentes.update(fila[0].lower() for fila in filas)
+        return dnis_existentes, emails_existentes
+
+    def registrar_lote(self, registros):
+        """Inserta una lista de dicts con un INSERT en lote (executemany) y un solo commit."""
+        if not registros:
+            return 0
+        try:
+            self.db.execute(insert(Egresado), registros)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        emitir(EGRESADOS_GUARDADOS, egresados=registros)
+        return len(registros)
+
+    def buscar_para_upsert(self, dnis, emails):
+        """Retorna ({dni: hash_importacion}, {email: dni}) de los egresados ya registrados."""
+        hash_por_dni = {}
+        dni_por_email = {}
+        dnis = list(dnis)
+        emails = list({email.lower() for email in emails})
+        for inicio in range(0, len(dnis), TAMANIO_IN):
+            bloque = dnis[inicio:inicio + TAMANIO_IN]
+            filas = self.db.query(Egresado.usuario_dni, Egresado.hash_importacion).filter(Egresado.usuario_dni.in_(bloque)).all()
+            hash_por_dni.update((dni, hash_importacion) for dni, hash_importacion in filas)
+        for inicio in range(0, len(emails), TAMANIO_IN):
+            bloque = emails[inicio:inicio + TAMANIO_IN]
+            filas = self.db.query(Egresado.email, Egresado.usuario_dni).filter(func.lower(Egresado.email).in_(bloque)).all()
+            dni_por_email.update((email.lower(), dni) for email, dni in filas)
+        return hash_por_dni, dni_por_email
+
+    def actualizar_lote(self, registros):
+        """UPDATE en lote por clave primaria (cada dict incluye 'id') con un solo commit."""
+        if not registros:
+            return 0
+        try:
+            self.db.execute(update(Egresado), registros)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        emitir(EGRESADOS_GUARDADOS, egresados=registros)
+        return len(registros)
+
     def autenticar(self, email, password):
         egresado = self.db.query(Egresado).filter_by(email=email, password=password).first()
         if egresado:
@@ -0,0 +1,19 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.feacture.egresado.model.egresado import Egresado
+from src.feacture.egresado.repository.egresado_repository import consulta_pagina, armar_pagina
+
+# Variante asíncrona (DB_ASYNC=true) de las consultas de lectura de EgresadoRepository
+
+class EgresadoRepositoryAsync:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def filtrar(self, filtros, campos=None, limite=None, cursor=None):
+        query, limite = consulta_pagina(filtros, campos, limite, cursor)
+        result = await self.db.execute(query)
+        return armar_pagina(result.all(), limite)
+
+    async def buscar_por_dni(self, dni):
+        result = await self.db.execute(select(Egresado).where(Egresado.usuario_dni == dni))
+        return result.scalars().first()
@@ -3,8 +3,8 @@ from src.config.db import SessionLocal
 from sqlalchemy.orm import Session
 
 class ImportacionEgresadoRepository:
-    def __init__(self):
-        self.db: Session = SessionLocal()
+    def __init__(self, db: Session = None):
+        self.db: Session = db or SessionLocal()
 
     def registrar(self, importacion_dto):
         imp = ImportacionEgresado(
@@ -14,12 +14,22 @@ class ImportacionEgresadoRepository:
             rechazados=importacion_dto.rechazados,
             resultado=importacion_dto.resultado,
             detalle=importacion_dto.detalle,
-            archivo_rechazados=importacion_dto.archivo_rechazados
+            archivo_rechazados=importacion_dto.archivo_rechazados,
+            hash_archivo=importacion_dto.hash_archivo,
+            insertados=importacion_dto.insertados,
+            actualizados=importacion_dto.actualizados,
+            sin_cambios=importacion_dto.sin_cambios
         )
         self.db.add(imp)
         self.db.commit()
         self.db.refresh(imp)
         return imp
 
+    def buscar_por_hash(self, hash_archivo):
+        return self.db.query(ImportacionEgresado).filter(
+            ImportacionEgresado.hash_archivo == hash_archivo,
+            ImportacionEgresado.resultado.in_(["exitoso", "parcial"])
+        ).order_by(ImportacionEgresado.id.desc()).first()
+
     def listar(self):
         return self.db.query(ImportacionEgresado).all()
@@ -1,8 +1,52 @@
 # Servicio de egresados
 # Autor: GitHub Copilot
 
-from src.feacture.egresado.repository.egresado_repository import EgresadoRepository
+import csv
+import io
+import json
+from src.feacture.egresado.repository.egresado_repository import EgresadoRepository, EGRESADOS_GUARDADOS, columnas_proyeccion
 from src.feacture.egresado.dto.egresado_dto import EgresadoRegistroDTO, EgresadoContactoDTO
+from src.feacture.egresado.service.indice_busqueda import indice_egresados
+from src.config import busqueda as busqueda_config
+from src.utils.cache import CacheTTL
+from src.utils.eventos import suscribir
+
+# Facetas por combinación de filtros; cualquier alta/cambio de egresados (incluidas importaciones) las invalida
+cache_facetas = CacheTTL(busqueda_config.FACETAS_CACHE_ENTRADAS, busqueda_config.FACETAS_CACHE_SEGUNDOS)
+suscribir(EGRESADOS_GUARDADOS, lambda egresados: cache_facetas.invalidar())
+
+FORMATOS_EXPORTACION = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+FILAS_POR_FRAGMENTO = 500
+
+
+def _fragmentos_csv(filas, columnas):
+    buffer = io.StringIO()
+    escritor = csv.DictWriter(buffer, fieldnames=columnas)
+    escritor.writeheader()
+    # La cabecera sale de inmediato: el primer byte no espera a la consulta
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    for i, fila in enumerate(filas, 1):
+        escritor.writerow(fila)
+        if i % FILAS_POR_FRAGMENTO == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _fragmentos_ndjson(filas):
+    lote = []
+    for fila in filas:
+        lote.append(json.dumps(fila, ensure_ascii=False, default=str))
+        if len(lote) == FILAS_POR_FRAGMENTO:
+            yield "\n".join(lote) + "\n"
+            lote = []
+    if lote:
+        yield "\n".join(lote) + "\n"
+
 
 class EgresadoService:
     def __init__(self, repository=None):
@@ -19,8 +63,37 @@ class EgresadoService:
     def actualizar_contacto(self, dni, contacto_dto: EgresadoContactoDTO):
         return self.repository.actualizar_contacto(dni, contacto_dto)
 
-    def filtrar_egresados(self, filtros):
-        return self.repository.filtrar(filtros)
+    def filtrar_egresados(self, filtros, campos=None, limite=None, cursor=None):
+        return self.repository.filtrar(filtros, campos, limite, cursor)
+
+    def exportar_egresados(self, filtros, formato="csv", campos=None):
+        """Generador de fragmentos de texto (CSV o NDJSON), uno por lote de filas."""
+        if formato not in FORMATOS_EXPORTACION:
+            raise ValueError("Formato no soportado. Use csv o ndjson")
+        filas = self.repository.exportar(filtros, campos)
+        columnas = [c.name for c in columnas_proyeccion(campos)]
+        return _fragmentos_csv(filas, columnas) if formato == "csv" else _fragmentos_ndjson(filas)
+
+    def facetas_egresados(self, filtros):
+        clave = tuple(sorted(filtros.items()))
+        facetas = cache_facetas.obtener(clave)
+        if facetas is None:
+            generacion = cache_facetas.generacion
+            conteos = self.repository.facetas(filtros)
+            facetas = {
+                "total": sum(total for _, total in conteos["carrera_profesional"]),
+                "facetas": {
+                    faceta: [{"valor": valor, "total": total} for valor, total in sorted(valores, key=lambda v: -v[1])]
+                    for faceta, valores in conteos.items()
+                }
+            }
+            cache_facetas.guardar(clave, facetas, generacion)
+        return facetas
+
+    def buscar_egresados(self, consulta, limite=20):
+        # El índice se carga una vez por proceso y luego se mantiene por eventos
+        indice_egresados.asegurar_cargado(self.repository.db)
+        return indice_egresados.buscar(consulta, limite)
 
     def autenticar_egresado(self, email, password):
         egresado = self.repository.autenticar(email, password)
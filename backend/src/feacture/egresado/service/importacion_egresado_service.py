@@ -2,60 +2,217 @@ import pandas as pd
 from src.feacture.egresado.repository.importacion_egresado_repository import ImportacionEgresadoRepository
 from src.feacture.egresado.repository.egresado_repository import EgresadoRepository
 from src.feacture.egresado.dto.importacion_egresado_dto import ImportacionEgresadoDTO
-from src.feacture.egresado.dto.egresado_dto import EgresadoRegistroDTO
+from src.feacture.egresado.service.importacion_validador import CAMPOS_REQUERIDOS, validar_dataframe, filas_rechazadas, hash_filas
+from src.feacture.egresado.service.importacion_lector import leer_por_lotes, listar_hojas, leer_y_validar, hash_archivo, EscritorRechazados
+from src.config import trabajos as trabajos_config
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
 from datetime import datetime
+from uuid import uuid4
+import os
+import threading
+
+_pool_procesos = None
+_pool_lock = threading.Lock()
+
+
+def obtener_pool_procesos():
+    """
+    Pool de procesos compartido por todas las importaciones por lote, creado al primer
+    uso: los hijos importan el lector una sola vez y las peticiones simultáneas
+    comparten IMPORTACION_PROCESOS procesos en lugar de crear los suyos.
+    """
+    global _pool_procesos
+    with _pool_lock:
+        if _pool_procesos is None:
+            # spawn: los procesos hijos no heredan hilos ni conexiones de la API
+            _pool_procesos = ProcessPoolExecutor(
+                max_workers=max(1, trabajos_config.IMPORTACION_PROCESOS), mp_context=get_context("spawn")
+            )
+        return _pool_procesos
+
+
+def _descartar_pool_procesos(pool):
+    # Un hijo que muere deja el pool inutilizable; el siguiente uso crea uno nuevo
+    global _pool_procesos
+    with _pool_lock:
+        if _pool_procesos is pool:
+            _pool_procesos = None
+    pool.shutdown(wait=False)
+
 
 class ImportacionEgresadoService:
-    CAMPOS_REQUERIDOS = ["dni", "nombres", "apellidos", "email", "carrera_profesional", "anio_egreso", "genero", "fecha_nacimiento"]
+    CAMPOS_REQUERIDOS = CAMPOS_REQUERIDOS
+    TAMANIO_LOTE = 1000  # filas por INSERT masivo y por commit
+    CAMPOS_ACTUALIZABLES = ["nombres", "apellidos", "email", "carrera_profesional", "anio_egreso", "genero", "fecha_nacimiento", "ciudad", "hash_importacion"]
 
-    def __init__(self, repository=None):
+    def __init__(self, repository=None, egresado_repo=None):
         self.repository = repository or ImportacionEgresadoRepository()
-        self.egresado_repo = EgresadoRepository()
+        self.egresado_repo = egresado_repo or EgresadoRepository(self.repository.db)
 
     def importar_excel(self, file_path, usuario_id):
         df = pd.read_excel(file_path)
         total = len(df)
+        # Validación de todo el archivo por columnas; solo las filas válidas llegan a la BD
+        normalizado, mascara_error, motivos = validar_dataframe(df)
         exitosos = 0
-        rechazados = 0
-        errores = []
-        for idx, row in df.iterrows():
-            error = None
-            for campo in self.CAMPOS_REQUERIDOS:
-                if pd.isna(row.get(campo)) or str(row.get(campo)).strip() == "":
-                    error = f"Campo obligatorio vacío: {campo}"
-                    break
-            if not error:
-                if self.egresado_repo.buscar_por_dni(str(row["dni"])):
-                    error = "DNI duplicado"
-            if not error:
-                try:
-                    egresado_dto = EgresadoRegistroDTO(
-                        nombres=row["nombres"],
-                        apellidos=row["apellidos"],
-                        dni=str(row["dni"]),
-                        email=row["email"],
-                        password=row.get("password", "123456"),
-                        carrera_profesional=row["carrera_profesional"],
-                        anio_egreso=int(row["anio_egreso"]),
-                        genero=row["genero"],
-                        fecha_nacimiento=row["fecha_nacimiento"],
-                        ciudad=row.get("ciudad")
-                    )
-                    self.egresado_repo.registrar(egresado_dto)
-                    exitosos += 1
-                except Exception as ex:
-                    error = str(ex)
-            if error:
-                rechazados += 1
-                row_dict = row.to_dict()
-                row_dict["motivo_error"] = error
-                errores.append(row_dict)
-        resultado = "exitoso" if exitosos == total else ("parcial" if exitosos > 0 else "fallido")
+        validos = normalizado.loc[~mascara_error]
+        for inicio in range(0, len(validos), self.TAMANIO_LOTE):
+            exitosos += self._registrar_lote(validos.iloc[inicio:inicio + self.TAMANIO_LOTE], motivos)
+        errores = filas_rechazadas(df, motivos)
+        rechazados = len(errores)
         archivo_rechazados = None
         if errores:
             archivo_rechazados = f"rechazados_{datetime.now().strftime('%Y%m%d%H%M%S')}.xlsx"
             pd.DataFrame(errores).to_excel(archivo_rechazados, index=False)
+        self._registrar_importacion(usuario_id, total, exitosos, rechazados, archivo_rechazados)
+        return {
+            "procesados": total,
+            "exitosos": exitosos,
+            "rechazados": rechazados,
+            "archivo_rechazados": archivo_rechazados,
+            "errores": errores
+        }
+
+    def importar_streaming(self, file_path, usuario_id, tamanio_lote=None, trabajo=None, incremental=False):
+        """
+        Importa el archivo (.xlsx o .csv) por lotes de tamaño fijo, sin cargarlo completo
+        en memoria. Las filas rechazadas se escriben al CSV de rechazados a medida que se
+        procesan y la respuesta solo contiene los contadores y el nombre de ese archivo.
+        Los duplicados entre lotes se detectan contra la BD, ya que cada lote se confirma
+        antes de leer el siguiente.
+
+        Si se recibe un `trabajo` (ver src/utils/trabajos.py) se reporta el avance tras cada
+        lote y se detiene al cancelarlo, registrando la importación como 'cancelado'.
+
+        En modo incremental se omite el archivo si su hash ya fue importado, y por fila
+        solo se insertan los DNI nuevos y se actualizan los que cambiaron (según el hash
+        de la fila guardado en el egresado); los DNI existentes ya no se rechazan.
+        """
+        tamanio_lote = tamanio_lote or self.TAMANIO_LOTE
+        hash_contenido = None
+        if incremental:
+            hash_contenido = hash_archivo(file_path)
+            previa = self.repository.buscar_por_hash(hash_contenido)
+            if previa:
+                return {
+                    "importacion_id": previa.id,
+                    "omitido": True,
+                    "detalle": "El archivo ya fue importado",
+                    "procesados": 0,
+                    "exitosos": 0,
+                    "rechazados": 0,
+                    "archivo_rechazados": None
+                }
+        contadores = {"insertados": 0, "actualizados": 0, "sin_cambios": 0}
+        escritor = EscritorRechazados(f"rechazados_{datetime.now().strftime('%Y%m%d%H%M%S')}_{uuid4().hex[:8]}.csv")
+        total = 0
+        exitosos = 0
+        cancelado = False
+        for lote in leer_por_lotes(file_path, tamanio_lote):
+            if trabajo and trabajo.cancelado:
+                cancelado = True
+                break
+            normalizado, mascara_error, motivos = validar_dataframe(lote)
+            if incremental:
+                insertados, actualizados, sin_cambios = self._upsert_lote(normalizado.loc[~mascara_error], motivos)
+                contadores["insertados"] += insertados
+                contadores["actualizados"] += actualizados
+                contadores["sin_cambios"] += sin_cambios
+                exitosos += insertados + actualizados + sin_cambios
+            else:
+                exitosos += self._registrar_lote(normalizado.loc[~mascara_error], motivos)
+            escritor.escribir(lote, motivos)
+            total += len(lote)
+            if trabajo:
+                trabajo.progreso(total, exitosos, escritor.total)
+        if not incremental:
+            contadores = {}
+        importacion = self._registrar_importacion(
+            usuario_id, total, exitosos, escritor.total, escritor.archivo,
+            resultado="cancelado" if cancelado else None,
+            hash_archivo=hash_contenido,
+            **contadores
+        )
+        return {
+            "importacion_id": importacion.id,
+            "procesados": total,
+            "exitosos": exitosos,
+            "rechazados": escritor.total,
+            "archivo_rechazados": escritor.archivo,
+            **contadores
+        }
+
+    def importar_lote(self, archivos, usuario_id):
+        """
+        Importa varios archivos (una tarea por archivo u hoja) con un solo resumen.
+        `archivos` es una lista de (ruta, nombre_original). La lectura y validación se
+        reparten en el pool de procesos compartido; la escritura en BD se hace aquí, en
+        una única etapa serializada que consume los resultados en el orden de envío, de
+        modo que ante un DNI repetido entre archivos siempre gana el primero de la lista.
+        """
+        tareas = [(ruta, nombre, hoja) for ruta, nombre in archivos for hoja in listar_hojas(ruta)]
+        escritor = EscritorRechazados(f"rechazados_{datetime.now().strftime('%Y%m%d%H%M%S')}_{uuid4().hex[:8]}.csv")
+        total = 0
+        exitosos = 0
+        resumen = []
+        pool = obtener_pool_procesos()
+        futuros = [(pool.submit(leer_y_validar, ruta, hoja), nombre, hoja) for ruta, nombre, hoja in tareas]
+        for futuro, nombre, hoja in futuros:
+            hoja_resumen = {"archivo": nombre, "hoja": hoja}
+            try:
+                validos, rechazadas, columnas, procesados = futuro.result()
+            except Exception as ex:
+                if isinstance(ex, BrokenProcessPool):
+                    _descartar_pool_procesos(pool)
+                hoja_resumen["error"] = str(ex)
+                resumen.append(hoja_resumen)
+                continue
+            rechazados_hoja = escritor.escribir(
+                rechazadas.drop(columns="motivo_error").assign(archivo=nombre, hoja=hoja), rechazadas["motivo_error"]
+            )
+            motivos = pd.Series(None, index=validos.index, dtype=object)
+            exitosos_hoja = 0
+            for inicio in range(0, len(validos), self.TAMANIO_LOTE):
+                exitosos_hoja += self._registrar_lote(validos.iloc[inicio:inicio + self.TAMANIO_LOTE], motivos)
+            # Rechazadas contra la BD: se escriben con las columnas del archivo, ya normalizadas
+            en_archivo = [c for c in columnas if c in validos.columns]
+            rechazados_hoja += escritor.escribir(validos[en_archivo].assign(archivo=nombre, hoja=hoja), motivos)
+            total += procesados
+            exitosos += exitosos_hoja
+            hoja_resumen.update(procesados=procesados, exitosos=exitosos_hoja, rechazados=rechazados_hoja)
+            resumen.append(hoja_resumen)
+        importacion = self._registrar_importacion(
+            usuario_id, total, exitosos, escritor.total, escritor.archivo,
+            detalle_extra="; ".join(self._detalle_hoja(h) for h in resumen)
+        )
+        return {
+            "importacion_id": importacion.id,
+            "procesados": total,
+            "exitosos": exitosos,
+            "rechazados": escritor.total,
+            "archivo_rechazados": escritor.archivo,
+            "archivos": resumen
+        }
+
+    @staticmethod
+    def _detalle_hoja(hoja_resumen):
+        nombre = os.path.basename(hoja_resumen["archivo"])
+        if hoja_resumen["hoja"]:
+            nombre = f"{nombre}/{hoja_resumen['hoja']}"
+        if "error" in hoja_resumen:
+            return f"{nombre}: error ({hoja_resumen['error']})"
+        return f"{nombre}: {hoja_resumen['exitosos']}/{hoja_resumen['procesados']}"
+
+    def _registrar_importacion(self, usuario_id, total, exitosos, rechazados, archivo_rechazados, resultado=None, detalle_extra=None, **extra):
+        if not resultado:
+            resultado = "exitoso" if exitosos == total else ("parcial" if exitosos > 0 else "fallido")
         detalle = f"Procesados: {total}, Exitosos: {exitosos}, Rechazados: {rechazados}"
+        if "insertados" in extra:
+            detalle = f"{detalle}, Insertados: {extra['insertados']}, Actualizados: {extra['actualizados']}, Sin cambios: {extra['sin_cambios']}"
+        if detalle_extra:
+            detalle = f"{detalle} | {detalle_extra}"
         importacion_dto = ImportacionEgresadoDTO(
             usuario_id=usuario_id,
             total_registros=total,
@@ -63,13 +220,60 @@ class ImportacionEgresadoService:
             rechazados=rechazados,
             resultado=resultado,
             detalle=detalle,
-            archivo_rechazados=archivo_rechazados
+            archivo_rechazados=archivo_rechazados,
+            **extra
         )
-        self.repository.registrar(importacion_dto)
-        return {
-            "procesados": total,
-            "exitosos": exitosos,
-            "rechazados": rechazados,
-            "archivo_rechazados": archivo_rechazados,
-            "errores": errores
-        }
+        return self.repository.registrar(importacion_dto)
+
+    def _registrar_lote(self, lote, motivos):
+        # Duplicados contra la BD: unas pocas consultas IN (...) por lote
+        dnis_existentes, emails_existentes = self.egresado_repo.buscar_existentes(
+            lote["dni"].tolist(), lote["email"].tolist()
+        )
+        dni_duplicado = lote["dni"].isin(dnis_existentes)
+        email_duplicado = lote["email"].str.lower().isin(emails_existentes) & ~dni_duplicado
+        motivos.loc[dni_duplicado[dni_duplicado].index] = "DNI duplicado"
+        motivos.loc[email_duplicado[email_duplicado].index] = "Email duplicado"
+        insertables = lote.loc[~(dni_duplicado | email_duplicado)]
+        return self._escribir_lote(self.egresado_repo.registrar_lote, insertables, self._registros_egresado(insertables), motivos)
+
+    def _upsert_lote(self, lote, motivos):
+        """Retorna (insertados, actualizados, sin_cambios) del lote en modo incremental."""
+        hashes = hash_filas(lote)
+        hash_por_dni, dni_por_email = self.egresado_repo.buscar_para_upsert(lote["dni"].tolist(), lote["email"].tolist())
+        existe = lote["dni"].isin(hash_por_dni.keys())
+        sin_cambios = existe & (lote["dni"].map(hash_por_dni) == hashes)
+        duenio_email = lote["email"].str.lower().map(dni_por_email)
+        email_duplicado = duenio_email.notna() & (duenio_email != lote["dni"]) & ~sin_cambios
+        motivos.loc[email_duplicado[email_duplicado].index] = "Email duplicado"
+        nuevos = lote.loc[~existe & ~email_duplicado]
+        cambiados = lote.loc[existe & ~sin_cambios & ~email_duplicado]
+        insertados = self._escribir_lote(self.egresado_repo.registrar_lote, nuevos, self._registros_egresado(nuevos), motivos)
+        registros = [{campo: r[campo] for campo in ["id"] + self.CAMPOS_ACTUALIZABLES} for r in self._registros_egresado(cambiados)]
+        actualizados = self._escribir_lote(self.egresado_repo.actualizar_lote, cambiados, registros, motivos)
+        return insertados, actualizados, int(sin_cambios.sum())
+
+    @staticmethod
+    def _escribir_lote(escribir, filas, registros, motivos):
+        try:
+            return escribir(registros)
+        except Exception:
+            pass
+        # El lote falló completo: se reintenta fila por fila para atribuir el error exacto
+        exitosos = 0
+        for idx, registro in zip(filas.index, registros):
+            try:
+                exitosos += escribir([registro])
+            except Exception as ex:
+                motivos.at[idx] = str(getattr(ex, "orig", ex))
+        return exitosos
+
+    @staticmethod
+    def _registros_egresado(filas):
+        registros = filas.assign(
+            id=filas["dni"],
+            usuario_dni=filas["dni"],
+            anio_egreso=filas["anio_egreso"].astype(int),
+            hash_importacion=hash_filas(filas)
+        ).drop(columns=["dni"]).astype(object)
+        return registros.where(registros.notna(), None).to_dict("records")
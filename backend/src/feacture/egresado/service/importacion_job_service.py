@@ -0,0 +1,51 @@
+import os
+import shutil
+from uuid import uuid4
+from src.config import trabajos as trabajos_config
+from src.config.db import UnidadDeTrabajo
+from src.feacture.egresado.repository.importacion_egresado_repository import ImportacionEgresadoRepository
+from src.feacture.egresado.service.importacion_egresado_service import ImportacionEgresadoService
+from src.feacture.egresado.service.importacion_lector import contar_filas
+from src.utils.trabajos import GestorTrabajos
+
+gestor_importaciones = GestorTrabajos(
+    trabajos_config.IMPORTACION_WORKERS,
+    trabajos_config.IMPORTACION_MAX_PENDIENTES
+)
+
+class ImportacionJobService:
+    """Importaciones asíncronas: guarda el archivo, encola el trabajo y expone su avance."""
+
+    def __init__(self, gestor=None):
+        self.gestor = gestor or gestor_importaciones
+
+    def guardar_archivo(self, archivo, nombre):
+        os.makedirs(trabajos_config.IMPORTACION_UPLOAD_DIR, exist_ok=True)
+        ruta = os.path.join(trabajos_config.IMPORTACION_UPLOAD_DIR, f"{uuid4().hex}_{os.path.basename(nombre)}")
+        with open(ruta, "wb") as buffer:
+            shutil.copyfileobj(archivo, buffer)
+        return ruta
+
+    def encolar(self, ruta, usuario_id, tamanio_lote=None, incremental=False):
+        def ejecutar(trabajo):
+            # Sesión propia por trabajo: las sesiones de BD no se comparten entre hilos
+            with UnidadDeTrabajo() as uow:
+                service = ImportacionEgresadoService(ImportacionEgresadoRepository(uow.session))
+                return service.importar_streaming(
+                    ruta, usuario_id, tamanio_lote, trabajo=trabajo, incremental=incremental
+                )
+        try:
+            return self.gestor.encolar(
+                "importacion_egresados", ejecutar, total=contar_filas(ruta), al_finalizar=lambda: os.remove(ruta)
+            )
+        except ValueError:
+            os.remove(ruta)
+            raise
+
+    def estado(self, trabajo_id):
+        trabajo = self.gestor.obtener(trabajo_id)
+        return trabajo.a_dict() if trabajo else None
+
+    def cancelar(self, trabajo_id):
+        trabajo = self.gestor.cancelar(trabajo_id)
+        return trabajo.a_dict() if trabajo else None
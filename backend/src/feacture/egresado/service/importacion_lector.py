@@ -0,0 +1,122 @@
+import hashlib
+import os
+import pandas as pd
+from openpyxl import load_workbook
+from src.feacture.egresado.service.importacion_validador import validar_dataframe
+
+# Lectura por lotes de archivos de importación (.xlsx / .csv) con memoria constante.
+
+
+def es_csv(file_path):
+    return file_path.lower().endswith(".csv")
+
+
+def contar_filas(file_path):
+    """Cantidad aproximada de filas de datos (sin encabezado), usada para estimar el avance."""
+    if es_csv(file_path):
+        with open(file_path, "rb") as f:
+            lineas = sum(bloque.count(b"\n") for bloque in iter(lambda: f.read(1024 * 1024), b""))
+        return max(lineas - 1, 0)
+    libro = load_workbook(file_path, read_only=True)
+    try:
+        max_row = libro.active.max_row
+        return max(max_row - 1, 0) if max_row else None
+    finally:
+        libro.close()
+
+
+def leer_por_lotes(file_path, tamanio_lote, hoja=None):
+    """
+    Genera DataFrames de a lo más `tamanio_lote` filas. El índice de cada lote
+    continúa el del anterior, así los números de fila son únicos en todo el archivo.
+    """
+    if es_csv(file_path):
+        # dtype=str conserva los ceros a la izquierda del DNI
+        for lote in pd.read_csv(file_path, chunksize=tamanio_lote, dtype=str, encoding="utf-8-sig"):
+            yield lote
+        return
+    libro = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        hoja_activa = libro[hoja] if hoja else libro.active
+        filas = hoja_activa.iter_rows(values_only=True)
+        encabezado = next(filas, None)
+        if encabezado is None:
+            return
+        columnas = [str(c).strip() if c is not None else f"columna_{i}" for i, c in enumerate(encabezado)]
+        inicio = 0
+        buffer = []
+        for fila in filas:
+            if all(valor is None for valor in fila):
+                continue
+            buffer.append(fila[:len(columnas)])
+            if len(buffer) >= tamanio_lote:
+                yield pd.DataFrame(buffer, columns=columnas, index=pd.RangeIndex(inicio, inicio + len(buffer)))
+                inicio += len(buffer)
+                buffer = []
+        if buffer:
+            yield pd.DataFrame(buffer, columns=columnas, index=pd.RangeIndex(inicio, inicio + len(buffer)))
+    finally:
+        libro.close()
+
+
+def hash_archivo(file_path):
+    sha = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for bloque in iter(lambda: f.read(1024 * 1024), b""):
+            sha.update(bloque)
+    return sha.hexdigest()
+
+
+def listar_hojas(file_path):
+    """Hojas a importar del archivo; los CSV tienen una sola hoja (None)."""
+    if es_csv(file_path):
+        return [None]
+    libro = load_workbook(file_path, read_only=True)
+    try:
+        return list(libro.sheetnames)
+    finally:
+        libro.close()
+
+
+def leer_y_validar(file_path, hoja=None):
+    """
+    Lee una hoja completa y la valida. Se ejecuta en los procesos del pool de
+    importación por lote, por eso solo depende de pandas y del validador.
+    Retorna (validos, rechazadas, columnas, procesados): las filas válidas ya
+    normalizadas, las rechazadas tal como venían con su motivo_error, las columnas
+    del archivo y el total de filas. Así solo vuelve al proceso principal lo que
+    este necesita, no el DataFrame completo.
+    """
+    if es_csv(file_path):
+        df = pd.read_csv(file_path, dtype=str, encoding="utf-8-sig")
+    else:
+        df = pd.read_excel(file_path, sheet_name=hoja or 0)
+    normalizado, mascara_error, motivos = validar_dataframe(df)
+    rechazadas = df.loc[mascara_error].assign(motivo_error=motivos[mascara_error])
+    return normalizado.loc[~mascara_error], rechazadas, list(df.columns), len(df)
+
+
+class EscritorRechazados:
+    """Escribe las filas rechazadas en un CSV a medida que se procesan los lotes."""
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self.total = 0
+        self._columnas = None
+
+    def escribir(self, lote, motivos):
+        rechazadas = lote.loc[motivos.notna()].copy()
+        if rechazadas.empty:
+            return 0
+        rechazadas["motivo_error"] = motivos[motivos.notna()]
+        if self._columnas is None:
+            self._columnas = list(rechazadas.columns)
+            rechazadas.to_csv(self.ruta, index=False, encoding="utf-8-sig")
+        else:
+            rechazadas.reindex(columns=self._columnas).to_csv(self.ruta, mode="a", header=False, index=False)
+        self.total += len(rechazadas)
+        return len(rechazadas)
+
+    @property
+    def archivo(self):
+        return self.ruta if self.total and os.path.exists(self.ruta) else None
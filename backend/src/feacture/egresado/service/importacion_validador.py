@@ -0,0 +1,116 @@
+import hashlib
+import pandas as pd
+
+# Validación vectorizada de archivos de importación de egresados.
+# Todas las reglas se evalúan por columna sobre el DataFrame completo, de modo
+# que solo las filas válidas llegan a la etapa de base de datos.
+
+CAMPOS_REQUERIDOS = ["dni", "nombres", "apellidos", "email", "carrera_profesional", "anio_egreso", "genero", "fecha_nacimiento"]
+GENEROS_VALIDOS = ["Masculino", "Femenino", "Otro"]
+PASSWORD_POR_DEFECTO = "123456"
+
+# Columnas que definen el contenido de una fila para detectar cambios (la contraseña no cuenta)
+CAMPOS_HASH = ["dni", "nombres", "apellidos", "email", "carrera_profesional", "anio_egreso", "genero", "fecha_nacimiento", "ciudad"]
+
+DNI_REGEX = r'^[0-9]{8,12}$'
+EMAIL_REGEX = r'^.+@.+\..+$'
+
+
+def _texto(serie):
+    # Excel lee los DNI numéricos como float (12345678.0); se normalizan a texto
+    return serie.astype("string").str.strip().str.replace(r"\.0$", "", regex=True)
+
+
+def _vacio(df, campo):
+    if campo not in df.columns:
+        return pd.Series(True, index=df.index)
+    return df[campo].isna() | df[campo].astype("string").str.strip().fillna("").eq("")
+
+
+def _duplicados(serie, validas):
+    return serie.where(validas).duplicated(keep="first") & validas
+
+
+def normalizar_dataframe(df):
+    """Retorna una copia del DataFrame con los tipos que espera el modelo Egresado."""
+    normalizado = pd.DataFrame(index=df.index)
+    for campo in CAMPOS_REQUERIDOS + ["ciudad", "password"]:
+        # Una columna ausente se trata como vacía en todas las filas, con el mismo tipo
+        serie = df[campo] if campo in df.columns else pd.Series(pd.NA, index=df.index, dtype="string")
+        if campo == "anio_egreso":
+            normalizado[campo] = pd.to_numeric(serie, errors="coerce")
+        elif campo == "fecha_nacimiento":
+            normalizado[campo] = pd.to_datetime(serie, errors="coerce").dt.date
+        else:
+            normalizado[campo] = _texto(serie)
+    normalizado["password"] = normalizado["password"].fillna(PASSWORD_POR_DEFECTO)
+    return normalizado
+
+
+def validar_dataframe(df):
+    """
+    Valida todas las filas del archivo de una sola vez.
+
+    Retorna (normalizado, mascara_error, motivos): el DataFrame normalizado, una
+    serie booleana que marca las filas rechazadas y el motivo de rechazo de cada
+    una (None para las filas válidas). Se conserva el primer error de cada fila,
+    en el mismo orden de reglas que la validación fila por fila.
+    """
+    normalizado = normalizar_dataframe(df)
+    motivos = pd.Series(None, index=df.index, dtype=object)
+
+    def marcar(condicion, motivo):
+        nonlocal motivos
+        condicion = condicion.fillna(True).astype(bool)
+        motivos = motivos.mask(motivos.isna() & condicion, motivo)
+
+    for campo in CAMPOS_REQUERIDOS:
+        marcar(_vacio(df, campo), f"Campo obligatorio vacío: {campo}")
+
+    anio = normalizado["anio_egreso"]
+    marcar(anio.isna() | (anio % 1 != 0), "Año de egreso inválido")
+    marcar(normalizado["fecha_nacimiento"].isna(), "Fecha de nacimiento inválida")
+    marcar(~normalizado["dni"].str.match(DNI_REGEX), "DNI inválido")
+    marcar(~normalizado["email"].str.match(EMAIL_REGEX), "Email inválido")
+    marcar(normalizado["password"].str.len() < 6, "La contraseña debe tener al menos 6 caracteres")
+    marcar(~normalizado["genero"].isin(GENEROS_VALIDOS), "Género inválido")
+
+    # Duplicados dentro del mismo archivo: se acepta la primera aparición válida
+    marcar(_duplicados(normalizado["dni"], motivos.isna()), "DNI duplicado en el archivo")
+    marcar(_duplicados(normalizado["email"].str.lower(), motivos.isna()), "Email duplicado en el archivo")
+
+    mascara_error = motivos.notna()
+    return normalizado, mascara_error, motivos.where(mascara_error, None)
+
+
+def _canonico(valor):
+    # Texto independiente del dtype de la columna: 2020 y 2020.0 dan "2020", NA da ""
+    if valor is None or valor is pd.NaT or (not isinstance(valor, str) and pd.isna(valor)):
+        return ""
+    if isinstance(valor, float) and valor.is_integer():
+        return str(int(valor))
+    if hasattr(valor, "isoformat"):
+        return valor.isoformat()
+    return str(valor)
+
+
+def hash_filas(normalizado):
+    """
+    Hash estable (hex de 16 caracteres) del contenido de cada fila normalizada.
+
+    Solo depende de los valores de la propia fila, no del resto del lote, y usa
+    hashlib porque el resultado se guarda en la BD (hash_importacion).
+    """
+    columnas = [normalizado[campo].map(_canonico) for campo in CAMPOS_HASH]
+    return pd.Series(
+        [hashlib.blake2b("\x1f".join(valores).encode("utf-8"), digest_size=8).hexdigest() for valores in zip(*columnas)],
+        index=normalizado.index, dtype=object
+    )
+
+
+def filas_rechazadas(df, motivos):
+    """Construye los registros rechazados (fila original + motivo_error) listos para JSON."""
+    rechazados = df.loc[motivos.notna()].astype(object)
+    rechazados = rechazados.where(rechazados.notna(), None)
+    rechazados["motivo_error"] = motivos[motivos.notna()]
+    return rechazados.to_dict("records")
@@ -0,0 +1,206 @@
+import heapq
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from collections import defaultdict
+from sqlalchemy import select
+from src.feacture.egresado.model.egresado import Egresado
+from src.feacture.egresado.repository.egresado_repository import EGRESADOS_GUARDADOS
+from src.utils.eventos import suscribir
+
+# Índice en memoria para buscar egresados por nombre/apellido parcial o prefijo de DNI.
+# - Por cada palabra distinta (vocabulario) se guardan los egresados que la contienen.
+# - Las palabras se indexan por trigramas (búsqueda aproximada) y en una lista
+#   ordenada (búsqueda por prefijo con bisect); los DNI en otra lista ordenada.
+# Así una búsqueda recorre el vocabulario (miles de palabras), no la tabla.
+# Se carga desde la BD en la primera búsqueda y se mantiene con el evento
+# EGRESADOS_GUARDADOS; la reconstrucción periódica recoge cambios hechos por
+# otros procesos.
+
+CAMPOS_INDICE = ("id", "usuario_dni", "nombres", "apellidos", "carrera_profesional")
+SIMILITUD_MINIMA = 0.25
+MAX_PALABRAS_APROXIMADAS = 20
+PUNTAJE_EXACTO = 1.0
+PUNTAJE_PREFIJO = 0.9
+LARGO_MINIMO_TERMINO = 2
+
+
+def normalizar(texto):
+    texto = unicodedata.normalize("NFKD", str(texto or "").lower())
+    return "".join(c for c in texto if not unicodedata.combining(c))
+
+
+def palabras(texto, largo_minimo=1):
+    return [p for p in "".join(c if c.isalnum() else " " for c in normalizar(texto)).split() if len(p) >= largo_minimo]
+
+
+def trigramas(palabra):
+    relleno = f"  {palabra} "
+    return {relleno[i:i + 3] for i in range(len(relleno) - 2)}
+
+
+class IndiceBusqueda:
+    def __init__(self, campos_texto=("nombres", "apellidos")):
+        self.campos_texto = campos_texto
+        self._lock = threading.RLock()
+        self._lock_carga = threading.Lock()
+        self.cargado_en = None
+        self._limpiar()
+
+    def _limpiar(self):
+        self.documentos = {}                   # id -> dict con CAMPOS_INDICE
+        self._palabras_doc = {}                # id -> set(palabras)
+        self._postings = defaultdict(set)      # palabra -> set(ids)
+        self._por_trigrama = defaultdict(set)  # trigrama -> set(palabras)
+        self._vocabulario = []                 # palabras ordenadas (prefijos)
+        self._dnis = []                        # (dni, id) ordenados (prefijos)
+
+    @property
+    def cargado(self):
+        return self.cargado_en is not None
+
+    def cargar(self, db, tamanio_lote=5000):
+        """Reconstruye el índice leyendo solo las columnas necesarias, por lotes."""
+        columnas = [Egresado.__table__.c[c] for c in CAMPOS_INDICE]
+        nuevo = IndiceBusqueda(self.campos_texto)
+        filas = db.execute(select(*columnas).execution_options(yield_per=tamanio_lote))
+        for fila in filas:
+            nuevo._agregar(dict(fila._mapping), ordenar=False)
+        nuevo._vocabulario.sort()
+        nuevo._dnis.sort()
+        with self._lock:
+            self.__dict__.update({k: v for k, v in nuevo.__dict__.items() if not k.startswith("_lock")})
+            self.cargado_en = time.time()
+        return len(self.documentos)
+
+    def asegurar_cargado(self, db):
+        if self.cargado:
+            return
+        with self._lock_carga:
+            if not self.cargado:
+                self.cargar(db)
+
+    def actualizar(self, egresados):
+        """Agrega o reemplaza egresados (dicts con 'id'; los campos ausentes se conservan)."""
+        with self._lock:
+            if not self.cargado:
+                return
+            docs = {}
+            for datos in egresados:
+                actual = docs.get(datos["id"]) or self.documentos.get(datos["id"], {})
+                doc = {c: datos.get(c, actual.get(c)) for c in CAMPOS_INDICE}
+                doc["usuario_dni"] = doc["usuario_dni"] or doc["id"]
+                docs[doc["id"]] = doc
+            # Primero se quitan todos (bisect necesita las listas ordenadas) y luego se agregan
+            for id_ in docs:
+                self._quitar(id_)
+            ordenar = len(docs) == 1
+            for doc in docs.values():
+                self._agregar(doc, ordenar)
+            if not ordenar:
+                self._vocabulario.sort()
+                self._dnis.sort()
+
+    def _agregar(self, doc, ordenar):
+        id_ = doc["id"]
+        self.documentos[id_] = doc
+        terminos = {p for campo in self.campos_texto for p in palabras(doc.get(campo))}
+        self._palabras_doc[id_] = terminos
+        for palabra in terminos:
+            if palabra not in self._postings:
+                for trigrama in trigramas(palabra):
+                    self._por_trigrama[trigrama].add(palabra)
+                if ordenar:
+                    insort(self._vocabulario, palabra)
+                else:
+                    self._vocabulario.append(palabra)
+            self._postings[palabra].add(id_)
+        dni = (str(doc.get("usuario_dni") or ""), id_)
+        if ordenar:
+            insort(self._dnis, dni)
+        else:
+            self._dnis.append(dni)
+
+    def _quitar(self, id_):
+        doc = self.documentos.pop(id_, None)
+        if doc is None:
+            return
+        for palabra in self._palabras_doc.pop(id_, ()):
+            ids = self._postings[palabra]
+            ids.discard(id_)
+            if not ids:
+                del self._postings[palabra]
+                for trigrama in trigramas(palabra):
+                    self._por_trigrama[trigrama].discard(palabra)
+                posicion = bisect_left(self._vocabulario, palabra)
+                if posicion < len(self._vocabulario) and self._vocabulario[posicion] == palabra:
+                    del self._vocabulario[posicion]
+        posicion = bisect_left(self._dnis, (str(doc.get("usuario_dni") or ""), id_))
+        if posicion < len(self._dnis) and self._dnis[posicion][1] == id_:
+            del self._dnis[posicion]
+
+    def _coincidencias(self, termino):
+        """{palabra del vocabulario: puntaje} para un término de la consulta."""
+        puntajes = {}
+        if termino in self._postings:
+            puntajes[termino] = PUNTAJE_EXACTO
+        posicion = bisect_left(self._vocabulario, termino)
+        while posicion < len(self._vocabulario) and self._vocabulario[posicion].startswith(termino):
+            puntajes.setdefault(self._vocabulario[posicion], PUNTAJE_PREFIJO)
+            posicion += 1
+        if not puntajes and len(termino) >= 3:
+            # Sin coincidencia exacta ni por prefijo: se toleran errores de tipeo por trigramas
+            tri_termino = trigramas(termino)
+            compartidos = defaultdict(int)
+            for trigrama in tri_termino:
+                for palabra in self._por_trigrama.get(trigrama, ()):
+                    compartidos[palabra] += 1
+            similares = {}
+            for palabra, n in compartidos.items():
+                similitud = n / (len(tri_termino) + len(trigramas(palabra)) - n)
+                if similitud >= SIMILITUD_MINIMA:
+                    similares[palabra] = similitud * PUNTAJE_PREFIJO
+            for palabra in heapq.nlargest(MAX_PALABRAS_APROXIMADAS, similares, key=similares.get):
+                puntajes[palabra] = similares[palabra]
+        return puntajes
+
+    def buscar(self, consulta, limite=20):
+        """Resultados ordenados por puntaje: primero los que coinciden con más términos."""
+        # Términos de una letra coincidirían con casi todo el índice
+        terminos = palabras(consulta, LARGO_MINIMO_TERMINO)
+        if not terminos:
+            return []
+        with self._lock:
+            puntajes = defaultdict(float)
+            coincidencias = defaultdict(int)
+            for termino in terminos:
+                mejores = {}
+                if termino.isdigit():
+                    posicion = bisect_left(self._dnis, (termino, ""))
+                    while posicion < len(self._dnis) and self._dnis[posicion][0].startswith(termino):
+                        dni, id_ = self._dnis[posicion]
+                        mejores[id_] = PUNTAJE_EXACTO if dni == termino else PUNTAJE_PREFIJO
+                        posicion += 1
+                for palabra, puntaje in self._coincidencias(termino).items():
+                    for id_ in self._postings[palabra]:
+                        if puntaje > mejores.get(id_, 0):
+                            mejores[id_] = puntaje
+                for id_, puntaje in mejores.items():
+                    puntajes[id_] += puntaje
+                    coincidencias[id_] += 1
+            mejores_ids = heapq.nlargest(limite, puntajes, key=lambda i: (coincidencias[i], puntajes[i]))
+            return [
+                {**self.documentos[i], "puntaje": round(puntajes[i] / len(terminos), 3)}
+                for i in mejores_ids
+            ]
+
+
+indice_egresados = IndiceBusqueda()
+
+
+def _al_guardar_egresados(egresados):
+    indice_egresados.actualizar(egresados)
+
+
+suscribir(EGRESADOS_GUARDADOS, _al_guardar_egresados)
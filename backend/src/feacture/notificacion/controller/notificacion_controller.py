@@ -1,12 +1,20 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends, Query
 from src.feacture.notificacion.service.notificacion_service import NotificacionService
 from src.feacture.notificacion.dto.notificacion_dto import NotificacionDTO
+from sqlalchemy.orm import Session
+from src.config.db import get_db
+from src.feacture.notificacion.repository.notificacion_repository import NotificacionRepository
+from src.feacture.notificacion.repository.outbox_repository import ESTADOS_CORREO
+from src.utils.auth import AuthService
 
 router = APIRouter()
-service = NotificacionService()
+auth_service = AuthService()
+
+def get_service(db: Session = Depends(get_db)):
+    return NotificacionService(NotificacionRepository(db))
 
 @router.post('/')
-def crear_notificacion(data: dict):
+def crear_notificacion(data: dict, service=Depends(get_service)):
     try:
         noti_dto = NotificacionDTO(**data)
         return service.crear_notificacion(noti_dto)
@@ -14,9 +22,42 @@ def crear_notificacion(data: dict):
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get('/usuario/{usuario_id}/{tipo_usuario}')
-def listar_notificaciones_usuario(usuario_id: str, tipo_usuario: str):
+def listar_notificaciones_usuario(usuario_id: str, tipo_usuario: str, service=Depends(get_service)):
     return service.listar_notificaciones_usuario(usuario_id, tipo_usuario)
 
 @router.put('/marcar-leida/{notificacion_id}')
-def marcar_leida(notificacion_id: int):
+def marcar_leida(notificacion_id: int, service=Depends(get_service)):
     return service.marcar_leida(notificacion_id)
+
+# Seguimiento de la bandeja de salida de correos (admin)
+
+@router.get('/outbox/estado')
+def estado_outbox(user=Depends(auth_service.require_role("admin")), service=Depends(get_service)):
+    return service.estado_outbox()
+
+@router.get('/outbox')
+def listar_correos(
+    estado: str = Query(None), limite: int = Query(50, ge=1, le=500),
+    user=Depends(auth_service.require_role("admin")), service=Depends(get_service)
+):
+    if estado is not None and estado not in ESTADOS_CORREO:
+        raise HTTPException(status_code=400, detail=f"Estado no válido. Opciones: {', '.join(ESTADOS_CORREO)}")
+    return service.listar_correos(estado, limite)
+
+@router.get('/outbox/{correo_id}')
+def obtener_correo(correo_id: int, user=Depends(auth_service.require_role("admin")), service=Depends(get_service)):
+    correo = service.obtener_correo(correo_id)
+    if not correo:
+        raise HTTPException(status_code=404, detail="Correo no encontrado")
+    return correo
+
+@router.post('/outbox/{correo_id}/reintentar')
+def reintentar_correo(correo_id: int, user=Depends(auth_service.require_role("admin")), service=Depends(get_service)):
+    try:
+        correo = service.reintentar_correo(correo_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not correo:
+        raise HTTPException(status_code=404, detail="Correo no encontrado")
+    return correo
+
@@ -0,0 +1,19 @@
+# Endpoints de notificaciones sobre el motor asíncrono (DB_ASYNC=true).
+from fastapi import APIRouter, Depends
+from src.feacture.notificacion.service.notificacion_service import NotificacionService
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.config.db_async import get_async_db
+from src.feacture.notificacion.repository.notificacion_repository_async import NotificacionRepositoryAsync
+
+router = APIRouter()
+
+def get_service(db: AsyncSession = Depends(get_async_db)):
+    return NotificacionService(NotificacionRepositoryAsync(db))
+
+@router.get('/usuario/{usuario_id}/{tipo_usuario}')
+async def listar_notificaciones_usuario(usuario_id: str, tipo_usuario: str, service=Depends(get_service)):
+    return await service.listar_notificaciones_usuario(usuario_id, tipo_usuario)
+
+@router.put('/marcar-leida/{notificacion_id}')
+async def marcar_leida(notificacion_id: int, service=Depends(get_service)):
+    return await service.marcar_leida(notificacion_id)
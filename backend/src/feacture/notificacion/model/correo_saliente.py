@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index
+from src.config.db import Base
+from datetime import datetime
+
+# Bandeja de salida (outbox): el correo se guarda en la misma transacción que el cambio
+# que lo origina y los workers de entrega lo envían después.
+# estado: pendiente -> enviando -> enviado | pendiente (reintento) | fallido (dead-letter)
+
+class CorreoSaliente(Base):
+    __tablename__ = "correos_salientes"
+    __table_args__ = (
+        # Reclamo de lotes: pendientes cuyo próximo intento ya venció
+        Index("ix_correos_salientes_estado_proximo", "estado", "proximo_intento"),
+        Index("ix_correos_salientes_lote", "lote"),
+    )
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    destinatario = Column(String(255), nullable=False)
+    asunto = Column(String(255), nullable=False)
+    cuerpo = Column(Text, nullable=False)
+    estado = Column(String(20), nullable=False, default="pendiente")
+    intentos = Column(Integer, nullable=False, default=0)
+    proximo_intento = Column(DateTime, nullable=False, default=datetime.now)
+    ultimo_error = Column(Text, nullable=True)
+    lote = Column(String(32), nullable=True)          # worker/vuelta que lo reclamó
+    tomado_en = Column(DateTime, nullable=True)
+    creado_en = Column(DateTime, nullable=False, default=datetime.now)
+    enviado_en = Column(DateTime, nullable=True)
+    evento_relacionado = Column(String(50), nullable=True)  # reunion, taller, etc.
+    referencia_id = Column(Integer, nullable=True)
@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from src.config.db import Base
 from datetime import datetime
 
 class Notificacion(Base):
     __tablename__ = "notificaciones"
+    __table_args__ = (
+        # listar_por_usuario filtra por usuario/tipo y ordena por fecha_envio
+        Index("ix_notificaciones_usuario_tipo_fecha", "usuario_id", "tipo_usuario", "fecha_envio"),
+    )
     id = Column(Integer, primary_key=True, autoincrement=True)
     usuario_id = Column(String(20), nullable=False)  # Puede ser egresado o admin
     tipo_usuario = Column(String(20), nullable=False)  # 'egresado' o 'admin'
@@ -3,10 +3,11 @@ from src.config.db import SessionLocal
 from sqlalchemy.orm import Session
 
 class NotificacionRepository:
-    def __init__(self):
-        self.db: Session = SessionLocal()
+    def __init__(self, db: Session = None):
+        self.db: Session = db or SessionLocal()
 
-    def crear(self, notificacion_dto):
+    def agregar(self, notificacion_dto):
+        """Agrega la notificación a la sesión sin confirmar (la confirma quien hace el commit)."""
         notificacion = Notificacion(
             usuario_id=notificacion_dto.usuario_id,
             tipo_usuario=notificacion_dto.tipo_usuario,
@@ -18,6 +19,10 @@ class NotificacionRepository:
             leida=notificacion_dto.leida
         )
         self.db.add(notificacion)
+        return notificacion
+
+    def crear(self, notificacion_dto):
+        notificacion = self.agregar(notificacion_dto)
         self.db.commit()
         self.db.refresh(notificacion)
         return notificacion
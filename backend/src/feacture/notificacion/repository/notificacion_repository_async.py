@@ -0,0 +1,25 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.feacture.notificacion.model.notificacion import Notificacion
+
+# Variante asíncrona (DB_ASYNC=true) de NotificacionRepository
+
+class NotificacionRepositoryAsync:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def listar_por_usuario(self, usuario_id, tipo_usuario):
+        result = await self.db.execute(
+            select(Notificacion)
+            .where(Notificacion.usuario_id == usuario_id, Notificacion.tipo_usuario == tipo_usuario)
+            .order_by(Notificacion.fecha_envio.desc())
+        )
+        return result.scalars().all()
+
+    async def marcar_leida(self, notificacion_id):
+        result = await self.db.execute(select(Notificacion).where(Notificacion.id == notificacion_id))
+        noti = result.scalars().first()
+        if noti:
+            noti.leida = 1
+            await self.db.commit()
+        return noti
@@ -0,0 +1,132 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.orm import Session
+from src.config.db import SessionLocal
+from src.feacture.notificacion.model.correo_saliente import CorreoSaliente
+
+ESTADOS_CORREO = ("pendiente", "enviando", "enviado", "fallido")
+
+
+def _a_dict(correo):
+    return {c.name: getattr(correo, c.name) for c in CorreoSaliente.__table__.columns if c.name not in ("cuerpo", "lote")}
+
+
+class OutboxRepository:
+    def __init__(self, db: Session = None):
+        self.db: Session = db or SessionLocal()
+
+    def encolar(self, destinatario, asunto, cuerpo, evento_relacionado=None, referencia_id=None):
+        """Agrega el correo a la sesión sin confirmar: se guarda con el commit del cambio que lo origina."""
+        correo = CorreoSaliente(
+            destinatario=destinatario, asunto=asunto, cuerpo=cuerpo,
+            evento_relacionado=evento_relacionado, referencia_id=referencia_id
+        )
+        self.db.add(correo)
+        return correo
+
+    def _reclamables(self, ahora, lease_segundos):
+        # Pendientes con el intento vencido, o 'enviando' de un worker que no terminó (lease vencido)
+        return or_(
+            and_(CorreoSaliente.estado == "pendiente", CorreoSaliente.proximo_intento <= ahora),
+            and_(CorreoSaliente.estado == "enviando", CorreoSaliente.tomado_en < ahora - timedelta(seconds=lease_segundos)),
+        )
+
+    def reclamar_lote(self, limite, lease_segundos):
+        """
+        Marca hasta `limite` correos como 'enviando' para este worker y los devuelve.
+        El UPDATE repite la condición: si otro worker reclamó alguno entre el SELECT y el
+        UPDATE, ese correo no queda en este lote (cada correo se entrega a un solo worker).
+        """
+        ahora = datetime.now()
+        condicion = self._reclamables(ahora, lease_segundos)
+        try:
+            ids = list(self.db.execute(
+                select(CorreoSaliente.id).where(condicion).order_by(CorreoSaliente.proximo_intento).limit(limite)
+            ).scalars())
+            if not ids:
+                self.db.rollback()
+                return []
+            lote = uuid4().hex
+            self.db.execute(
+                update(CorreoSaliente).where(CorreoSaliente.id.in_(ids), condicion)
+                .values(estado="enviando", lote=lote, tomado_en=ahora)
+                .execution_options(synchronize_session=False)
+            )
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return self.db.query(CorreoSaliente).filter_by(lote=lote, estado="enviando").order_by(CorreoSaliente.id).all()
+
+    def registrar_resultados(self, resultados, max_intentos, backoff):
+        """
+        resultados: [(correo, error, permanente)] con error None si se envió. Un error
+        permanente (o el último intento) pasa a 'fallido'; el resto se reprograma según
+        backoff(intentos). Todo en un commit por lote. Devuelve {estado: cantidad}.
+        """
+        ahora = datetime.now()
+        conteos = {"enviado": 0, "pendiente": 0, "fallido": 0}
+        try:
+            for correo, error, permanente in resultados:
+                correo.intentos += 1
+                correo.lote = None
+                if error is None:
+                    correo.estado, correo.enviado_en, correo.ultimo_error = "enviado", ahora, None
+                elif permanente or correo.intentos >= max_intentos:
+                    correo.estado, correo.ultimo_error = "fallido", str(error)[:1000]
+                else:
+                    correo.estado, correo.ultimo_error = "pendiente", str(error)[:1000]
+                    correo.proximo_intento = ahora + timedelta(seconds=backoff(correo.intentos))
+                conteos[correo.estado] += 1
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return conteos
+
+    def obtener(self, correo_id):
+        correo = self.db.get(CorreoSaliente, correo_id)
+        return _a_dict(correo) if correo else None
+
+    def listar(self, estado=None, limite=50):
+        consulta = select(CorreoSaliente).order_by(CorreoSaliente.id.desc()).limit(limite)
+        if estado:
+            consulta = consulta.where(CorreoSaliente.estado == estado)
+        return [_a_dict(c) for c in self.db.execute(consulta).scalars()]
+
+    def reintentar(self, correo_id):
+        """Devuelve un correo 'fallido' (dead-letter) a la cola con los intentos en cero."""
+        correo = self.db.get(CorreoSaliente, correo_id)
+        if not correo:
+            return None
+        if correo.estado != "fallido":
+            raise ValueError("Solo se pueden reintentar correos en estado 'fallido'")
+        correo.estado, correo.intentos, correo.proximo_intento, correo.lote = "pendiente", 0, datetime.now(), None
+        self.db.commit()
+        return _a_dict(correo)
+
+    def estadisticas(self):
+        conteos = dict(self.db.execute(
+            select(CorreoSaliente.estado, func.count(CorreoSaliente.id)).group_by(CorreoSaliente.estado)
+        ).all())
+        pendiente_mas_antiguo = self.db.execute(
+            select(func.min(CorreoSaliente.creado_en)).where(CorreoSaliente.estado.in_(("pendiente", "enviando")))
+        ).scalar()
+        return {
+            "por_estado": {estado: conteos.get(estado, 0) for estado in ESTADOS_CORREO},
+            "pendiente_mas_antiguo": pendiente_mas_antiguo,
+        }
+
+    def purgar_enviados(self, dias):
+        try:
+            resultado = self.db.execute(
+                delete(CorreoSaliente).where(
+                    CorreoSaliente.estado == "enviado", CorreoSaliente.enviado_en < datetime.now() - timedelta(days=dias)
+                )
+            )
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return resultado.rowcount
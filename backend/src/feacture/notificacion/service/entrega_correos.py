@@ -0,0 +1,115 @@
+import logging
+import random
+import smtplib
+import threading
+import time
+from src.config.db import UnidadDeTrabajo
+from src.feacture.notificacion.repository.outbox_repository import OutboxRepository
+
+logger = logging.getLogger(__name__)
+
+# Workers de entrega de la bandeja de salida (correos_salientes).
+# Cada vuelta reclama un lote, lo envía por una conexión del pool SMTP (send_many)
+# y registra el resultado de cada correo: enviado, reintento con backoff exponencial
+# o 'fallido' (dead-letter) si el error es permanente o se agotaron los intentos.
+# La entrega es "al menos una vez": un lote que quedó 'enviando' al caerse el
+# proceso se vuelve a reclamar cuando vence su lease.
+
+
+def error_permanente(error):
+    """Rechazos 5xx del servidor (destinatario inexistente, mensaje rechazado): reintentar no sirve."""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(codigo >= 500 for codigo, _ in error.recipients.values())
+    return isinstance(error, smtplib.SMTPResponseException) and error.smtp_code >= 500
+
+
+class EntregaCorreos:
+    def __init__(self, sender, workers=1, lote=50, intervalo_segundos=5, max_intentos=6,
+                 backoff_segundos=30, backoff_max_segundos=3600, lease_segundos=300, session_factory=None):
+        self.sender = sender
+        self.workers = workers
+        self.lote = lote
+        self.intervalo_segundos = intervalo_segundos
+        self.max_intentos = max_intentos
+        self.backoff_segundos = backoff_segundos
+        self.backoff_max_segundos = backoff_max_segundos
+        self.lease_segundos = lease_segundos
+        self.session_factory = session_factory
+        self._hilos = []
+        self._detener = threading.Event()
+        self._despertar = threading.Event()
+        self._lock = threading.Lock()
+        self.enviados = 0
+        self.reintentos = 0
+        self.fallidos = 0
+        self.ultimo_error = None
+
+    def backoff(self, intentos):
+        # 30s, 60s, 120s, ... con hasta 10% de variación para no reintentar todos a la vez
+        espera = min(self.backoff_segundos * 2 ** (intentos - 1), self.backoff_max_segundos)
+        return espera * random.uniform(1, 1.1)
+
+    def procesar_lote(self):
+        """Una vuelta: reclama, envía y registra un lote. Devuelve cuántos correos procesó."""
+        with UnidadDeTrabajo(self.session_factory) as uow:
+            repository = OutboxRepository(uow.session)
+            correos = repository.reclamar_lote(self.lote, self.lease_segundos)
+            if not correos:
+                return 0
+            errores = []
+            self.sender.send_many([(c.destinatario, c.asunto, c.cuerpo) for c in correos], errores)
+            resultados = [
+                (correo, error, error is not None and error_permanente(error))
+                for correo, error in zip(correos, errores)
+            ]
+            conteos = repository.registrar_resultados(resultados, self.max_intentos, self.backoff)
+        with self._lock:
+            self.enviados += conteos["enviado"]
+            self.reintentos += conteos["pendiente"]
+            self.fallidos += conteos["fallido"]
+        return len(resultados)
+
+    def _bucle(self):
+        while not self._detener.is_set():
+            try:
+                procesados = self.procesar_lote()
+            except Exception as e:
+                logger.exception("Error en la entrega de correos")
+                self.ultimo_error = str(e)
+                procesados = 0
+            if procesados < self.lote:
+                # Sin más pendientes: espera el intervalo o un aviso de nuevos correos
+                self._despertar.wait(self.intervalo_segundos)
+                self._despertar.clear()
+
+    def despertar(self):
+        """Aviso de que se confirmaron correos nuevos (no espera al intervalo)."""
+        self._despertar.set()
+
+    def iniciar(self):
+        if self._hilos:
+            return
+        self._detener.clear()
+        self._hilos = [
+            threading.Thread(target=self._bucle, name=f"entrega-correos-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for hilo in self._hilos:
+            hilo.start()
+
+    def detener(self, timeout=None):
+        self._detener.set()
+        self._despertar.set()
+        for hilo in self._hilos:
+            hilo.join(timeout)
+        self._hilos = []
+
+    def estadisticas(self):
+        with self._lock:
+            return {
+                "workers_activos": sum(1 for h in self._hilos if h.is_alive()),
+                "enviados": self.enviados,
+                "reintentos_programados": self.reintentos,
+                "fallidos": self.fallidos,
+                "ultimo_error": self.ultimo_error,
+            }
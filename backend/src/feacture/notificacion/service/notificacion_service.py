@@ -1,16 +1,55 @@
 from src.feacture.notificacion.repository.notificacion_repository import NotificacionRepository
+from src.feacture.notificacion.repository.outbox_repository import OutboxRepository
+from src.feacture.notificacion.service.entrega_correos import EntregaCorreos
 from src.feacture.notificacion.dto.notificacion_dto import NotificacionDTO
-from src.utils.email_sender import EmailSender
+from src.utils.email_sender import PooledEmailSender
 from src.config import email as email_config
+from src.config import notificaciones as notificaciones_config
 from datetime import datetime, timedelta
 
+# Un único sender por proceso: las conexiones SMTP autenticadas se reutilizan entre envíos
+email_sender = PooledEmailSender(
+    email_config.EMAIL_SMTP_SERVER,
+    email_config.EMAIL_SMTP_PORT,
+    email_config.EMAIL_SMTP_USER,
+    email_config.EMAIL_SMTP_PASSWORD,
+    email_config.EMAIL_FROM_NAME,
+    starttls=email_config.EMAIL_STARTTLS,
+    timeout=email_config.EMAIL_SMTP_TIMEOUT,
+    pool_size=email_config.EMAIL_POOL_SIZE,
+    pool_timeout=email_config.EMAIL_POOL_TIMEOUT,
+    idle_seconds=email_config.EMAIL_POOL_IDLE_SECONDS,
+    check_seconds=email_config.EMAIL_POOL_CHECK_SECONDS
+)
+
+# Workers que entregan la bandeja de salida (correos_salientes) con ese sender
+entrega_correos = EntregaCorreos(
+    email_sender,
+    workers=notificaciones_config.OUTBOX_WORKERS,
+    lote=notificaciones_config.OUTBOX_LOTE,
+    intervalo_segundos=notificaciones_config.OUTBOX_INTERVALO_SEGUNDOS,
+    max_intentos=notificaciones_config.OUTBOX_MAX_INTENTOS,
+    backoff_segundos=notificaciones_config.OUTBOX_BACKOFF_SEGUNDOS,
+    backoff_max_segundos=notificaciones_config.OUTBOX_BACKOFF_MAX_SEGUNDOS,
+    lease_segundos=notificaciones_config.OUTBOX_LEASE_SEGUNDOS
+)
+
 class NotificacionService:
-    def __init__(self, repository=None):
+    def __init__(self, repository=None, sender=None):
         self.repository = repository or NotificacionRepository()
+        self.sender = sender or email_sender
 
     def crear_notificacion(self, notificacion_dto: NotificacionDTO):
         return self.repository.crear(notificacion_dto)
 
+    def agregar_notificacion(self, notificacion_dto: NotificacionDTO):
+        """Como crear_notificacion, pero sin confirmar: se guarda con el commit del cambio que la origina."""
+        return self.repository.agregar(notificacion_dto)
+
+    def avisar_entrega(self):
+        """Llamar tras confirmar correos encolados con confirmar=False."""
+        entrega_correos.despertar()
+
     def listar_notificaciones_usuario(self, usuario_id, tipo_usuario):
         return self.repository.listar_por_usuario(usuario_id, tipo_usuario)
 
@@ -18,17 +57,17 @@ class NotificacionService:
         return self.repository.marcar_leida(notificacion_id)
 
     def notificar_por_correo(self, to_email, subject, body):
-        sender = EmailSender(
-            email_config.EMAIL_SMTP_SERVER,
-            email_config.EMAIL_SMTP_PORT,
-            email_config.EMAIL_SMTP_USER,
-            email_config.EMAIL_SMTP_PASSWORD,
-            email_config.EMAIL_FROM_NAME
-        )
-        return sender.send_email(to_email, subject, body)
+        return self.sender.send_email(to_email, subject, body)
+
+    def notificar_por_correo_lote(self, mensajes):
+        """mensajes: [(to_email, subject, body), ...]; devuelve un bool por mensaje."""
+        return self.sender.send_many(mensajes)
 
-    def notificar_evento_reunion(self, egresado_id, email, tipo_evento, fecha, hora, reunion_id=None, observaciones=None):
+    def notificar_evento_reunion(self, egresado_id, email, tipo_evento, fecha, hora, reunion_id=None, observaciones=None, confirmar=True):
         # tipo_evento: 'agendada', 'modificada', 'cancelada', 'recordatorio', 'alerta_no_confirmada'
+        # El correo va a la bandeja de salida (lo envían los workers de entrega) junto con la
+        # notificación. Con confirmar=False solo se agregan a la sesión: los guarda el commit
+        # del cambio de la reunión, en la misma transacción.
         titulos = {
             'agendada': 'Reunión agendada',
             'modificada': 'Reunión modificada',
@@ -45,16 +84,7 @@ class NotificacionService:
         }
         titulo = titulos.get(tipo_evento, 'Notificación')
         mensaje = mensajes.get(tipo_evento, 'Tiene un evento en el sistema.')
-        # Enviar correo
-        sender = EmailSender(
-            email_config.EMAIL_SMTP_SERVER,
-            email_config.EMAIL_SMTP_PORT,
-            email_config.EMAIL_SMTP_USER,
-            email_config.EMAIL_SMTP_PASSWORD,
-            email_config.EMAIL_FROM_NAME
-        )
-        sender.send_email(email, titulo, mensaje)
-        # Registrar notificación
+        OutboxRepository(self.repository.db).encolar(email, titulo, mensaje, "reunion", reunion_id)
         noti = NotificacionDTO(
             usuario_id=egresado_id,
             tipo_usuario="egresado",
@@ -63,4 +93,25 @@ class NotificacionService:
             evento_relacionado="reunion",
             referencia_id=reunion_id
         )
-        self.crear_notificacion(noti)
+        self.agregar_notificacion(noti)
+        if confirmar:
+            self.repository.db.commit()
+            self.avisar_entrega()
+
+    # Seguimiento de la bandeja de salida
+
+    def estado_outbox(self):
+        return {**OutboxRepository(self.repository.db).estadisticas(), "entrega": entrega_correos.estadisticas()}
+
+    def listar_correos(self, estado=None, limite=50):
+        return OutboxRepository(self.repository.db).listar(estado, limite)
+
+    def obtener_correo(self, correo_id):
+        return OutboxRepository(self.repository.db).obtener(correo_id)
+
+    def reintentar_correo(self, correo_id):
+        correo = OutboxRepository(self.repository.db).reintentar(correo_id)
+        if correo:
+            self.avisar_entrega()
+        return correo
+
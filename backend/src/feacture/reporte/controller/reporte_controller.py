@@ -1,58 +1,151 @@
-from fastapi import APIRouter, Query, Response, Depends
+from datetime import date
+from fastapi import APIRouter, Query, HTTPException, Depends
+from fastapi.responses import StreamingResponse, FileResponse
+from starlette.concurrency import run_in_threadpool
 from src.feacture.reporte.service.reporte_service import ReporteService
+from src.feacture.reporte.service.exportacion_reportes import ExportacionSaturada, TIPOS_MIME, fragmentos_archivo
+from src.feacture.reporte.service.reporte_job_service import ReporteJobService, TIPOS_REPORTE, FORMATOS_REPORTE
 from src.utils.auth import AuthService
-import os
+from sqlalchemy.orm import Session
+from src.config.db import get_db
+from src.feacture.reporte.repository.reporte_repository import ReporteRepository
 
 router = APIRouter()
-service = ReporteService()
 auth_service = AuthService()
+job_service = ReporteJobService()
+
+def get_service(db: Session = Depends(get_db)):
+    return ReporteService(ReporteRepository(db))
 
 @router.get('/resumen')
-def resumen_reuniones(user=Depends(auth_service.require_role("admin"))):
+def resumen_reuniones(user=Depends(auth_service.require_role("admin")), service=Depends(get_service)):
     return service.resumen_reuniones()
 
 @router.get('/porcentaje-asistencia')
-def porcentaje_asistencia(user=Depends(auth_service.require_role("admin"))):
+def porcentaje_asistencia(user=Depends(auth_service.require_role("admin")), service=Depends(get_service)):
     return {"porcentaje": service.porcentaje_asistencia()}
 
 @router.get('/carreras-mayor-participacion')
-def carreras_mayor_participacion(user=Depends(auth_service.require_role("admin"))):
+def carreras_mayor_participacion(user=Depends(auth_service.require_role("admin")), service=Depends(get_service)):
     return service.carreras_mayor_participacion()
 
 @router.get('/egresados-atendidos')
-def egresados_atendidos(user=Depends(auth_service.require_role("admin"))):
+def egresados_atendidos(user=Depends(auth_service.require_role("admin")), service=Depends(get_service)):
     return {"total": service.egresados_atendidos()}
 
 @router.get('/historial-reuniones/{egresado_id}')
-def historial_reuniones_egresado(egresado_id: str, user=Depends(auth_service.require_role("admin"))):
+def historial_reuniones_egresado(egresado_id: str, user=Depends(auth_service.require_role("admin")), service=Depends(get_service)):
     return service.historial_reuniones_egresado(egresado_id)
 
-@router.get('/exportar-excel')
-def exportar_excel(tipo: str = Query(...), user=Depends(auth_service.require_role("admin"))):
+@router.get('/rango')
+def reuniones_en_rango(
+    desde: date = Query(None), hasta: date = Query(None), carrera: str = Query(None),
+    user=Depends(auth_service.require_role("admin")), service=Depends(get_service)
+):
+    try:
+        return service.reuniones_en_rango(desde, hasta, carrera)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get('/tendencia')
+def tendencia_asistencia(
+    periodo: str = Query("mes"), desde: date = Query(None), hasta: date = Query(None), carrera: str = Query(None),
+    user=Depends(auth_service.require_role("admin")), service=Depends(get_service)
+):
+    try:
+        return service.tendencia_asistencia(periodo, desde, hasta, carrera)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get('/participacion-carreras')
+def participacion_carreras(
+    periodo: str = Query("mes"), desde: date = Query(None), hasta: date = Query(None),
+    user=Depends(auth_service.require_role("admin")), service=Depends(get_service)
+):
+    try:
+        return service.participacion_carreras(periodo, desde, hasta)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get('/cohortes')
+def reporte_cohortes(
+    dimensiones: str = Query("anio_egreso"), anio_desde: int = Query(None), anio_hasta: int = Query(None),
+    user=Depends(auth_service.require_role("admin")), service=Depends(get_service)
+):
+    try:
+        return service.reporte_cohortes([d.strip() for d in dimensiones.split(",") if d.strip()], anio_desde, anio_hasta)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _datos_exportacion(service, tipo):
     if tipo == "resumen":
-        data = [service.resumen_reuniones()]
-    elif tipo == "carreras":
-        data = service.carreras_mayor_participacion()
-    else:
-        data = []
-    filename = "reporte.xlsx"
-    service.exportar_excel(data, filename)
-    with open(filename, "rb") as f:
-        content = f.read()
-    os.remove(filename)
-    return Response(content, media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+        return [service.resumen_reuniones()]
+    if tipo == "carreras":
+        return service.carreras_mayor_participacion()
+    return []
+
+async def _exportar(service, tipo, formato):
+    # Los datos se leen en el threadpool (sesión síncrona) y el archivo se arma en el pool de exportación
+    data = await run_in_threadpool(_datos_exportacion, service, tipo)
+    try:
+        archivo = await (service.exportar_excel(data) if formato == "xlsx" else service.exportar_pdf(data))
+    except ExportacionSaturada as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    return StreamingResponse(
+        fragmentos_archivo(archivo), media_type=TIPOS_MIME[formato],
+        headers={"Content-Disposition": f'attachment; filename="reporte.{formato}"'}
+    )
+
+@router.get('/exportar-excel')
+async def exportar_excel(tipo: str = Query(...), user=Depends(auth_service.require_role("admin")), service=Depends(get_service)):
+    return await _exportar(service, tipo, "xlsx")
 
 @router.get('/exportar-pdf')
-def exportar_pdf(tipo: str = Query(...), user=Depends(auth_service.require_role("admin"))):
-    if tipo == "resumen":
-        data = [service.resumen_reuniones()]
-    elif tipo == "carreras":
-        data = service.carreras_mayor_participacion()
-    else:
-        data = []
-    filename = "reporte.pdf"
-    service.exportar_pdf(data, filename)
-    with open(filename, "rb") as f:
-        content = f.read()
-    os.remove(filename)
-    return Response(content, media_type="application/pdf")
+async def exportar_pdf(tipo: str = Query(...), user=Depends(auth_service.require_role("admin")), service=Depends(get_service)):
+    return await _exportar(service, tipo, "pdf")
+
+# Reportes pesados (historial de todos los egresados, todas las carreras) en segundo plano
+
+@router.post('/trabajos', status_code=202)
+def encolar_reporte(
+    tipo: str = Query(...), formato: str = Query("xlsx"), carrera: str = Query(None),
+    user=Depends(auth_service.require_role("admin"))
+):
+    if tipo not in TIPOS_REPORTE or formato not in FORMATOS_REPORTE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Tipo ({', '.join(TIPOS_REPORTE)}) o formato ({', '.join(FORMATOS_REPORTE)}) no válido"
+        )
+    try:
+        trabajo = job_service.encolar(tipo, formato, carrera)
+    except ValueError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return {"job_id": trabajo.id, "estado": trabajo.estado}
+
+@router.get('/trabajos/{job_id}')
+def estado_reporte(job_id: str, user=Depends(auth_service.require_role("admin"))):
+    estado = job_service.estado(job_id)
+    if not estado:
+        raise HTTPException(status_code=404, detail="Trabajo no encontrado")
+    return estado
+
+@router.post('/trabajos/{job_id}/cancelar')
+def cancelar_reporte(job_id: str, user=Depends(auth_service.require_role("admin"))):
+    estado = job_service.cancelar(job_id)
+    if not estado:
+        raise HTTPException(status_code=404, detail="Trabajo no encontrado")
+    return estado
+
+@router.get('/trabajos/{job_id}/descargar')
+def descargar_reporte(job_id: str, user=Depends(auth_service.require_role("admin"))):
+    trabajo, ruta = job_service.artefacto(job_id)
+    if not trabajo:
+        raise HTTPException(status_code=404, detail="Trabajo no encontrado")
+    if trabajo.estado != "completado":
+        raise HTTPException(status_code=409, detail=f"El reporte no está listo (estado: {trabajo.estado})")
+    if not ruta:
+        raise HTTPException(status_code=410, detail="El archivo del reporte ya no está disponible")
+    formato = trabajo.resultado["formato"]
+    # FileResponse lo envía por fragmentos desde disco
+    return FileResponse(ruta, media_type=TIPOS_MIME[formato], filename=f"{trabajo.tipo}.{formato}")
+
@@ -0,0 +1,34 @@
+# Endpoints de reportes sobre el motor asíncrono (DB_ASYNC=true).
+# Las exportaciones a archivo siguen en reporte_controller.
+from fastapi import APIRouter, Depends
+from src.feacture.reporte.service.reporte_service import ReporteService
+from src.utils.auth import AuthService
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.config.db_async import get_async_db
+from src.feacture.reporte.repository.reporte_repository_async import ReporteRepositoryAsync
+
+router = APIRouter()
+auth_service = AuthService()
+
+def get_service(db: AsyncSession = Depends(get_async_db)):
+    return ReporteService(ReporteRepositoryAsync(db))
+
+@router.get('/resumen')
+async def resumen_reuniones(user=Depends(auth_service.require_role("admin")), service=Depends(get_service)):
+    return await service.resumen_reuniones()
+
+@router.get('/porcentaje-asistencia')
+async def porcentaje_asistencia(user=Depends(auth_service.require_role("admin")), service=Depends(get_service)):
+    return {"porcentaje": await service.porcentaje_asistencia()}
+
+@router.get('/carreras-mayor-participacion')
+async def carreras_mayor_participacion(user=Depends(auth_service.require_role("admin")), service=Depends(get_service)):
+    return await service.carreras_mayor_participacion()
+
+@router.get('/egresados-atendidos')
+async def egresados_atendidos(user=Depends(auth_service.require_role("admin")), service=Depends(get_service)):
+    return {"total": await service.egresados_atendidos()}
+
+@router.get('/historial-reuniones/{egresado_id}')
+async def historial_reuniones_egresado(egresado_id: str, user=Depends(auth_service.require_role("admin")), service=Depends(get_service)):
+    return await service.historial_reuniones_egresado(egresado_id)
@@ -0,0 +1,10 @@
+from sqlalchemy import Column, Integer, String
+from src.config.db import Base
+
+# Contadores de reuniones por estado, mantenidos en la misma transacción que cada
+# alta o cambio de estado (ResumenReunionRepository.ajustar)
+
+class ResumenReunion(Base):
+    __tablename__ = "resumen_reuniones"
+    estado = Column(String(20), primary_key=True)  # pendiente, confirmada, cancelada, realizada
+    total = Column(Integer, nullable=False, default=0, server_default="0")
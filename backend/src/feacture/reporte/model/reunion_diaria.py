@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, Date, Index
+from src.config.db import Base
+
+# Reuniones por (día, carrera, estado), mantenidas en la misma transacción que cada
+# alta o cambio de reunión (ResumenReunionRepository.ajustar) y recompactadas cada noche.
+# Los egresados sin carrera se guardan con carrera_profesional = "".
+
+class ReunionDiaria(Base):
+    __tablename__ = "reuniones_diarias"
+    __table_args__ = (
+        Index("ix_reuniones_diarias_carrera_dia", "carrera_profesional", "dia"),
+    )
+    dia = Column(Date, primary_key=True)
+    carrera_profesional = Column(String(100), primary_key=True)
+    estado = Column(String(20), primary_key=True)
+    total = Column(Integer, nullable=False, default=0, server_default="0")
@@ -1,24 +1,39 @@
-from sqlalchemy import func
+from sqlalchemy import func, select
 from src.feacture.reunion.model.reunion import Reunion
 from src.feacture.egresado.model.egresado import Egresado
+from src.feacture.reporte.repository.resumen_reunion_repository import ResumenReunionRepository
+from src.feacture.reporte.repository.reunion_diaria_repository import ReunionDiariaRepository
 from src.config.db import SessionLocal
 
+
+def resumen_desde_conteos(conteos):
+    return {
+        'agendadas': conteos.get('pendiente', 0),
+        'realizadas': conteos.get('realizada', 0),
+        'canceladas': conteos.get('cancelada', 0),
+        'confirmadas': conteos.get('confirmada', 0),
+    }
+
+
+def porcentaje_desde_conteos(conteos):
+    total = sum(conteos.values())
+    return (conteos.get('realizada', 0) / total * 100) if total > 0 else 0
+
+
+TAMANIO_LOTE_HISTORIAL = 1000
+
+
 class ReporteRepository:
-    def __init__(self):
-        self.db = SessionLocal()
+    def __init__(self, db=None):
+        self.db = db or SessionLocal()
+
+    # resumen y porcentaje leen los contadores de resumen_reuniones (no cuentan la tabla de reuniones)
 
     def resumen_reuniones(self):
-        return {
-            'agendadas': self.db.query(Reunion).filter(Reunion.estado == 'pendiente').count(),
-            'realizadas': self.db.query(Reunion).filter(Reunion.estado == 'realizada').count(),
-            'canceladas': self.db.query(Reunion).filter(Reunion.estado == 'cancelada').count(),
-            'confirmadas': self.db.query(Reunion).filter(Reunion.estado == 'confirmada').count(),
-        }
+        return resumen_desde_conteos(ResumenReunionRepository(self.db).conteos())
 
     def porcentaje_asistencia(self):
-        total = self.db.query(Reunion).count()
-        realizadas = self.db.query(Reunion).filter(Reunion.estado == 'realizada').count()
-        return (realizadas / total * 100) if total > 0 else 0
+        return porcentaje_desde_conteos(ResumenReunionRepository(self.db).conteos())
 
     def carreras_mayor_participacion(self):
         return self.db.query(Egresado.carrera_profesional, func.count(Reunion.id).label('total')) \
@@ -32,3 +47,56 @@ class ReporteRepository:
 
     def historial_reuniones_egresado(self, egresado_id):
         return self.db.query(Reunion).filter_by(egresado_id=egresado_id).all()
+
+    def _consulta_historial(self, columnas, carrera=None):
+        consulta = select(*columnas).join(Egresado, Egresado.id == Reunion.egresado_id)
+        if carrera is not None:
+            consulta = consulta.where(Egresado.carrera_profesional == carrera)
+        return consulta
+
+    def contar_historial_completo(self, carrera=None):
+        return self.db.execute(self._consulta_historial([func.count(Reunion.id)], carrera)).scalar()
+
+    def historial_completo(self, carrera=None, tamanio_lote=None):
+        """Generador de dicts con las reuniones de todos los egresados, leídas con un cursor del servidor."""
+        consulta = self._consulta_historial([
+            Reunion.id.label("reunion_id"), Egresado.usuario_dni.label("dni"), Egresado.nombres,
+            Egresado.apellidos, Egresado.carrera_profesional, Reunion.fecha, Reunion.hora,
+            Reunion.estado, Reunion.observaciones,
+        ], carrera).order_by(Egresado.apellidos, Egresado.id, Reunion.fecha, Reunion.hora)
+        consulta = consulta.execution_options(stream_results=True, yield_per=tamanio_lote or TAMANIO_LOTE_HISTORIAL)
+
+        def filas():
+            resultado = self.db.execute(consulta)
+            try:
+                for fila in resultado.mappings():
+                    yield dict(fila)
+            finally:
+                resultado.close()
+        return filas()
+
+    # Consultas por rango de fechas: leen solo el rollup reuniones_diarias
+
+    def reuniones_en_rango(self, desde, hasta, carrera=None):
+        conteos = {}
+        for _, _, estado, total in ReunionDiariaRepository(self.db).filas(desde, hasta, carrera):
+            conteos[estado] = conteos.get(estado, 0) + total
+        return {
+            "desde": desde, "hasta": hasta, **resumen_desde_conteos(conteos),
+            "porcentaje_asistencia": porcentaje_desde_conteos(conteos),
+        }
+
+    def tendencia_asistencia(self, desde, hasta, periodo, carrera=None):
+        conteos = ReunionDiariaRepository(self.db).conteos_por_periodo(desde, hasta, periodo, carrera)
+        return [
+            {"periodo": inicio, **resumen_desde_conteos(c), "porcentaje_asistencia": porcentaje_desde_conteos(c)}
+            for inicio, c in sorted(conteos.items())
+        ]
+
+    def participacion_carreras(self, desde, hasta, periodo):
+        conteos = ReunionDiariaRepository(self.db).conteos_por_periodo(desde, hasta, periodo, por_carrera=True)
+        filas = [
+            {"periodo": inicio, "carrera_profesional": carrera, "total": sum(c.values()), "realizadas": c.get("realizada", 0)}
+            for (inicio, carrera), c in conteos.items()
+        ]
+        return sorted(filas, key=lambda f: (f["periodo"], -f["total"], f["carrera_profesional"] or ""))
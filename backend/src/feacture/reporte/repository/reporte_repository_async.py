@@ -0,0 +1,38 @@
+from sqlalchemy import func, select, distinct
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.feacture.reunion.model.reunion import Reunion
+from src.feacture.egresado.model.egresado import Egresado
+from src.feacture.reporte.model.resumen_reunion import ResumenReunion
+from src.feacture.reporte.repository.reporte_repository import resumen_desde_conteos, porcentaje_desde_conteos
+
+# Variante asíncrona (DB_ASYNC=true) de ReporteRepository
+
+class ReporteRepositoryAsync:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _conteos(self):
+        result = await self.db.execute(select(ResumenReunion.estado, ResumenReunion.total))
+        return dict(result.all())
+
+    async def resumen_reuniones(self):
+        return resumen_desde_conteos(await self._conteos())
+
+    async def porcentaje_asistencia(self):
+        return porcentaje_desde_conteos(await self._conteos())
+
+    async def carreras_mayor_participacion(self):
+        result = await self.db.execute(
+            select(Egresado.carrera_profesional, func.count(Reunion.id).label('total'))
+            .join(Reunion, Reunion.egresado_id == Egresado.id)
+            .group_by(Egresado.carrera_profesional)
+            .order_by(func.count(Reunion.id).desc())
+        )
+        return result.all()
+
+    async def egresados_atendidos(self):
+        return await self.db.scalar(select(func.count(distinct(Reunion.egresado_id))))
+
+    async def historial_reuniones_egresado(self, egresado_id):
+        result = await self.db.execute(select(Reunion).where(Reunion.egresado_id == egresado_id))
+        return result.scalars().all()
@@ -0,0 +1,71 @@
+from sqlalchemy import func, insert, update, delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from src.config.db import SessionLocal
+from src.feacture.reporte.model.resumen_reunion import ResumenReunion
+from src.feacture.reporte.repository.reunion_diaria_repository import ReunionDiariaRepository
+from src.feacture.reunion.model.reunion import Reunion
+
+ESTADOS_REUNION = ("pendiente", "confirmada", "cancelada", "realizada")
+
+
+def foto(reunion):
+    """Lo que cuentan los contadores de una reunión: (estado, fecha, egresado_id)."""
+    return (reunion.estado, reunion.fecha, reunion.egresado_id)
+
+
+class ResumenReunionRepository:
+    def __init__(self, db: Session = None):
+        self.db: Session = db or SessionLocal()
+        self.diario = ReunionDiariaRepository(self.db)
+
+    def ajustar(self, anterior, nuevo):
+        """
+        Pasa una reunión de la foto `anterior` a `nuevo` (None = alta) en los contadores
+        por estado y en el rollup diario. No confirma: el llamador hace commit junto
+        con el cambio de la reunión.
+        """
+        estado_anterior = anterior[0] if anterior else None
+        estado_nuevo = nuevo[0] if nuevo else None
+        if estado_anterior != estado_nuevo:
+            if estado_anterior:
+                self._sumar(estado_anterior, -1)
+            if estado_nuevo:
+                self._sumar(estado_nuevo, 1)
+        self.diario.ajustar(anterior, nuevo)
+
+    def _sumar(self, estado, delta):
+        # UPDATE atómico (total = total + delta): sin lecturas previas ni carreras entre peticiones
+        resultado = self.db.execute(
+            update(ResumenReunion).where(ResumenReunion.estado == estado).values(total=ResumenReunion.total + delta)
+        )
+        if resultado.rowcount == 0:
+            try:
+                with self.db.begin_nested():
+                    self.db.execute(insert(ResumenReunion).values(estado=estado, total=delta))
+            except IntegrityError:
+                # Otra transacción creó la fila entre el UPDATE y el INSERT
+                self.db.execute(
+                    update(ResumenReunion).where(ResumenReunion.estado == estado).values(total=ResumenReunion.total + delta)
+                )
+
+    def conteos(self):
+        """{estado: total} en una consulta sobre a lo sumo unas pocas filas."""
+        return dict(self.db.execute(select(ResumenReunion.estado, ResumenReunion.total)).all())
+
+    def reconstruir(self):
+        """Recalcula los contadores desde la tabla de reuniones (reconciliación)."""
+        try:
+            self.db.execute(delete(ResumenReunion))
+            filas = self.db.execute(
+                select(Reunion.estado, func.count(Reunion.id)).where(Reunion.estado.isnot(None)).group_by(Reunion.estado)
+            ).all()
+            # Los estados conocidos siempre tienen fila, así ajustar() casi nunca necesita insertar
+            conteos = {estado: 0 for estado in ESTADOS_REUNION}
+            conteos.update(filas)
+            self.db.execute(insert(ResumenReunion), [{"estado": estado, "total": total} for estado, total in conteos.items()])
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return conteos
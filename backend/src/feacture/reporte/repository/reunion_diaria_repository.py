@@ -0,0 +1,104 @@
+from collections import defaultdict
+from datetime import timedelta
+from sqlalchemy import func, insert, update, delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from src.config.db import SessionLocal
+from src.feacture.reporte.model.reunion_diaria import ReunionDiaria
+from src.feacture.reunion.model.reunion import Reunion
+from src.feacture.egresado.model.egresado import Egresado
+
+SIN_CARRERA = ""
+PERIODOS = ("dia", "semana", "mes")
+
+
+def inicio_periodo(dia, periodo):
+    if periodo == "semana":
+        return dia - timedelta(days=dia.weekday())  # lunes
+    if periodo == "mes":
+        return dia.replace(day=1)
+    return dia
+
+
+class ReunionDiariaRepository:
+    def __init__(self, db: Session = None):
+        self.db: Session = db or SessionLocal()
+
+    def ajustar(self, anterior, nuevo):
+        """
+        anterior/nuevo: (estado, fecha, egresado_id) de la reunión antes y después del cambio (None = no existe).
+        No confirma: el llamador hace commit junto con el cambio de la reunión.
+        """
+        if anterior == nuevo:
+            return
+        carreras = {}
+        for foto, delta in ((anterior, -1), (nuevo, 1)):
+            if not foto or not foto[0]:
+                continue
+            estado, dia, egresado_id = foto
+            if egresado_id not in carreras:
+                carreras[egresado_id] = self.db.execute(
+                    select(Egresado.carrera_profesional).where(Egresado.id == egresado_id)
+                ).scalar() or SIN_CARRERA
+            self._sumar(dia, carreras[egresado_id], estado, delta)
+
+    def _sumar(self, dia, carrera, estado, delta):
+        condicion = (
+            (ReunionDiaria.dia == dia) & (ReunionDiaria.carrera_profesional == carrera) & (ReunionDiaria.estado == estado)
+        )
+        resultado = self.db.execute(update(ReunionDiaria).where(condicion).values(total=ReunionDiaria.total + delta))
+        if resultado.rowcount == 0:
+            try:
+                with self.db.begin_nested():
+                    self.db.execute(insert(ReunionDiaria).values(dia=dia, carrera_profesional=carrera, estado=estado, total=delta))
+            except IntegrityError:
+                # Otra transacción creó la fila entre el UPDATE y el INSERT
+                self.db.execute(update(ReunionDiaria).where(condicion).values(total=ReunionDiaria.total + delta))
+
+    def compactar(self, desde=None):
+        """
+        Recalcula las filas (desde `desde`, o todas) a partir de reuniones y egresados:
+        corrige derivas (p. ej. un egresado que cambió de carrera) y elimina las filas en cero.
+        """
+        try:
+            borrar = delete(ReunionDiaria)
+            consulta = (
+                select(
+                    Reunion.fecha, func.coalesce(Egresado.carrera_profesional, SIN_CARRERA),
+                    Reunion.estado, func.count(Reunion.id)
+                )
+                .outerjoin(Egresado, Egresado.id == Reunion.egresado_id)
+                .where(Reunion.estado.isnot(None))
+                .group_by(Reunion.fecha, func.coalesce(Egresado.carrera_profesional, SIN_CARRERA), Reunion.estado)
+            )
+            if desde is not None:
+                borrar = borrar.where(ReunionDiaria.dia >= desde)
+                consulta = consulta.where(Reunion.fecha >= desde)
+            self.db.execute(borrar)
+            filas = [
+                {"dia": dia, "carrera_profesional": carrera, "estado": estado, "total": total}
+                for dia, carrera, estado, total in self.db.execute(consulta)
+            ]
+            if filas:
+                self.db.execute(insert(ReunionDiaria), filas)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return len(filas)
+
+    def filas(self, desde, hasta, carrera=None):
+        consulta = select(
+            ReunionDiaria.dia, ReunionDiaria.carrera_profesional, ReunionDiaria.estado, ReunionDiaria.total
+        ).where(ReunionDiaria.dia >= desde, ReunionDiaria.dia <= hasta, ReunionDiaria.total != 0)
+        if carrera is not None:
+            consulta = consulta.where(ReunionDiaria.carrera_profesional == carrera)
+        return self.db.execute(consulta).all()
+
+    def conteos_por_periodo(self, desde, hasta, periodo, carrera=None, por_carrera=False):
+        """{(inicio_periodo[, carrera]): {estado: total}} sumando solo filas del rollup."""
+        conteos = defaultdict(lambda: defaultdict(int))
+        for dia, carrera_fila, estado, total in self.filas(desde, hasta, carrera):
+            clave = (inicio_periodo(dia, periodo), carrera_fila or None) if por_carrera else inicio_periodo(dia, periodo)
+            conteos[clave][estado] += total
+        return conteos
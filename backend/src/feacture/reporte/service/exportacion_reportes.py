@@ -0,0 +1,167 @@
+import asyncio
+import csv
+import io
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from fpdf import FPDF
+from openpyxl import Workbook
+from src.config import reportes as reportes_config
+
+# Render de reportes a Excel/PDF en un pool de hilos propio y acotado.
+# Cada exportación escribe en su propio SpooledTemporaryFile: en memoria mientras
+# es chico y en un temporal anónimo si crece, sin nombres fijos compartidos entre
+# peticiones. El threadpool de FastAPI queda libre mientras se arma el archivo.
+
+TIPOS_MIME = {
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "pdf": "application/pdf",
+    "csv": "text/csv",
+}
+TAMANIO_FRAGMENTO = 64 * 1024
+
+
+class ExportacionSaturada(Exception):
+    pass
+
+
+def renderizar_excel(data, destino):
+    pd.DataFrame(data).to_excel(destino, index=False)
+
+
+def renderizar_pdf(data, destino):
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Arial", size=12)
+    for row in data:
+        pdf.cell(200, 10, txt=str(row), ln=True)
+    destino.write(pdf.output(dest="S").encode("latin-1"))
+
+
+RENDERIZADORES = {"xlsx": renderizar_excel, "pdf": renderizar_pdf}
+
+
+# Escritura fila a fila para reportes grandes (trabajos en segundo plano): no arman
+# un DataFrame ni una lista con todas las filas. avance(n) se llama cada
+# FILAS_POR_AVANCE filas y al terminar; puede lanzar una excepción para cancelar.
+
+FILAS_POR_AVANCE = 500
+
+
+def _recorrer(filas, avance):
+    n = 0
+    for n, fila in enumerate(filas, 1):
+        yield fila
+        if avance and n % FILAS_POR_AVANCE == 0:
+            avance(n)
+    if avance:
+        avance(n)
+
+
+def escribir_csv(filas, columnas, destino, avance=None):
+    texto = io.TextIOWrapper(destino, encoding="utf-8", newline="")
+    escritor = csv.DictWriter(texto, fieldnames=columnas)
+    escritor.writeheader()
+    for fila in _recorrer(filas, avance):
+        escritor.writerow(fila)
+    texto.flush()
+    texto.detach()
+
+
+def escribir_excel(filas, columnas, destino, avance=None):
+    libro = Workbook(write_only=True)  # las filas se vuelcan a disco a medida que se agregan
+    hoja = libro.create_sheet("reporte")
+    hoja.append(list(columnas))
+    try:
+        for fila in _recorrer(filas, avance):
+            hoja.append([fila.get(c) for c in columnas])
+    except BaseException:
+        hoja.close()  # libera el temporal de openpyxl si se cancela o falla
+        raise
+    libro.save(destino)
+
+
+def escribir_pdf(filas, columnas, destino, avance=None):
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Arial", size=8)
+    for fila in _recorrer(filas, avance):
+        texto = " | ".join(str(fila.get(c, "")) for c in columnas)
+        pdf.cell(0, 5, txt=texto.encode("latin-1", "replace").decode("latin-1"), ln=True)
+    destino.write(pdf.output(dest="S").encode("latin-1"))
+
+
+ESCRITORES = {"csv": escribir_csv, "xlsx": escribir_excel, "pdf": escribir_pdf}
+
+
+def fragmentos_archivo(archivo, tamanio=TAMANIO_FRAGMENTO):
+    """Lee el archivo desde el inicio en fragmentos y lo cierra al terminar (o si se corta la descarga)."""
+    try:
+        archivo.seek(0)
+        while True:
+            fragmento = archivo.read(tamanio)
+            if not fragmento:
+                break
+            yield fragmento
+    finally:
+        archivo.close()
+
+
+class PoolExportacion:
+    def __init__(self, workers, max_pendientes, memoria_bytes):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="reporte")
+        self._cupos = threading.BoundedSemaphore(max_pendientes)
+        self.workers = workers
+        self.max_pendientes = max_pendientes
+        self.memoria_bytes = memoria_bytes
+        self.rechazados = 0
+        self.en_disco = 0
+        self._lock = threading.Lock()
+
+    def _renderizar(self, formato, data):
+        archivo = tempfile.SpooledTemporaryFile(max_size=self.memoria_bytes)
+        try:
+            RENDERIZADORES[formato](data, archivo)
+        except Exception:
+            archivo.close()
+            raise
+        if archivo.tell() > self.memoria_bytes:  # SpooledTemporaryFile ya pasó a disco
+            with self._lock:
+                self.en_disco += 1
+        return archivo
+
+    def _enviar(self, formato, data):
+        if not self._cupos.acquire(blocking=False):
+            with self._lock:
+                self.rechazados += 1
+            raise ExportacionSaturada("Demasiadas exportaciones en curso")
+        try:
+            futuro = self._executor.submit(self._renderizar, formato, data)
+        except Exception:
+            self._cupos.release()
+            raise
+        futuro.add_done_callback(lambda _: self._cupos.release())
+        return futuro
+
+    async def renderizar(self, formato, data):
+        """Devuelve el archivo renderizado (posicionado al final); el llamador lo cierra."""
+        return await asyncio.wrap_future(self._enviar(formato, data))
+
+    def renderizar_sync(self, formato, data):
+        return self._enviar(formato, data).result()
+
+    def estadisticas(self):
+        return {
+            "workers": self.workers,
+            "max_pendientes": self.max_pendientes,
+            "rechazados_por_saturacion": self.rechazados,
+            "derivados_a_disco": self.en_disco,
+        }
+
+
+pool_exportacion = PoolExportacion(
+    reportes_config.REPORTES_EXPORTACION_WORKERS,
+    reportes_config.REPORTES_EXPORTACION_MAX_PENDIENTES,
+    reportes_config.REPORTES_EXPORTACION_MEMORIA_BYTES,
+)
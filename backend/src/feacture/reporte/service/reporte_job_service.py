@@ -0,0 +1,103 @@
+import os
+import time
+from src.config import reportes as reportes_config
+from src.config.db import UnidadDeTrabajo
+from src.feacture.reporte.repository.reporte_repository import ReporteRepository
+from src.feacture.reporte.service.exportacion_reportes import ESCRITORES
+from src.utils.trabajos import GestorTrabajos, TrabajoCancelado
+
+# Reportes pesados en segundo plano: el trabajo escribe el archivo en
+# REPORTES_ARTEFACTOS_DIR (primero como .tmp y luego se renombra) y la descarga
+# lo sirve desde disco. Los archivos vencidos se borran en limpiar_artefactos().
+
+COLUMNAS_HISTORIAL = (
+    "reunion_id", "dni", "nombres", "apellidos", "carrera_profesional", "fecha", "hora", "estado", "observaciones",
+)
+COLUMNAS_CARRERAS = ("carrera_profesional", "total")
+TIPOS_REPORTE = ("historial", "carreras")
+FORMATOS_REPORTE = tuple(ESCRITORES)
+
+gestor_reportes = GestorTrabajos(
+    reportes_config.REPORTES_TRABAJOS_WORKERS,
+    reportes_config.REPORTES_TRABAJOS_MAX_PENDIENTES,
+    retencion_segundos=reportes_config.REPORTES_ARTEFACTOS_RETENCION_HORAS * 3600,
+)
+
+
+class ReporteJobService:
+    """Encola reportes, expone su avance y ubica el archivo generado."""
+
+    def __init__(self, gestor=None, directorio=None):
+        self.gestor = gestor or gestor_reportes
+        self.directorio = directorio or reportes_config.REPORTES_ARTEFACTOS_DIR
+
+    def _ruta(self, trabajo_id, formato):
+        return os.path.join(self.directorio, f"{trabajo_id}.{formato}")
+
+    def encolar(self, tipo, formato, carrera=None):
+        if tipo not in TIPOS_REPORTE:
+            raise ValueError(f"Tipo de reporte no válido. Opciones: {', '.join(TIPOS_REPORTE)}")
+        if formato not in FORMATOS_REPORTE:
+            raise ValueError(f"Formato no válido. Opciones: {', '.join(FORMATOS_REPORTE)}")
+        os.makedirs(self.directorio, exist_ok=True)
+
+        def ejecutar(trabajo):
+            ruta = self._ruta(trabajo.id, formato)
+            temporal = ruta + ".tmp"
+
+            def avance(procesados):
+                if trabajo.cancelado:
+                    raise TrabajoCancelado()
+                trabajo.progreso(procesados, exitosos=procesados)
+
+            try:
+                # Sesión propia por trabajo: las sesiones de BD no se comparten entre hilos
+                with UnidadDeTrabajo() as uow:
+                    repository = ReporteRepository(uow.session)
+                    if tipo == "historial":
+                        trabajo.total = repository.contar_historial_completo(carrera)
+                        filas, columnas = repository.historial_completo(carrera), COLUMNAS_HISTORIAL
+                    else:
+                        filas = [dict(f._mapping) for f in repository.carreras_mayor_participacion()]
+                        trabajo.total, columnas = len(filas), COLUMNAS_CARRERAS
+                    with open(temporal, "wb") as destino:
+                        ESCRITORES[formato](filas, columnas, destino, avance)
+                os.replace(temporal, ruta)
+            except BaseException:
+                if os.path.exists(temporal):
+                    os.remove(temporal)
+                raise
+            return {"formato": formato, "filas": trabajo.procesados, "bytes": os.path.getsize(ruta)}
+
+        return self.gestor.encolar(f"reporte_{tipo}", ejecutar)
+
+    def estado(self, trabajo_id):
+        trabajo = self.gestor.obtener(trabajo_id)
+        return trabajo.a_dict() if trabajo else None
+
+    def cancelar(self, trabajo_id):
+        trabajo = self.gestor.cancelar(trabajo_id)
+        return trabajo.a_dict() if trabajo else None
+
+    def artefacto(self, trabajo_id):
+        """(trabajo, ruta) del archivo listo para descargar; ruta es None si aún no existe o ya venció."""
+        trabajo = self.gestor.obtener(trabajo_id)
+        if not trabajo:
+            return None, None
+        if trabajo.estado != "completado":
+            return trabajo, None
+        ruta = self._ruta(trabajo.id, trabajo.resultado["formato"])
+        return trabajo, ruta if os.path.exists(ruta) else None
+
+    def limpiar_artefactos(self, ahora=None):
+        """Borra los archivos (y .tmp huérfanos) más antiguos que la retención. Devuelve cuántos borró."""
+        if not os.path.isdir(self.directorio):
+            return 0
+        limite = (ahora or time.time()) - self.gestor.retencion_segundos
+        borrados = 0
+        for nombre in os.listdir(self.directorio):
+            ruta = os.path.join(self.directorio, nombre)
+            if os.path.isfile(ruta) and os.path.getmtime(ruta) < limite:
+                os.remove(ruta)
+                borrados += 1
+        return borrados
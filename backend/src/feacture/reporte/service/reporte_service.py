@@ -1,36 +1,94 @@
+import asyncio
+from datetime import date, timedelta
 from src.feacture.reporte.repository.reporte_repository import ReporteRepository
-import pandas as pd
-from fpdf import FPDF
+from src.feacture.reunion.repository.reunion_repository import REUNIONES_MODIFICADAS
+from src.feacture.egresado.repository.egresado_repository import EGRESADOS_GUARDADOS
+from src.config import reportes as reportes_config
+from src.utils.cache import CacheTTL
+from src.utils.eventos import suscribir
+from src.feacture.reporte.repository.reunion_diaria_repository import PERIODOS
+from src.feacture.reporte.service.exportacion_reportes import pool_exportacion
+from src.feacture.reporte.service.snapshot_cohortes import snapshot_cohortes
+
+# Resultados de reportes compartidos entre peticiones (y entre los modos síncrono
+# y asíncrono). Las peticiones simultáneas de un mismo reporte esperan un único cálculo.
+cache_reportes = CacheTTL(reportes_config.REPORTES_CACHE_ENTRADAS, reportes_config.REPORTES_CACHE_SEGUNDOS)
+suscribir(REUNIONES_MODIFICADAS, lambda **datos: cache_reportes.invalidar())
+suscribir(EGRESADOS_GUARDADOS, lambda **datos: cache_reportes.invalidar())
+
+
+def _filas_reunion(reuniones):
+    # Las instancias ORM no sobreviven a su sesión; se cachean sus columnas
+    return [{c.name: getattr(r, c.name) for c in r.__table__.columns} for r in reuniones]
+
 
 class ReporteService:
     def __init__(self, repository=None):
         self.repository = repository or ReporteRepository()
 
+    def _cacheado(self, nombre, *args, convertir=None):
+        funcion = getattr(self.repository, nombre)
+        clave = (nombre,) + args
+        if asyncio.iscoroutinefunction(funcion):
+            # Repositorio asíncrono: devuelve una corrutina que el controller espera
+            async def calcular_async():
+                resultado = await funcion(*args)
+                return convertir(resultado) if convertir else resultado
+            return cache_reportes.obtener_o_calcular_async(clave, calcular_async)
+
+        def calcular():
+            resultado = funcion(*args)
+            return convertir(resultado) if convertir else resultado
+        return cache_reportes.obtener_o_calcular(clave, calcular)
+
     def resumen_reuniones(self):
-        return self.repository.resumen_reuniones()
+        return self._cacheado("resumen_reuniones")
 
     def porcentaje_asistencia(self):
-        return self.repository.porcentaje_asistencia()
+        return self._cacheado("porcentaje_asistencia")
 
     def carreras_mayor_participacion(self):
-        return self.repository.carreras_mayor_participacion()
+        return self._cacheado("carreras_mayor_participacion", convertir=lambda filas: [dict(f._mapping) for f in filas])
 
     def egresados_atendidos(self):
-        return self.repository.egresados_atendidos()
+        return self._cacheado("egresados_atendidos")
 
     def historial_reuniones_egresado(self, egresado_id):
-        return self.repository.historial_reuniones_egresado(egresado_id)
-
-    def exportar_excel(self, data, filename):
-        df = pd.DataFrame(data)
-        df.to_excel(filename, index=False)
-        return filename
-
-    def exportar_pdf(self, data, filename):
-        pdf = FPDF()
-        pdf.add_page()
-        pdf.set_font("Arial", size=12)
-        for row in data:
-            pdf.cell(200, 10, txt=str(row), ln=True)
-        pdf.output(filename)
-        return filename
+        return self._cacheado("historial_reuniones_egresado", egresado_id, convertir=_filas_reunion)
+
+    def _rango(self, desde, hasta):
+        hasta = hasta or date.today()
+        desde = desde or hasta - timedelta(days=reportes_config.REPORTES_RANGO_DIAS_POR_DEFECTO)
+        if desde > hasta:
+            raise ValueError("La fecha 'desde' no puede ser posterior a 'hasta'")
+        return desde, hasta
+
+    def _periodo(self, periodo):
+        if periodo not in PERIODOS:
+            raise ValueError(f"Periodo no válido. Opciones: {', '.join(PERIODOS)}")
+        return periodo
+
+    def reuniones_en_rango(self, desde=None, hasta=None, carrera=None):
+        desde, hasta = self._rango(desde, hasta)
+        return self._cacheado("reuniones_en_rango", desde, hasta, carrera)
+
+    def tendencia_asistencia(self, periodo="mes", desde=None, hasta=None, carrera=None):
+        periodo = self._periodo(periodo)
+        desde, hasta = self._rango(desde, hasta)
+        return self._cacheado("tendencia_asistencia", desde, hasta, periodo, carrera)
+
+    def participacion_carreras(self, periodo="mes", desde=None, hasta=None):
+        periodo = self._periodo(periodo)
+        desde, hasta = self._rango(desde, hasta)
+        return self._cacheado("participacion_carreras", desde, hasta, periodo)
+
+    def reporte_cohortes(self, dimensiones, anio_desde=None, anio_hasta=None):
+        # Lee la foto en memoria (no la BD salvo en la primera carga); la respuesta incluye su antigüedad
+        snapshot_cohortes.asegurar_cargado(self.repository.db)
+        return snapshot_cohortes.cohortes(dimensiones, anio_desde, anio_hasta)
+
+    def exportar_excel(self, data):
+        return pool_exportacion.renderizar("xlsx", data)
+
+    def exportar_pdf(self, data):
+        return pool_exportacion.renderizar("pdf", data)
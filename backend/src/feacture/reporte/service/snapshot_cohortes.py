@@ -0,0 +1,133 @@
+import threading
+import time
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+from sqlalchemy import select
+from src.feacture.egresado.model.egresado import Egresado
+from src.feacture.reunion.model.reunion import Reunion
+from src.feacture.reporte.repository.resumen_reunion_repository import ESTADOS_REUNION
+
+# Foto columnar (pandas/NumPy) de egresados × reuniones para los reportes de cohortes.
+# Una fila por reunión (o por egresado sin reuniones), con las dimensiones como
+# columnas categóricas y un indicador 0/1 por estado: los group-by suman columnas
+# en memoria sin tocar las tablas de la BD. Se carga en la primera consulta y el
+# scheduler la refresca cada REPORTES_SNAPSHOT_REFRESCO_MINUTOS; las respuestas
+# informan su antigüedad.
+
+DIMENSIONES = ("anio_egreso", "genero", "ciudad", "carrera_profesional")
+SIN_DATO = "Sin dato"
+SIN_ANIO = -1
+
+
+def _columnas(filas):
+    df = pd.DataFrame.from_records(filas, columns=("egresado_id",) + DIMENSIONES + ("estado",))
+    datos = pd.DataFrame({
+        "egresado_id": df["egresado_id"].astype("category"),
+        "anio_egreso": pd.to_numeric(df["anio_egreso"]).fillna(SIN_ANIO).astype(np.int32),
+    })
+    for dimension in DIMENSIONES[1:]:
+        datos[dimension] = df[dimension].fillna(SIN_DATO).replace("", SIN_DATO).astype("category")
+    estados = df["estado"].to_numpy(dtype=object)
+    datos["con_reunion"] = pd.notna(estados).astype(np.int32)
+    for estado in ESTADOS_REUNION:
+        datos[estado] = (estados == estado).astype(np.int32)
+    return datos
+
+
+def _unir(partes):
+    # Las categóricas de cada bloque tienen categorías distintas: se unen sin pasar por object
+    datos = {}
+    for columna in partes[0].columns:
+        if isinstance(partes[0][columna].dtype, pd.CategoricalDtype):
+            datos[columna] = union_categoricals([p[columna] for p in partes])
+        else:
+            datos[columna] = np.concatenate([p[columna].to_numpy() for p in partes])
+    return pd.DataFrame(datos)
+
+
+class SnapshotCohortes:
+    def __init__(self):
+        self._lock_carga = threading.Lock()
+        self.datos = None
+        self.cargado_en = None
+        self.duracion_carga_ms = None
+
+    @property
+    def cargado(self):
+        return self.cargado_en is not None
+
+    def edad_segundos(self):
+        return round(time.time() - self.cargado_en, 1) if self.cargado else None
+
+    def cargar(self, db, tamanio_lote=10000):
+        inicio = time.perf_counter()
+        consulta = (
+            select(Egresado.id, Egresado.anio_egreso, Egresado.genero, Egresado.ciudad, Egresado.carrera_profesional, Reunion.estado)
+            .outerjoin(Reunion, Reunion.egresado_id == Egresado.id)
+            .execution_options(yield_per=tamanio_lote)
+        )
+        # Cada bloque de filas pasa a columnas compactas antes de leer el siguiente:
+        # nunca se materializa el join completo como tuplas de Python
+        partes = [_columnas(bloque) for bloque in db.execute(consulta).partitions()]
+        datos = _unir(partes) if partes else _columnas([])
+        # Se reemplaza la referencia completa: las consultas en curso siguen con la foto anterior
+        self.datos = datos
+        self.cargado_en = time.time()
+        self.duracion_carga_ms = round((time.perf_counter() - inicio) * 1000, 2)
+        return len(datos)
+
+    def asegurar_cargado(self, db):
+        if self.cargado:
+            return
+        with self._lock_carga:
+            if not self.cargado:
+                self.cargar(db)
+
+    def cohortes(self, dimensiones, anio_desde=None, anio_hasta=None):
+        invalidas = [d for d in dimensiones if d not in DIMENSIONES]
+        if not dimensiones or invalidas:
+            raise ValueError(f"Dimensiones no válidas. Opciones: {', '.join(DIMENSIONES)}")
+        datos, cargado_en = self.datos, self.cargado_en
+        mascara = np.ones(len(datos), dtype=bool)
+        if anio_desde is not None:
+            mascara &= datos["anio_egreso"].to_numpy() >= anio_desde
+        if anio_hasta is not None:
+            mascara &= datos["anio_egreso"].to_numpy() <= anio_hasta
+        datos = datos[mascara]
+
+        grupos = datos.groupby(list(dimensiones), observed=True, sort=True)
+        sumas = grupos[["con_reunion", *ESTADOS_REUNION]].sum()
+        sumas["egresados"] = grupos["egresado_id"].nunique()
+        atendidos = datos[datos["con_reunion"].to_numpy() == 1].groupby(list(dimensiones), observed=True)["egresado_id"].nunique()
+        sumas["egresados_atendidos"] = atendidos.reindex(sumas.index, fill_value=0)
+        total = sumas["con_reunion"].to_numpy()
+        sumas["porcentaje_asistencia"] = np.divide(
+            sumas["realizada"].to_numpy() * 100, total, out=np.zeros(len(sumas)), where=total > 0
+        )
+
+        filas = []
+        for clave, fila in zip(sumas.index, sumas.to_dict("records")):
+            clave = clave if isinstance(clave, tuple) else (clave,)
+            grupo = {d: (None if v in (SIN_ANIO, SIN_DATO) else (int(v) if d == "anio_egreso" else v)) for d, v in zip(dimensiones, clave)}
+            filas.append({
+                **grupo,
+                "egresados": int(fila["egresados"]),
+                "egresados_atendidos": int(fila["egresados_atendidos"]),
+                "reuniones": int(fila["con_reunion"]),
+                "agendadas": int(fila["pendiente"]),
+                "confirmadas": int(fila["confirmada"]),
+                "realizadas": int(fila["realizada"]),
+                "canceladas": int(fila["cancelada"]),
+                "porcentaje_asistencia": round(float(fila["porcentaje_asistencia"]), 2),
+            })
+        return {
+            "dimensiones": list(dimensiones),
+            "snapshot_generado_en": datetime.fromtimestamp(cargado_en).isoformat(timespec="seconds"),
+            "snapshot_edad_segundos": round(time.time() - cargado_en, 1),
+            "filas": filas,
+        }
+
+
+snapshot_cohortes = SnapshotCohortes()
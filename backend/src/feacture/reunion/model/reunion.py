@@ -1,9 +1,14 @@
-from sqlalchemy import Column, Integer, String, Date, Time, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Date, Time, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from src.config.db import Base
 
 class Reunion(Base):
     __tablename__ = "reuniones"
+    __table_args__ = (
+        Index("ix_reuniones_estado", "estado"),
+        Index("ix_reuniones_fecha_hora_estado", "fecha", "hora", "estado"),  # reservar_reunion
+        Index("ix_reuniones_egresado_id", "egresado_id"),
+    )
     id = Column(Integer, primary_key=True, autoincrement=True)
     egresado_id = Column(String(20), ForeignKey("egresados.id"), nullable=False)
     fecha = Column(Date, nullable=False)
@@ -1,12 +1,20 @@
 from src.feacture.reunion.model.reunion import Reunion
+from src.feacture.reporte.repository.resumen_reunion_repository import ResumenReunionRepository, foto
 from src.config.db import SessionLocal
+from src.utils.eventos import emitir
 from sqlalchemy.orm import Session
 
+REUNIONES_MODIFICADAS = "reuniones_modificadas"
+
 class ReunionRepository:
-    def __init__(self):
-        self.db: Session = SessionLocal()
+    def __init__(self, db: Session = None):
+        self.db: Session = db or SessionLocal()
+        self.resumen = ResumenReunionRepository(self.db)
+
+    # antes_de_confirmar(reunion): agrega a la sesión lo que debe guardarse en la misma
+    # transacción que el cambio (notificaciones y correos de la bandeja de salida)
 
-    def solicitar_reunion(self, egresado_id, fecha, hora, observaciones=None):
+    def solicitar_reunion(self, egresado_id, fecha, hora, observaciones=None, antes_de_confirmar=None):
         reunion = Reunion(
             egresado_id=egresado_id,
             fecha=fecha,
@@ -15,26 +23,41 @@ class ReunionRepository:
             estado="pendiente"
         )
         self.db.add(reunion)
+        self.resumen.ajustar(None, foto(reunion))
+        if antes_de_confirmar:
+            self.db.flush()  # asigna reunion.id
+            antes_de_confirmar(reunion)
         self.db.commit()
         self.db.refresh(reunion)
+        emitir(REUNIONES_MODIFICADAS, reunion_id=reunion.id)
         return reunion
 
-    def modificar_reunion(self, reunion_id, nueva_fecha, nueva_hora):
+    def modificar_reunion(self, reunion_id, nueva_fecha, nueva_hora, antes_de_confirmar=None):
         reunion = self.db.query(Reunion).filter_by(id=reunion_id).first()
         if not reunion:
             raise ValueError("Reunión no encontrada")
+        anterior = foto(reunion)
         reunion.fecha = nueva_fecha
         reunion.hora = nueva_hora
         reunion.estado = "pendiente"
+        self.resumen.ajustar(anterior, foto(reunion))
+        if antes_de_confirmar:
+            antes_de_confirmar(reunion)
         self.db.commit()
+        emitir(REUNIONES_MODIFICADAS, reunion_id=reunion.id)
         return reunion
 
-    def cancelar_reunion(self, reunion_id):
+    def cancelar_reunion(self, reunion_id, antes_de_confirmar=None):
         reunion = self.db.query(Reunion).filter_by(id=reunion_id).first()
         if not reunion:
             raise ValueError("Reunión no encontrada")
+        anterior = foto(reunion)
         reunion.estado = "cancelada"
+        self.resumen.ajustar(anterior, foto(reunion))
+        if antes_de_confirmar:
+            antes_de_confirmar(reunion)
         self.db.commit()
+        emitir(REUNIONES_MODIFICADAS, reunion_id=reunion.id)
         return reunion
 
     def obtener_reuniones_pendientes(self):
@@ -1,43 +1,53 @@
 from src.feacture.reunion.repository.reunion_repository import ReunionRepository
 from src.feacture.notificacion.service.notificacion_service import NotificacionService
+from src.feacture.notificacion.repository.notificacion_repository import NotificacionRepository
 from src.feacture.notificacion.dto.notificacion_dto import NotificacionDTO
 
 class ReunionService:
-    def __init__(self, repository=None):
+    def __init__(self, repository=None, notificacion_service=None):
         self.repository = repository or ReunionRepository()
-        self.notificacion_service = NotificacionService()
+        self.notificacion_service = notificacion_service or NotificacionService(NotificacionRepository(self.repository.db))
+
+    # Las notificaciones y los correos se guardan en la misma transacción que el cambio
+    # de la reunión; el envío lo hacen después los workers de la bandeja de salida.
 
     def solicitar_reunion(self, egresado_id, fecha, hora, observaciones=None, email_egresado=None):
-        reunion = self.repository.solicitar_reunion(egresado_id, fecha, hora, observaciones)
-        if email_egresado:
-            self.notificacion_service.notificar_evento_reunion(
-                egresado_id, email_egresado, 'agendada', fecha, hora, reunion_id=reunion.id
+        def notificar(reunion):
+            if email_egresado:
+                self.notificacion_service.notificar_evento_reunion(
+                    egresado_id, email_egresado, 'agendada', fecha, hora, reunion_id=reunion.id, confirmar=False
+                )
+            noti = NotificacionDTO(
+                usuario_id=egresado_id,
+                tipo_usuario="egresado",
+                titulo="Solicitud de reunión registrada",
+                mensaje=f"Su solicitud de reunión para el {fecha} a las {hora} ha sido registrada.",
+                evento_relacionado="reunion",
+                referencia_id=reunion.id
             )
-        noti = NotificacionDTO(
-            usuario_id=egresado_id,
-            tipo_usuario="egresado",
-            titulo="Solicitud de reunión registrada",
-            mensaje=f"Su solicitud de reunión para el {fecha} a las {hora} ha sido registrada.",
-            evento_relacionado="reunion",
-            referencia_id=reunion.id
-        )
-        self.notificacion_service.crear_notificacion(noti)
+            self.notificacion_service.agregar_notificacion(noti)
+        reunion = self.repository.solicitar_reunion(egresado_id, fecha, hora, observaciones, antes_de_confirmar=notificar)
+        self.notificacion_service.avisar_entrega()
         return reunion
 
     def modificar_reunion(self, reunion_id, nueva_fecha, nueva_hora, email_egresado=None, egresado_id=None):
-        reunion = self.repository.modificar_reunion(reunion_id, nueva_fecha, nueva_hora)
-        if email_egresado and egresado_id:
-            self.notificacion_service.notificar_evento_reunion(
-                egresado_id, email_egresado, 'modificada', nueva_fecha, nueva_hora, reunion_id=reunion_id
-            )
+        def notificar(reunion):
+            if email_egresado and egresado_id:
+                self.notificacion_service.notificar_evento_reunion(
+                    egresado_id, email_egresado, 'modificada', nueva_fecha, nueva_hora, reunion_id=reunion_id, confirmar=False
+                )
+        reunion = self.repository.modificar_reunion(reunion_id, nueva_fecha, nueva_hora, antes_de_confirmar=notificar)
+        self.notificacion_service.avisar_entrega()
         return reunion
 
     def cancelar_reunion(self, reunion_id, fecha, hora, email_egresado=None, egresado_id=None):
-        reunion = self.repository.cancelar_reunion(reunion_id)
-        if email_egresado and egresado_id:
-            self.notificacion_service.notificar_evento_reunion(
-                egresado_id, email_egresado, 'cancelada', fecha, hora, reunion_id=reunion_id
-            )
+        def notificar(reunion):
+            if email_egresado and egresado_id:
+                self.notificacion_service.notificar_evento_reunion(
+                    egresado_id, email_egresado, 'cancelada', fecha, hora, reunion_id=reunion_id, confirmar=False
+                )
+        reunion = self.repository.cancelar_reunion(reunion_id, antes_de_confirmar=notificar)
+        self.notificacion_service.avisar_entrega()
         return reunion
 
     def enviar_recordatorio(self, egresado_id, email_egresado, fecha, hora, reunion_id):
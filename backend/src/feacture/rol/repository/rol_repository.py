@@ -3,8 +3,8 @@ from src.config.db import SessionLocal
 from sqlalchemy.orm import Session
 
 class RolRepository:
-    def __init__(self):
-        self.db: Session = SessionLocal()
+    def __init__(self, db: Session = None):
+        self.db: Session = db or SessionLocal()
 
     def crear(self, nombre):
         rol = Rol(nombre=nombre)
@@ -16,5 +16,8 @@ class RolRepository:
     def listar(self):
         return self.db.query(Rol).all()
 
+    def obtener(self, rol_id):
+        return self.db.query(Rol).filter_by(id=rol_id).first()
+
     def buscar_por_nombre(self, nombre):
         return self.db.query(Rol).filter_by(nombre=nombre).first()
@@ -2,15 +2,20 @@ from fastapi import APIRouter, HTTPException, Response, UploadFile, File, Depend
 from src.feacture.taller.service.taller_service import TallerService
 from src.feacture.taller.dto.taller_dto import TallerDTO
 from src.utils.auth import AuthService
+from sqlalchemy.orm import Session
+from src.config.db import get_db
+from src.feacture.taller.repository.taller_repository import TallerRepository
 import shutil
 import os
 
 router = APIRouter()
-service = TallerService()
 auth_service = AuthService()
 
+def get_service(db: Session = Depends(get_db)):
+    return TallerService(TallerRepository(db))
+
 @router.post('/')
-def crear_taller(data: dict, flyer: UploadFile = File(None), user=Depends(auth_service.require_role("admin"))):
+def crear_taller(data: dict, flyer: UploadFile = File(None), user=Depends(auth_service.require_role("admin")), service=Depends(get_service)):
     try:
         flyer_path = None
         if flyer:
@@ -23,7 +28,7 @@ def crear_taller(data: dict, flyer: UploadFile = File(None), user=Depends(auth_s
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.put('/{taller_id}')
-def editar_taller(taller_id: int, data: dict, flyer: UploadFile = File(None), user=Depends(auth_service.require_role("admin"))):
+def editar_taller(taller_id: int, data: dict, flyer: UploadFile = File(None), user=Depends(auth_service.require_role("admin")), service=Depends(get_service)):
     try:
         flyer_path = None
         if flyer:
@@ -36,19 +41,19 @@ def editar_taller(taller_id: int, data: dict, flyer: UploadFile = File(None), us
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.delete('/{taller_id}')
-def eliminar_taller(taller_id: int, user=Depends(auth_service.require_role("admin"))):
+def eliminar_taller(taller_id: int, user=Depends(auth_service.require_role("admin")), service=Depends(get_service)):
     return service.eliminar_taller(taller_id)
 
 @router.get('/')
-def listar_talleres():
+def listar_talleres(service=Depends(get_service)):
     return service.listar_talleres()
 
 @router.get('/{taller_id}')
-def obtener_taller(taller_id: int):
+def obtener_taller(taller_id: int, service=Depends(get_service)):
     return service.obtener_taller(taller_id)
 
 @router.get('/flyer/{taller_id}')
-def ver_flyer(taller_id: int):
+def ver_flyer(taller_id: int, service=Depends(get_service)):
     taller = service.obtener_taller(taller_id)
     if not taller or not taller.flyer or not os.path.exists(taller.flyer):
         raise HTTPException(status_code=404, detail="Flyer no encontrado")
@@ -57,7 +62,7 @@ def ver_flyer(taller_id: int):
     return Response(content, media_type="image/jpeg")
 
 @router.get('/acceder/{taller_id}')
-def acceder_taller(taller_id: int):
+def acceder_taller(taller_id: int, service=Depends(get_service)):
     taller = service.acceder_taller(taller_id)
     if not taller:
         raise HTTPException(status_code=404, detail="Taller no encontrado")
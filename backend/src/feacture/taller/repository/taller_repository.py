@@ -15,8 +15,8 @@ from sqlalchemy.orm import Session
 
 
 class TallerRepository:
-    def __init__(self):
-        self.db: Session = SessionLocal()
+    def __init__(self, db: Session = None):
+        self.db: Session = db or SessionLocal()
 
     def crear(self, taller_dto):
         taller = Taller(
@@ -1,14 +1,20 @@
 from fastapi import APIRouter, HTTPException, Depends
 from src.feacture.usuario.service.usuario_service import UsuarioService
 from src.feacture.usuario.dto.usuario_dto import UsuarioDTO
-from src.utils.auth import AuthService
+from src.utils.auth import AuthService, limitador_login
+from src.utils.hashing import HashSaturado
+from sqlalchemy.orm import Session
+from src.config.db import get_db
+from src.feacture.usuario.repository.usuario_repository import UsuarioRepository
 
 router = APIRouter()
-service = UsuarioService()
 auth_service = AuthService()
 
+def get_service(db: Session = Depends(get_db)):
+    return UsuarioService(UsuarioRepository(db))
+
 @router.post('/')
-def crear_usuario(data: dict):
+def crear_usuario(data: dict, service=Depends(get_service)):
     try:
         usuario_dto = UsuarioDTO(**data)
         return service.crear_usuario(usuario_dto)
@@ -16,7 +22,7 @@ def crear_usuario(data: dict):
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.put('/{usuario_id}')
-def editar_usuario(usuario_id: int, data: dict):
+def editar_usuario(usuario_id: int, data: dict, service=Depends(get_service)):
     try:
         usuario_dto = UsuarioDTO(**data)
         return service.editar_usuario(usuario_id, usuario_dto)
@@ -24,21 +30,33 @@ def editar_usuario(usuario_id: int, data: dict):
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.put('/suspender/{usuario_id}')
-def suspender_usuario(usuario_id: int):
+def suspender_usuario(usuario_id: int, service=Depends(get_service)):
     return service.suspender_usuario(usuario_id)
 
 @router.get('/')
-def listar_usuarios():
+def listar_usuarios(service=Depends(get_service)):
     return service.listar_usuarios()
 
 @router.post('/login')
-def login_usuario(data: dict):
+async def login_usuario(data: dict, db: Session = Depends(get_db)):
     email = data.get("email")
     password = data.get("password")
-    user = auth_service.authenticate_user(email, password)
-    if not user:
+    permitido, espera = limitador_login.permitir(str(email or "").strip().lower())
+    if not permitido:
+        raise HTTPException(
+            status_code=429, detail="Demasiados intentos de inicio de sesión",
+            headers={"Retry-After": str(max(1, round(espera)))}
+        )
+    try:
+        resultado = await auth_service.authenticate_user_async(email, password, db)
+    except HashSaturado as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    if not resultado:
         raise HTTPException(status_code=401, detail="Credenciales incorrectas")
-    access_token = auth_service.create_access_token(data={"sub": user.id})
+    user, rol = resultado
+    if user.estado == "suspendido":
+        raise HTTPException(status_code=403, detail="Usuario suspendido")
+    access_token = auth_service.create_user_token(user, rol)
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.get('/me')
@@ -10,4 +10,6 @@ class Usuario(Base):
     password = Column(String(255), nullable=False)
     rol_id = Column(Integer, ForeignKey("roles.id"), nullable=False)
     estado = Column(String(20), default="activo")  # activo, suspendido
+    # Se incrementa al editar/suspender: los tokens emitidos con una versión anterior quedan revocados
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
     rol = relationship("Rol")
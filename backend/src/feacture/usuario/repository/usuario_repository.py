@@ -1,10 +1,15 @@
 from src.feacture.usuario.model.usuario import Usuario
+from src.feacture.rol.model.rol import Rol
 from src.config.db import SessionLocal
 from sqlalchemy.orm import Session
+from src.utils.eventos import emitir
+
+# Evento emitido tras confirmar cambios de un usuario; datos: usuario_id, token_version
+USUARIO_MODIFICADO = "usuario_modificado"
 
 class UsuarioRepository:
-    def __init__(self):
-        self.db: Session = SessionLocal()
+    def __init__(self, db: Session = None):
+        self.db: Session = db or SessionLocal()
 
     def crear(self, usuario_dto):
         usuario = Usuario(
@@ -27,7 +32,9 @@ class UsuarioRepository:
         usuario.email = usuario_dto.email
         usuario.rol_id = usuario_dto.rol_id
         usuario.estado = usuario_dto.estado
+        usuario.token_version = (usuario.token_version or 0) + 1
         self.db.commit()
+        emitir(USUARIO_MODIFICADO, usuario_id=usuario.id, token_version=usuario.token_version)
         return usuario
 
     def suspender(self, usuario_id):
@@ -35,9 +42,26 @@ class UsuarioRepository:
         if not usuario:
             raise ValueError("Usuario no encontrado")
         usuario.estado = "suspendido"
+        usuario.token_version = (usuario.token_version or 0) + 1
         self.db.commit()
+        emitir(USUARIO_MODIFICADO, usuario_id=usuario.id, token_version=usuario.token_version)
         return usuario
 
+    def obtener(self, usuario_id):
+        return self.db.query(Usuario).filter_by(id=usuario_id).first()
+
+    def obtener_con_rol(self, usuario_id):
+        """(usuario, nombre del rol) en una sola consulta, o None."""
+        return self.db.query(Usuario, Rol.nombre).outerjoin(Rol, Rol.id == Usuario.rol_id).filter(Usuario.id == usuario_id).first()
+
+    def buscar_por_email_con_rol(self, email):
+        """(usuario, nombre del rol) en una sola consulta, o None."""
+        return self.db.query(Usuario, Rol.nombre).outerjoin(Rol, Rol.id == Usuario.rol_id).filter(Usuario.email == email).first()
+
+    def versiones_token(self):
+        """{usuario_id: token_version} de los usuarios con tokens revocados alguna vez."""
+        return dict(self.db.query(Usuario.id, Usuario.token_version).filter(Usuario.token_version > 0).all())
+
     def buscar_por_email(self, email):
         return self.db.query(Usuario).filter_by(email=email).first()
 
@@ -0,0 +1,32 @@
+# Tareas de mantenimiento de datos derivados.
+# Uso: python -m src.mantenimiento reconstruir-resumen
+#      (recalcula resumen_reuniones desde la tabla de reuniones)
+#      python -m src.mantenimiento compactar-rollup
+#      (recalcula reuniones_diarias completo; el scheduler lo hace cada noche)
+import sys
+from src.config.db import UnidadDeTrabajo
+import src.migrations.runner  # registra todos los modelos en Base.metadata
+from src.feacture.reporte.repository.resumen_reunion_repository import ResumenReunionRepository
+from src.feacture.reporte.repository.reunion_diaria_repository import ReunionDiariaRepository
+
+
+def reconstruir_resumen():
+    with UnidadDeTrabajo() as uow:
+        return ResumenReunionRepository(uow.session).reconstruir()
+
+
+def compactar_rollup():
+    with UnidadDeTrabajo() as uow:
+        return ReunionDiariaRepository(uow.session).compactar()
+
+
+TAREAS = {
+    "reconstruir-resumen": reconstruir_resumen,
+    "compactar-rollup": compactar_rollup,
+}
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] not in TAREAS:
+        print(f"Uso: python -m src.mantenimiento [{' | '.join(TAREAS)}]")
+        sys.exit(1)
+    print(TAREAS[sys.argv[1]]())
@@ -0,0 +1,13 @@
+# Uso: python -m src.migrations            aplica las migraciones pendientes
+#      python -m src.migrations estado     lista las migraciones y si están aplicadas
+import sys
+from src.migrations.runner import migrar, estado
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "estado":
+        for migracion in estado():
+            marca = "x" if migracion["aplicada"] else " "
+            print(f"[{marca}] {migracion['version']:03d} {migracion['descripcion']}")
+    else:
+        aplicadas = migrar()
+        print(f"Migraciones aplicadas: {aplicadas or 'ninguna pendiente'}")
@@ -0,0 +1,100 @@
+# Migraciones versionadas del esquema.
+# Cada módulo de src/migrations/versiones (vNNN_descripcion.py) define VERSION,
+# DESCRIPCION y aplicar(conn). Las aplicadas quedan en la tabla schema_migrations;
+# migrar() ejecuta las pendientes en orden, cada una en su propia transacción.
+# Los pasos son idempotentes: sobre una base creada con create_all no hacen nada.
+# Cada versión declara sus tablas, columnas e índices tal como eran en ese momento
+# (no lee los modelos actuales), así su efecto no cambia cuando los modelos evolucionan.
+import importlib
+import pkgutil
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, Table, MetaData, inspect, select, text
+from src.config.db import engine as engine_por_defecto
+from src.migrations import versiones
+
+# Registra todos los modelos en Base.metadata (para quienes importan el runner:
+# create_tables, mantenimiento, pruebas y benchmarks); las migraciones no lo usan
+from src.feacture.egresado.model.egresado import Egresado
+from src.feacture.egresado.model.importacion_egresado import ImportacionEgresado
+from src.feacture.taller.model.taller import Taller
+from src.feacture.reunion.model.reunion import Reunion
+from src.feacture.calendario_encargado.model.calendario import FechasDisponibles, HistorialEstado
+from src.feacture.notificacion.model.notificacion import Notificacion
+from src.feacture.notificacion.model.correo_saliente import CorreoSaliente
+from src.feacture.usuario.model.usuario import Usuario
+from src.feacture.rol.model.rol import Rol
+from src.feacture.auditoria.model.auditoria import Auditoria
+from src.feacture.reporte.model.resumen_reunion import ResumenReunion
+from src.feacture.reporte.model.reunion_diaria import ReunionDiaria
+
+schema_migrations = Table(
+    "schema_migrations", MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("descripcion", String(255), nullable=False),
+    Column("aplicada_en", DateTime, nullable=False),
+)
+
+
+def cargar_migraciones():
+    migraciones = []
+    for modulo in pkgutil.iter_modules(versiones.__path__):
+        if modulo.name.startswith("v"):
+            migraciones.append(importlib.import_module(f"{versiones.__name__}.{modulo.name}"))
+    migraciones.sort(key=lambda m: m.VERSION)
+    return migraciones
+
+
+def versiones_aplicadas(conn):
+    schema_migrations.create(conn, checkfirst=True)
+    return set(conn.execute(select(schema_migrations.c.version)).scalars())
+
+
+def migrar(engine=None, hasta=None):
+    """Aplica las migraciones pendientes (hasta la versión `hasta`, inclusive). Devuelve las versiones aplicadas."""
+    engine = engine or engine_por_defecto
+    with engine.begin() as conn:
+        aplicadas = versiones_aplicadas(conn)
+    nuevas = []
+    for migracion in cargar_migraciones():
+        if migracion.VERSION in aplicadas or (hasta is not None and migracion.VERSION > hasta):
+            continue
+        with engine.begin() as conn:
+            migracion.aplicar(conn)
+            conn.execute(schema_migrations.insert().values(
+                version=migracion.VERSION, descripcion=migracion.DESCRIPCION, aplicada_en=datetime.now()
+            ))
+        nuevas.append(migracion.VERSION)
+    return nuevas
+
+
+def estado(engine=None):
+    engine = engine or engine_por_defecto
+    with engine.begin() as conn:
+        aplicadas = versiones_aplicadas(conn)
+    return [
+        {"version": m.VERSION, "descripcion": m.DESCRIPCION, "aplicada": m.VERSION in aplicadas}
+        for m in cargar_migraciones()
+    ]
+
+
+# Helpers para los módulos de versiones: reciben la columna o el índice congelado
+# que declara cada migración
+
+def agregar_columna_si_falta(conn, tabla, columna):
+    if columna.name in {c["name"] for c in inspect(conn).get_columns(tabla)}:
+        return False
+    definicion = f"{columna.name} {columna.type.compile(dialect=conn.dialect)}"
+    if columna.server_default is not None:
+        # Con DEFAULT las filas existentes reciben el valor y se puede exigir NOT NULL
+        definicion += f" DEFAULT {columna.server_default.arg}"
+        if not columna.nullable:
+            definicion += " NOT NULL"
+    conn.execute(text(f"ALTER TABLE {tabla} ADD COLUMN {definicion}"))
+    return True
+
+
+def crear_indice_si_falta(conn, indice):
+    if indice.name in {i["name"] for i in inspect(conn).get_indexes(indice.table.name)}:
+        return False
+    indice.create(conn)
+    return True
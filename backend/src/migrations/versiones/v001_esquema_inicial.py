@@ -0,0 +1,122 @@
+from sqlalchemy import MetaData, Table, Column, Integer, String, Text, Date, Time, DateTime, ForeignKey
+
+VERSION = 1
+DESCRIPCION = "Esquema inicial: crea las tablas que falten"
+
+# Tablas tal como estaban antes de las migraciones (no se toman de los modelos:
+# las columnas e índices posteriores los agregan las versiones siguientes)
+metadata = MetaData()
+
+Table(
+    "roles", metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("nombre", String(50), unique=True, nullable=False),
+)
+
+Table(
+    "usuarios", metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("username", String(100), unique=True, nullable=False),
+    Column("email", String(255), unique=True, nullable=False),
+    Column("password", String(255), nullable=False),
+    Column("rol_id", Integer, ForeignKey("roles.id"), nullable=False),
+    Column("estado", String(20)),
+)
+
+Table(
+    "egresados", metadata,
+    Column("id", String(20), primary_key=True, index=True),
+    Column("usuario_dni", String(20), unique=True, index=True),
+    Column("nombres", String(100)),
+    Column("apellidos", String(100)),
+    Column("email", String(255), unique=True, index=True),
+    Column("password", String(255)),
+    Column("carrera_profesional", String(100)),
+    Column("grado_academico", String(100), nullable=True),
+    Column("anio_egreso", Integer),
+    Column("cv", Text, nullable=True),
+    Column("ciudad", String(100), nullable=True),
+    Column("genero", String(20), nullable=True),
+    Column("fecha_nacimiento", Date, nullable=True),
+    Column("email_alternativo", String(255), nullable=True),
+    Column("telefono", String(20), nullable=True),
+)
+
+Table(
+    "importaciones_egresado", metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("usuario_id", Integer, nullable=False),
+    Column("fecha", DateTime),
+    Column("total_registros", Integer, nullable=False),
+    Column("exitosos", Integer, nullable=False),
+    Column("rechazados", Integer, nullable=False),
+    Column("resultado", String(50), nullable=False),
+    Column("detalle", Text, nullable=True),
+    Column("archivo_rechazados", String(255), nullable=True),
+)
+
+Table(
+    "talleres", metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("titulo", String(255), nullable=False),
+    Column("descripcion", Text, nullable=False),
+    Column("fecha", Date, nullable=False),
+    Column("hora", Time, nullable=False),
+    Column("enlace", String(255), nullable=False),
+    Column("flyer", String(255), nullable=True),
+    Column("accesos", Integer),
+)
+
+Table(
+    "reuniones", metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("egresado_id", String(20), ForeignKey("egresados.id"), nullable=False),
+    Column("fecha", Date, nullable=False),
+    Column("hora", Time, nullable=False),
+    Column("estado", String(20)),
+    Column("observaciones", Text, nullable=True),
+)
+
+Table(
+    "fechas_disponibles", metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("fecha", Date, nullable=False),
+    Column("hora", Time, nullable=False),
+    Column("descripcion", String(255), nullable=True),
+    Column("estado", String(20)),
+)
+
+Table(
+    "historial_estado", metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("reunion_id", Integer, ForeignKey("reuniones.id"), nullable=False),
+    Column("estado", String(20), nullable=False),
+    Column("fecha_cambio", Date, nullable=False),
+    Column("observaciones", Text, nullable=True),
+)
+
+Table(
+    "notificaciones", metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("usuario_id", String(20), nullable=False),
+    Column("tipo_usuario", String(20), nullable=False),
+    Column("titulo", String(255), nullable=False),
+    Column("mensaje", Text, nullable=False),
+    Column("fecha_envio", DateTime),
+    Column("leida", Integer),
+    Column("evento_relacionado", String(50), nullable=True),
+    Column("referencia_id", Integer, nullable=True),
+)
+
+Table(
+    "auditoria", metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("usuario_id", Integer, nullable=False),
+    Column("accion", String(100), nullable=False),
+    Column("detalle", Text, nullable=True),
+    Column("fecha", DateTime),
+)
+
+
+def aplicar(conn):
+    metadata.create_all(conn, checkfirst=True)
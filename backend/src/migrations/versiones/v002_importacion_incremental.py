@@ -0,0 +1,15 @@
+from sqlalchemy import MetaData, Table, Column, Index, Integer, String
+from src.migrations.runner import agregar_columna_si_falta, crear_indice_si_falta
+
+VERSION = 2
+DESCRIPCION = "Columnas de importación incremental (hashes y contadores)"
+
+importaciones_egresado = Table("importaciones_egresado", MetaData(), Column("hash_archivo", String(64)))
+
+
+def aplicar(conn):
+    agregar_columna_si_falta(conn, "egresados", Column("hash_importacion", String(32), nullable=True))
+    agregar_columna_si_falta(conn, "importaciones_egresado", Column("hash_archivo", String(64), nullable=True))
+    for columna in ("insertados", "actualizados", "sin_cambios"):
+        agregar_columna_si_falta(conn, "importaciones_egresado", Column(columna, Integer, nullable=True))
+    crear_indice_si_falta(conn, Index("ix_importaciones_egresado_hash_archivo", importaciones_egresado.c.hash_archivo))
@@ -0,0 +1,36 @@
+from sqlalchemy import MetaData, Table, Column, Index, Integer, String, Date, Time, DateTime
+from src.migrations.runner import crear_indice_si_falta
+
+VERSION = 3
+DESCRIPCION = "Índices para filtros de egresados, reuniones, notificaciones y auditoría"
+
+metadata = MetaData()
+reuniones = Table(
+    "reuniones", metadata,
+    Column("egresado_id", String(20)), Column("fecha", Date), Column("hora", Time), Column("estado", String(20)),
+)
+notificaciones = Table(
+    "notificaciones", metadata,
+    Column("usuario_id", String(20)), Column("tipo_usuario", String(20)), Column("fecha_envio", DateTime),
+)
+egresados = Table(
+    "egresados", metadata,
+    Column("carrera_profesional", String(100)), Column("anio_egreso", Integer), Column("ciudad", String(100)),
+)
+auditoria = Table("auditoria", metadata, Column("usuario_id", Integer))
+
+INDICES = [
+    Index("ix_reuniones_estado", reuniones.c.estado),
+    Index("ix_reuniones_fecha_hora_estado", reuniones.c.fecha, reuniones.c.hora, reuniones.c.estado),
+    Index("ix_reuniones_egresado_id", reuniones.c.egresado_id),
+    Index("ix_notificaciones_usuario_tipo_fecha", notificaciones.c.usuario_id, notificaciones.c.tipo_usuario, notificaciones.c.fecha_envio),
+    Index("ix_egresados_carrera_anio", egresados.c.carrera_profesional, egresados.c.anio_egreso),
+    Index("ix_egresados_anio_egreso", egresados.c.anio_egreso),
+    Index("ix_egresados_ciudad", egresados.c.ciudad),
+    Index("ix_auditoria_usuario_id", auditoria.c.usuario_id),
+]
+
+
+def aplicar(conn):
+    for indice in INDICES:
+        crear_indice_si_falta(conn, indice)
@@ -0,0 +1,9 @@
+from sqlalchemy import Column, Integer
+from src.migrations.runner import agregar_columna_si_falta
+
+VERSION = 4
+DESCRIPCION = "Versión de token de usuarios (revocación de JWT)"
+
+
+def aplicar(conn):
+    agregar_columna_si_falta(conn, "usuarios", Column("token_version", Integer, nullable=False, server_default="0"))
@@ -0,0 +1,25 @@
+from sqlalchemy import MetaData, Table, Column, Integer, String, delete, func, insert, select
+
+VERSION = 5
+DESCRIPCION = "Contadores de reuniones por estado (resumen_reuniones)"
+
+ESTADOS = ("pendiente", "confirmada", "cancelada", "realizada")
+
+metadata = MetaData()
+resumen_reuniones = Table(
+    "resumen_reuniones", metadata,
+    Column("estado", String(20), primary_key=True),
+    Column("total", Integer, nullable=False, server_default="0"),
+)
+reuniones = Table("reuniones", metadata, Column("id", Integer), Column("estado", String(20)))
+
+
+def aplicar(conn):
+    resumen_reuniones.create(conn, checkfirst=True)
+    # Carga inicial desde las reuniones existentes, en la transacción de la migración
+    conn.execute(delete(resumen_reuniones))
+    conteos = {estado: 0 for estado in ESTADOS}
+    conteos.update(conn.execute(
+        select(reuniones.c.estado, func.count(reuniones.c.id)).where(reuniones.c.estado.isnot(None)).group_by(reuniones.c.estado)
+    ).all())
+    conn.execute(insert(resumen_reuniones), [{"estado": estado, "total": total} for estado, total in conteos.items()])
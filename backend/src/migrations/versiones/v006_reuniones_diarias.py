@@ -0,0 +1,40 @@
+from sqlalchemy import MetaData, Table, Column, Index, Integer, String, Date, delete, func, insert, select
+
+VERSION = 6
+DESCRIPCION = "Rollup diario de reuniones por carrera y estado (reuniones_diarias)"
+
+SIN_CARRERA = ""
+
+metadata = MetaData()
+reuniones_diarias = Table(
+    "reuniones_diarias", metadata,
+    Column("dia", Date, primary_key=True),
+    Column("carrera_profesional", String(100), primary_key=True),
+    Column("estado", String(20), primary_key=True),
+    Column("total", Integer, nullable=False, server_default="0"),
+    Index("ix_reuniones_diarias_carrera_dia", "carrera_profesional", "dia"),
+)
+reuniones = Table(
+    "reuniones", metadata,
+    Column("id", Integer), Column("egresado_id", String(20)), Column("fecha", Date), Column("estado", String(20)),
+)
+egresados = Table("egresados", metadata, Column("id", String(20)), Column("carrera_profesional", String(100)))
+
+
+def aplicar(conn):
+    reuniones_diarias.create(conn, checkfirst=True)
+    # Carga inicial desde las reuniones existentes, en la transacción de la migración
+    carrera = func.coalesce(egresados.c.carrera_profesional, SIN_CARRERA)
+    consulta = (
+        select(reuniones.c.fecha, carrera, reuniones.c.estado, func.count(reuniones.c.id))
+        .select_from(reuniones.outerjoin(egresados, egresados.c.id == reuniones.c.egresado_id))
+        .where(reuniones.c.estado.isnot(None))
+        .group_by(reuniones.c.fecha, carrera, reuniones.c.estado)
+    )
+    conn.execute(delete(reuniones_diarias))
+    filas = [
+        {"dia": dia, "carrera_profesional": carrera, "estado": estado, "total": total}
+        for dia, carrera, estado, total in conn.execute(consulta)
+    ]
+    if filas:
+        conn.execute(insert(reuniones_diarias), filas)
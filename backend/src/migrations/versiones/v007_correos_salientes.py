@@ -0,0 +1,28 @@
+from sqlalchemy import MetaData, Table, Column, Index, Integer, String, Text, DateTime
+
+VERSION = 7
+DESCRIPCION = "Bandeja de salida de correos (correos_salientes)"
+
+correos_salientes = Table(
+    "correos_salientes", MetaData(),
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("destinatario", String(255), nullable=False),
+    Column("asunto", String(255), nullable=False),
+    Column("cuerpo", Text, nullable=False),
+    Column("estado", String(20), nullable=False),
+    Column("intentos", Integer, nullable=False),
+    Column("proximo_intento", DateTime, nullable=False),
+    Column("ultimo_error", Text, nullable=True),
+    Column("lote", String(32), nullable=True),
+    Column("tomado_en", DateTime, nullable=True),
+    Column("creado_en", DateTime, nullable=False),
+    Column("enviado_en", DateTime, nullable=True),
+    Column("evento_relacionado", String(50), nullable=True),
+    Column("referencia_id", Integer, nullable=True),
+    Index("ix_correos_salientes_estado_proximo", "estado", "proximo_intento"),
+    Index("ix_correos_salientes_lote", "lote"),
+)
+
+
+def aplicar(conn):
+    correos_salientes.create(conn, checkfirst=True)
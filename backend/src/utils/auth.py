@@ -1,42 +1,162 @@
+import os
+import threading
+import time
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from src.feacture.usuario.repository.usuario_repository import UsuarioRepository
-from src.feacture.rol.repository.rol_repository import RolRepository
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from src.config.db import get_db
+from src.feacture.usuario.repository.usuario_repository import UsuarioRepository, USUARIO_MODIFICADO
+from src.utils.cache import CacheTTL
+from src.utils.hashing import pool_hash
+from src.utils.limitador import LimitadorPorClave
+from src.config import seguridad as seguridad_config
+from src.utils.eventos import suscribir
 
 SECRET_KEY = "supersecretkey"  # Cambia esto en producción
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/usuario/login")
 
+# Caché id de usuario -> UsuarioAutenticado (estado y nombre de rol) para no consultar
+# la BD en cada petición protegida. UsuarioRepository.editar/suspender la invalidan.
+AUTH_CACHE_SEGUNDOS = int(os.getenv("AUTH_CACHE_SEGUNDOS", 60))
+AUTH_CACHE_ENTRADAS = int(os.getenv("AUTH_CACHE_ENTRADAS", 10000))
+cache_usuarios = CacheTTL(AUTH_CACHE_ENTRADAS, AUTH_CACHE_SEGUNDOS)
+
+# Admisión del login antes de cualquier bcrypt: cubo por cuenta (email) y cubo global
+limitador_login = LimitadorPorClave(
+    seguridad_config.LOGIN_CUENTA_CAPACIDAD,
+    seguridad_config.LOGIN_CUENTA_POR_SEGUNDO,
+    seguridad_config.LOGIN_GLOBAL_CAPACIDAD,
+    seguridad_config.LOGIN_GLOBAL_POR_SEGUNDO,
+    seguridad_config.LOGIN_MAX_CUENTAS
+)
+
+
+class ListaRevocacion:
+    """
+    usuario_id -> versión mínima de token válida. Los tokens llevan la versión del
+    usuario (claim 'ver'); editar/suspender la incrementan. En este proceso se
+    actualiza al instante por evento; los cambios hechos en otros procesos se ven
+    al recargar de la BD, a lo sumo cada `refresco_segundos`.
+    """
+
+    def __init__(self, refresco_segundos):
+        self.refresco_segundos = refresco_segundos
+        self._versiones = {}
+        self._lock = threading.Lock()
+        self._lock_recarga = threading.Lock()
+        self.actualizada_en = None
+
+    def registrar(self, usuario_id, token_version):
+        with self._lock:
+            if token_version > self._versiones.get(usuario_id, 0):
+                self._versiones[usuario_id] = token_version
+
+    def recargar(self, versiones):
+        with self._lock:
+            # Un evento más reciente que la lectura de la BD no se pierde
+            for usuario_id, version in self._versiones.items():
+                if version > versiones.get(usuario_id, 0):
+                    versiones[usuario_id] = version
+            self._versiones = versiones
+            self.actualizada_en = time.time()
+
+    def recargar_si_vencida(self, cargar):
+        """
+        Recarga con cargar() -> {usuario_id: version} si venció; un solo hilo recarga a la vez.
+        Los refrescos no bloquean (se usa la lista anterior), pero la primera carga sí:
+        con la lista vacía vigente() aceptaría también los tokens revocados.
+        """
+        if self.actualizada_en and time.time() - self.actualizada_en < self.refresco_segundos:
+            return
+        primera = self.actualizada_en is None
+        if not self._lock_recarga.acquire(blocking=primera):
+            return
+        try:
+            # Otro hilo pudo completar la primera carga mientras se esperaba
+            if primera and self.actualizada_en is not None:
+                return
+            self.recargar(cargar())
+        finally:
+            self._lock_recarga.release()
+
+    def vigente(self, usuario_id, token_version):
+        return token_version >= self._versiones.get(usuario_id, 0)
+
+
+revocaciones = ListaRevocacion(seguridad_config.REVOCACION_REFRESCO_SEGUNDOS)
+
+
+def _al_modificar_usuario(usuario_id, token_version=None):
+    cache_usuarios.invalidar(usuario_id)
+    if token_version is not None:
+        revocaciones.registrar(usuario_id, token_version)
+
+
+suscribir(USUARIO_MODIFICADO, _al_modificar_usuario)
+
+
+class UsuarioAutenticado:
+    """Datos del usuario del token; no depende de una sesión de BD (se comparte entre peticiones)."""
+
+    def __init__(self, id, username, email, rol_id, rol, estado):
+        self.id = id
+        self.username = username
+        self.email = email
+        self.rol_id = rol_id
+        self.rol = rol
+        self.estado = estado
+
+
 class AuthService:
-    def __init__(self):
-        self.usuario_repo = UsuarioRepository()
-        self.rol_repo = RolRepository()
+    # Sin repositorios propios: cada método usa la sesión de la petición en curso
+
+    # bcrypt corre siempre en pool_hash (acotado); HashSaturado si está lleno
 
     def verify_password(self, plain_password, hashed_password):
-        return pwd_context.verify(plain_password, hashed_password)
+        return pool_hash.verificar_sync(plain_password, hashed_password)
 
     def get_password_hash(self, password):
-        return pwd_context.hash(password)
+        return pool_hash.generar_hash_sync(password)
 
-    def authenticate_user(self, email, password):
-        user = self.usuario_repo.buscar_por_email(email)
+    def authenticate_user(self, email, password, db: Session):
+        user = UsuarioRepository(db).buscar_por_email(email)
         if not user or not self.verify_password(password, user.password):
             return None
         return user
 
+    async def authenticate_user_async(self, email, password, db: Session):
+        """(usuario, nombre del rol) si las credenciales son válidas, o None."""
+        # La consulta usa el threadpool solo un instante; bcrypt espera en pool_hash sin ocupar hilos de FastAPI
+        fila = await run_in_threadpool(UsuarioRepository(db).buscar_por_email_con_rol, email)
+        if not fila or not await pool_hash.verificar(password, fila[0].password):
+            return None
+        return fila
+
+    def create_user_token(self, usuario, rol):
+        # Rol, estado y versión firmados en el token: get_current_user no necesita la BD
+        return self.create_access_token(data={
+            "sub": str(usuario.id),
+            "username": usuario.username,
+            "email": usuario.email,
+            "rol_id": usuario.rol_id,
+            "rol": rol,
+            "estado": usuario.estado,
+            "ver": usuario.token_version or 0,
+        })
+
     def create_access_token(self, data: dict, expires_delta: timedelta = None):
         to_encode = data.copy()
         expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
         to_encode.update({"exp": expire})
         return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
-    def get_current_user(self, token: str = Depends(oauth2_scheme)):
+    def get_current_user(self, token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
         credentials_exception = HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="No autenticado",
@@ -44,20 +164,44 @@ class AuthService:
         )
         try:
             payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-            user_id: int = payload.get("sub")
-            if user_id is None:
-                raise credentials_exception
-        except JWTError:
+            user_id = int(payload.get("sub"))
+        except (JWTError, TypeError, ValueError):
             raise credentials_exception
-        user = self.usuario_repo.db.query(self.usuario_repo.db.query(UsuarioRepository).first().__class__).filter_by(id=user_id).first()
+        if "ver" in payload:
+            revocaciones.recargar_si_vencida(UsuarioRepository(db).versiones_token)
+            if not revocaciones.vigente(user_id, payload["ver"]):
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED, detail="Token revocado",
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
+            user = UsuarioAutenticado(
+                user_id, payload.get("username"), payload.get("email"),
+                payload.get("rol_id"), payload.get("rol"), payload.get("estado")
+            )
+        else:
+            # Tokens sin claims (emitidos antes): usuario y rol desde la caché o la BD
+            user = self._usuario_desde_bd(user_id, db)
+            if user is None:
+                raise credentials_exception
+        if user.estado == "suspendido":
+            raise HTTPException(status_code=403, detail="Usuario suspendido")
+        return user
+
+    def _usuario_desde_bd(self, user_id, db):
+        user = cache_usuarios.obtener(user_id)
         if user is None:
-            raise credentials_exception
+            generacion = cache_usuarios.generacion
+            fila = UsuarioRepository(db).obtener_con_rol(user_id)
+            if fila is None:
+                return None
+            usuario, rol = fila
+            user = UsuarioAutenticado(usuario.id, usuario.username, usuario.email, usuario.rol_id, rol, usuario.estado)
+            cache_usuarios.guardar(user_id, user, generacion)
         return user
 
     def require_role(self, required_role: str):
         def role_checker(user=Depends(self.get_current_user)):
-            rol = self.rol_repo.db.query(self.rol_repo.db.query(RolRepository).first().__class__).filter_by(id=user.rol_id).first()
-            if not rol or rol.nombre != required_role:
+            if user.rol != required_role:
                 raise HTTPException(status_code=403, detail="No autorizado para esta acción")
             return user
         return role_checker
@@ -0,0 +1,127 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+
+# Caché en memoria con expiración (TTL) y desalojo LRU, segura entre hilos.
+# invalidar() incrementa la generación: un valor calculado antes de una
+# invalidación no se guarda (evita volver a cachear datos ya obsoletos).
+# obtener_o_calcular() agrupa las peticiones concurrentes de una misma clave
+# (single-flight): una calcula y las demás esperan su resultado.
+
+_NO_ENCONTRADO = object()
+
+
+class _Vuelo:
+    def __init__(self, generacion):
+        self.generacion = generacion
+        self.evento = threading.Event()
+        self.valor = None
+        self.error = None
+
+
+class CacheTTL:
+    def __init__(self, max_entradas=256, ttl_segundos=300):
+        self.max_entradas = max_entradas
+        self.ttl_segundos = ttl_segundos
+        self.generacion = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self._datos = OrderedDict()  # clave -> (expira_en, valor)
+        self._lock = threading.Lock()
+        self._en_vuelo = {}        # clave -> _Vuelo (cálculos en curso en hilos)
+        self._en_vuelo_async = {}  # clave -> asyncio.Future (cálculos en curso en el event loop)
+        self.agrupadas = 0
+
+    def obtener(self, clave, defecto=None):
+        with self._lock:
+            entrada = self._datos.get(clave, _NO_ENCONTRADO)
+            if entrada is _NO_ENCONTRADO or entrada[0] < time.monotonic():
+                if entrada is not _NO_ENCONTRADO:
+                    del self._datos[clave]
+                self.fallos += 1
+                return defecto
+            self._datos.move_to_end(clave)
+            self.aciertos += 1
+            return entrada[1]
+
+    def guardar(self, clave, valor, generacion=None):
+        """Guarda el valor salvo que se haya invalidado desde `generacion` (si se indica)."""
+        with self._lock:
+            if generacion is not None and generacion != self.generacion:
+                return False
+            self._datos[clave] = (time.monotonic() + self.ttl_segundos, valor)
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.max_entradas:
+                self._datos.popitem(last=False)
+            return True
+
+    def obtener_o_calcular(self, clave, calcular):
+        valor = self.obtener(clave, _NO_ENCONTRADO)
+        if valor is not _NO_ENCONTRADO:
+            return valor
+        with self._lock:
+            vuelo = self._en_vuelo.get(clave)
+            lider = vuelo is None
+            if lider:
+                vuelo = self._en_vuelo[clave] = _Vuelo(self.generacion)
+            else:
+                self.agrupadas += 1
+        if not lider:
+            vuelo.evento.wait()
+            if vuelo.error is not None:
+                raise vuelo.error
+            return vuelo.valor
+        try:
+            vuelo.valor = calcular()
+            self.guardar(clave, vuelo.valor, vuelo.generacion)
+            return vuelo.valor
+        except Exception as e:
+            vuelo.error = e
+            raise
+        finally:
+            with self._lock:
+                self._en_vuelo.pop(clave, None)
+            vuelo.evento.set()
+
+    async def obtener_o_calcular_async(self, clave, calcular):
+        """Igual que obtener_o_calcular, con calcular() asíncrona (un solo event loop)."""
+        valor = self.obtener(clave, _NO_ENCONTRADO)
+        if valor is not _NO_ENCONTRADO:
+            return valor
+        futuro = self._en_vuelo_async.get(clave)
+        if futuro is not None:
+            self.agrupadas += 1
+            return await asyncio.shield(futuro)
+        futuro = self._en_vuelo_async[clave] = asyncio.get_running_loop().create_future()
+        generacion = self.generacion
+        try:
+            valor = await calcular()
+            self.guardar(clave, valor, generacion)
+            futuro.set_result(valor)
+            return valor
+        except Exception as e:
+            futuro.set_exception(e)
+            futuro.exception()  # marcada como leída aunque no haya nadie esperando
+            raise
+        finally:
+            self._en_vuelo_async.pop(clave, None)
+
+    def invalidar(self, clave=None):
+        """Sin clave vacía toda la caché."""
+        with self._lock:
+            self.generacion += 1
+            if clave is None:
+                self._datos.clear()
+            else:
+                self._datos.pop(clave, None)
+
+    def estadisticas(self):
+        with self._lock:
+            return {
+                "entradas": len(self._datos),
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "agrupadas": self.agrupadas,
+                "generacion": self.generacion,
+            }
@@ -1,28 +1,214 @@
+import logging
 import smtplib
+import socket
+import threading
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.utils import formataddr
 
+logger = logging.getLogger(__name__)
+
+
+def error_de_conexion(error):
+    """
+    True si el error deja la conexión inservible (se descarta y se reintenta con otra).
+    Los rechazos de un destinatario o mensaje (SMTPResponseException, también OSError) no la invalidan.
+    """
+    if isinstance(error, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)):
+        return True
+    return isinstance(error, OSError) and not isinstance(error, smtplib.SMTPException)
+
+
 class EmailSender:
-    def __init__(self, smtp_server, smtp_port, smtp_user, smtp_password, from_name="Sistema Egresados"):
+    def __init__(self, smtp_server, smtp_port, smtp_user, smtp_password, from_name="Sistema Egresados", starttls=True, timeout=None):
         self.smtp_server = smtp_server
         self.smtp_port = smtp_port
         self.smtp_user = smtp_user
         self.smtp_password = smtp_password
         self.from_name = from_name
+        self.starttls = starttls
+        self.timeout = timeout
 
-    def send_email(self, to_email, subject, body):
+    def build_message(self, to_email, subject, body):
         msg = MIMEMultipart()
         msg['From'] = formataddr((self.from_name, self.smtp_user))
         msg['To'] = to_email
         msg['Subject'] = subject
         msg.attach(MIMEText(body, 'html'))
+        return msg.as_string()
+
+    def connect(self):
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=self.timeout or socket.getdefaulttimeout())
         try:
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
+            if self.starttls:
                 server.starttls()
+            if self.smtp_user and self.smtp_password:
                 server.login(self.smtp_user, self.smtp_password)
-                server.sendmail(self.smtp_user, to_email, msg.as_string())
+        except Exception:
+            server.close()
+            raise
+        return server
+
+    def send_email(self, to_email, subject, body):
+        try:
+            with self.connect() as server:
+                server.sendmail(self.smtp_user, to_email, self.build_message(to_email, subject, body))
             return True
         except Exception as e:
             print(f"Error enviando correo: {e}")
             return False
+
+
+class _Conexion:
+    def __init__(self, server):
+        self.server = server
+        self.usada_en = time.monotonic()
+
+
+class PooledEmailSender(EmailSender):
+    """
+    EmailSender que reutiliza hasta `pool_size` conexiones ya autenticadas
+    (STARTTLS + login una sola vez por conexión). Antes de reusar una conexión
+    ociosa se verifica con NOOP, las que superan `idle_seconds` se cierran y,
+    si el envío falla por la conexión, se reintenta una vez con una nueva.
+    """
+
+    def __init__(self, smtp_server, smtp_port, smtp_user, smtp_password, from_name="Sistema Egresados",
+                 starttls=True, timeout=None, pool_size=3, pool_timeout=30, idle_seconds=60, check_seconds=10):
+        super().__init__(smtp_server, smtp_port, smtp_user, smtp_password, from_name, starttls, timeout)
+        self.pool_size = pool_size
+        self.pool_timeout = pool_timeout
+        self.idle_seconds = idle_seconds
+        self.check_seconds = check_seconds
+        self._libres = []  # _Conexion ociosas, la más reciente al final
+        self._cupos = threading.BoundedSemaphore(pool_size)
+        self._lock = threading.Lock()
+        self.conexiones_abiertas = 0
+        self.reconexiones = 0
+        self.enviados = 0
+        self.fallidos = 0
+
+    def _cerrar(self, conexion):
+        try:
+            conexion.server.quit()
+        except Exception:
+            conexion.server.close()
+        with self._lock:
+            self.conexiones_abiertas -= 1
+
+    def _abrir(self):
+        conexion = _Conexion(self.connect())
+        with self._lock:
+            self.conexiones_abiertas += 1
+        return conexion
+
+    def _sana(self, conexion):
+        if time.monotonic() - conexion.usada_en < self.check_seconds:
+            return True
+        try:
+            return conexion.server.noop()[0] == 250
+        except Exception:
+            return False
+
+    def _tomar(self):
+        """Conexión lista para usar; el cupo ya fue adquirido por el llamador."""
+        ahora = time.monotonic()
+        while True:
+            with self._lock:
+                conexion = self._libres.pop() if self._libres else None
+            if conexion is None:
+                return self._abrir()
+            if ahora - conexion.usada_en <= self.idle_seconds and self._sana(conexion):
+                return conexion
+            self._cerrar(conexion)
+
+    def _devolver(self, conexion):
+        conexion.usada_en = time.monotonic()
+        with self._lock:
+            self._libres.append(conexion)
+
+    def send_many(self, messages, errors=None):
+        """
+        Envía [(to_email, subject, body), ...] reutilizando una conexión del pool.
+        Devuelve una lista de bool (uno por mensaje), como send_email. Si se pasa la
+        lista `errors`, se le agrega la excepción de cada mensaje (None si se envió).
+        """
+        if errors is None:
+            errors = []
+        if not messages:
+            return []
+        if not self._cupos.acquire(timeout=self.pool_timeout):
+            logger.error("Pool SMTP sin conexiones libres tras %ss", self.pool_timeout)
+            with self._lock:
+                self.fallidos += len(messages)
+            errors.extend([TimeoutError("Pool SMTP sin conexiones libres")] * len(messages))
+            return [False] * len(messages)
+        resultados = []
+        conexion = None
+        try:
+            for to_email, subject, body in messages:
+                mensaje = self.build_message(to_email, subject, body)
+                for intento in (1, 2):
+                    try:
+                        if conexion is None:
+                            conexion = self._tomar()
+                        conexion.server.sendmail(self.smtp_user, to_email, mensaje)
+                        resultados.append(True)
+                        errors.append(None)
+                        break
+                    except Exception as e:
+                        if not error_de_conexion(e):
+                            logger.error("Error enviando correo a %s: %s", to_email, e)
+                            resultados.append(False)
+                            errors.append(e)
+                            break
+                        # Conexión caída: se descarta y se reintenta una vez con una nueva
+                        if conexion is not None:
+                            self._cerrar(conexion)
+                            conexion = None
+                        if intento == 2:
+                            logger.error("Error de conexión SMTP enviando a %s: %s", to_email, e)
+                            resultados.append(False)
+                            errors.append(e)
+                        else:
+                            with self._lock:
+                                self.reconexiones += 1
+        finally:
+            if conexion is not None:
+                self._devolver(conexion)
+            self._cupos.release()
+        with self._lock:
+            self.enviados += resultados.count(True)
+            self.fallidos += resultados.count(False)
+        return resultados
+
+    def send_email(self, to_email, subject, body):
+        return self.send_many([(to_email, subject, body)])[0]
+
+    def close_idle(self):
+        """Cierra las conexiones ociosas por más de idle_seconds (tarea periódica). Devuelve cuántas cerró."""
+        limite = time.monotonic() - self.idle_seconds
+        with self._lock:
+            vencidas = [c for c in self._libres if c.usada_en < limite]
+            self._libres = [c for c in self._libres if c.usada_en >= limite]
+        for conexion in vencidas:
+            self._cerrar(conexion)
+        return len(vencidas)
+
+    def close(self):
+        with self._lock:
+            libres, self._libres = self._libres, []
+        for conexion in libres:
+            self._cerrar(conexion)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "pool_size": self.pool_size,
+                "conexiones_abiertas": self.conexiones_abiertas,
+                "conexiones_libres": len(self._libres),
+                "reconexiones": self.reconexiones,
+                "enviados": self.enviados,
+                "fallidos": self.fallidos,
+            }
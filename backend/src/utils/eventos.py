@@ -0,0 +1,34 @@
+import logging
+import threading
+
+# Bus de eventos en proceso. Los repositorios emiten después de confirmar sus
+# cambios y los índices/cachés en memoria se suscriben para mantenerse al día.
+# Un suscriptor que falla se registra en el log y no interrumpe la escritura.
+# Cada proceso (worker de uvicorn) tiene su propio bus.
+
+logger = logging.getLogger(__name__)
+
+_suscriptores = {}
+_lock = threading.Lock()
+
+
+def suscribir(evento, funcion):
+    with _lock:
+        _suscriptores.setdefault(evento, []).append(funcion)
+    return funcion
+
+
+def desuscribir(evento, funcion):
+    with _lock:
+        if funcion in _suscriptores.get(evento, []):
+            _suscriptores[evento].remove(funcion)
+
+
+def emitir(evento, **datos):
+    with _lock:
+        funciones = list(_suscriptores.get(evento, []))
+    for funcion in funciones:
+        try:
+            funcion(**datos)
+        except Exception:
+            logger.exception("Error en suscriptor de %s", evento)
@@ -0,0 +1,109 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from passlib.context import CryptContext
+from src.config import seguridad as seguridad_config
+
+# Hash y verificación de contraseñas (bcrypt) en un pool de hilos propio y acotado.
+# bcrypt libera el GIL, así que estos hilos trabajan en paralelo sin ocupar el
+# threadpool de FastAPI; si el pool está saturado se rechaza de inmediato en vez
+# de encolar sin límite.
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+class HashSaturado(Exception):
+    pass
+
+
+class MetricasHash:
+    def __init__(self, muestras=1000):
+        self._lock = threading.Lock()
+        self._duraciones = deque(maxlen=muestras)
+        self.total = 0
+        self.rechazados = 0
+        self.max_ms = 0.0
+
+    def registrar(self, ms):
+        with self._lock:
+            self._duraciones.append(ms)
+            self.total += 1
+            self.max_ms = max(self.max_ms, ms)
+
+    def resumen(self):
+        with self._lock:
+            duraciones = sorted(self._duraciones)
+        def percentil(p):
+            return round(duraciones[min(len(duraciones) - 1, int(len(duraciones) * p))], 2) if duraciones else None
+        return {
+            "total": self.total,
+            "rechazados_por_saturacion": self.rechazados,
+            "p50_ms": percentil(0.5),
+            "p95_ms": percentil(0.95),
+            "p99_ms": percentil(0.99),
+            "max_ms": round(self.max_ms, 2),
+        }
+
+
+class PoolHash:
+    def __init__(self, workers, max_pendientes):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hash")
+        self._cupos = threading.BoundedSemaphore(max_pendientes)
+        self.workers = workers
+        self.max_pendientes = max_pendientes
+        self.pendientes = 0
+        self.metricas = MetricasHash()
+        self._lock = threading.Lock()
+
+    def _medir(self, funcion, *args):
+        inicio = time.perf_counter()
+        try:
+            return funcion(*args)
+        finally:
+            self.metricas.registrar((time.perf_counter() - inicio) * 1000)
+
+    def _enviar(self, funcion, *args):
+        if not self._cupos.acquire(blocking=False):
+            with self._lock:
+                self.metricas.rechazados += 1
+            raise HashSaturado("Demasiadas verificaciones de contraseña en curso")
+        with self._lock:
+            self.pendientes += 1
+        try:
+            futuro = self._executor.submit(self._medir, funcion, *args)
+        except Exception:
+            self._liberar(None)
+            raise
+        futuro.add_done_callback(self._liberar)
+        return futuro
+
+    def _liberar(self, _):
+        with self._lock:
+            self.pendientes -= 1
+        self._cupos.release()
+
+    async def verificar(self, password, hashed):
+        return await asyncio.wrap_future(self._enviar(pwd_context.verify, password, hashed))
+
+    async def generar_hash(self, password):
+        return await asyncio.wrap_future(self._enviar(pwd_context.hash, password))
+
+    def verificar_sync(self, password, hashed):
+        """Para código síncrono (ya corre en un hilo): espera el resultado del pool."""
+        return self._enviar(pwd_context.verify, password, hashed).result()
+
+    def generar_hash_sync(self, password):
+        return self._enviar(pwd_context.hash, password).result()
+
+    def estadisticas(self):
+        return {
+            "workers": self.workers,
+            "max_pendientes": self.max_pendientes,
+            "pendientes": self.pendientes,
+            **self.metricas.resumen(),
+        }
+
+
+pool_hash = PoolHash(seguridad_config.HASH_WORKERS, seguridad_config.HASH_MAX_PENDIENTES)
@@ -0,0 +1,78 @@
+import threading
+import time
+from collections import OrderedDict
+
+# Control de admisión con cubos de tokens (token bucket).
+
+
+class CuboTokens:
+    def __init__(self, capacidad, por_segundo, reloj=time.monotonic):
+        self.capacidad = capacidad
+        self.por_segundo = por_segundo
+        self._reloj = reloj
+        self._tokens = float(capacidad)
+        self._ultimo = reloj()
+        self._lock = threading.Lock()
+
+    def _recargar(self):
+        ahora = self._reloj()
+        self._tokens = min(self.capacidad, self._tokens + (ahora - self._ultimo) * self.por_segundo)
+        self._ultimo = ahora
+
+    def consumir(self, n=1):
+        with self._lock:
+            self._recargar()
+            if self._tokens < n:
+                return False
+            self._tokens -= n
+            return True
+
+    def espera_segundos(self, n=1):
+        """Segundos hasta que haya n tokens disponibles."""
+        with self._lock:
+            self._recargar()
+            faltan = n - self._tokens
+            return 0 if faltan <= 0 else faltan / self.por_segundo
+
+
+class LimitadorPorClave:
+    """Un cubo por clave (p. ej. cuenta) más un cubo global compartido."""
+
+    def __init__(self, capacidad, por_segundo, capacidad_global, por_segundo_global, max_claves=10000, reloj=time.monotonic):
+        self.capacidad = capacidad
+        self.por_segundo = por_segundo
+        self.max_claves = max_claves
+        self._reloj = reloj
+        self.cubo_global = CuboTokens(capacidad_global, por_segundo_global, reloj)
+        self._cubos = OrderedDict()
+        self._lock = threading.Lock()
+        self.rechazados_clave = 0
+        self.rechazados_global = 0
+
+    def _cubo(self, clave):
+        with self._lock:
+            cubo = self._cubos.get(clave)
+            if cubo is None:
+                cubo = self._cubos[clave] = CuboTokens(self.capacidad, self.por_segundo, self._reloj)
+                while len(self._cubos) > self.max_claves:
+                    self._cubos.popitem(last=False)
+            self._cubos.move_to_end(clave)
+            return cubo
+
+    def permitir(self, clave):
+        """Retorna (permitido, segundos sugeridos de espera)."""
+        cubo = self._cubo(clave)
+        if not cubo.consumir():
+            self.rechazados_clave += 1
+            return False, cubo.espera_segundos()
+        if not self.cubo_global.consumir():
+            self.rechazados_global += 1
+            return False, self.cubo_global.espera_segundos()
+        return True, 0
+
+    def estadisticas(self):
+        return {
+            "claves": len(self._cubos),
+            "rechazados_por_cuenta": self.rechazados_clave,
+            "rechazados_globales": self.rechazados_global,
+        }
@@ -1,6 +1,19 @@
 from apscheduler.schedulers.background import BackgroundScheduler
+from src.config.db import UnidadDeTrabajo
 from src.feacture.reunion.repository.reunion_repository import ReunionRepository
-from src.feacture.notificacion.service.notificacion_service import NotificacionService
+from src.feacture.reunion.service.reunion_service import ReunionService
+from src.utils.sql_metrics import medir
+from src.config import busqueda as busqueda_config
+from src.config import reportes as reportes_config
+from src.feacture.reporte.repository.reunion_diaria_repository import ReunionDiariaRepository
+from src.feacture.reporte.service.reporte_service import cache_reportes
+from src.feacture.reporte.service.snapshot_cohortes import snapshot_cohortes
+from src.feacture.reporte.service.reporte_job_service import ReporteJobService
+from src.feacture.notificacion.service.notificacion_service import email_sender
+from src.feacture.notificacion.repository.outbox_repository import OutboxRepository
+from src.config import email as email_config
+from src.config import notificaciones as notificaciones_config
+from src.feacture.egresado.service.indice_busqueda import indice_egresados
 from datetime import datetime, timedelta
 
 # Configuración del scheduler
@@ -9,39 +22,84 @@ scheduler = BackgroundScheduler()
 # Tarea para enviar recordatorios automáticos 24h y 1h antes de la reunión
 
 def enviar_recordatorios_automaticos():
-    repo = ReunionRepository()
-    noti_service = NotificacionService()
-    ahora = datetime.now()
-    reuniones = repo.obtener_reuniones_pendientes()
-    for reunion in reuniones:
-        fecha_hora_reunion = datetime.combine(reunion.fecha, reunion.hora)
-        diff = fecha_hora_reunion - ahora
-        if timedelta(hours=0) < diff <= timedelta(hours=1):
-            # Recordatorio 1 hora antes
-            noti_service.enviar_recordatorio(
-                reunion.egresado_id, reunion.egresado.email, reunion.fecha, reunion.hora, reunion.id
-            )
-        elif timedelta(hours=1) < diff <= timedelta(hours=24):
-            # Recordatorio 24 horas antes
-            noti_service.enviar_recordatorio(
-                reunion.egresado_id, reunion.egresado.email, reunion.fecha, reunion.hora, reunion.id
-            )
+    with medir("scheduler enviar_recordatorios_automaticos"), UnidadDeTrabajo() as uow:
+        reunion_service = ReunionService(ReunionRepository(uow.session))
+        ahora = datetime.now()
+        reuniones = reunion_service.repository.obtener_reuniones_pendientes()
+        for reunion in reuniones:
+            fecha_hora_reunion = datetime.combine(reunion.fecha, reunion.hora)
+            diff = fecha_hora_reunion - ahora
+            if timedelta(hours=0) < diff <= timedelta(hours=1):
+                # Recordatorio 1 hora antes
+                reunion_service.enviar_recordatorio(
+                    reunion.egresado_id, reunion.egresado.email, reunion.fecha, reunion.hora, reunion.id
+                )
+            elif timedelta(hours=1) < diff <= timedelta(hours=24):
+                # Recordatorio 24 horas antes
+                reunion_service.enviar_recordatorio(
+                    reunion.egresado_id, reunion.egresado.email, reunion.fecha, reunion.hora, reunion.id
+                )
 
 # Tarea para alertar reuniones no confirmadas
 
 def alertar_reuniones_no_confirmadas():
-    repo = ReunionRepository()
-    noti_service = NotificacionService()
-    reuniones = repo.obtener_reuniones_pendientes()
-    for reunion in reuniones:
-        if reunion.estado == "pendiente":
-            noti_service.alerta_no_confirmada(
-                reunion.egresado_id, reunion.egresado.email, reunion.fecha, reunion.hora, reunion.id
-            )
+    with medir("scheduler alertar_reuniones_no_confirmadas"), UnidadDeTrabajo() as uow:
+        reunion_service = ReunionService(ReunionRepository(uow.session))
+        reuniones = reunion_service.repository.obtener_reuniones_pendientes()
+        for reunion in reuniones:
+            if reunion.estado == "pendiente":
+                reunion_service.alerta_no_confirmada(
+                    reunion.egresado_id, reunion.egresado.email, reunion.fecha, reunion.hora, reunion.id
+                )
+
+# Tarea para reconstruir el índice de búsqueda de egresados (si ya se usó en este proceso)
+
+def reconstruir_indice_busqueda():
+    if not indice_egresados.cargado:
+        return
+    with medir("scheduler reconstruir_indice_busqueda"), UnidadDeTrabajo() as uow:
+        indice_egresados.cargar(uow.session)
+
+# Compactación nocturna del rollup diario de reuniones (corrige derivas y borra filas en cero)
+
+def compactar_rollup_reuniones():
+    with medir("scheduler compactar_rollup_reuniones"), UnidadDeTrabajo() as uow:
+        ReunionDiariaRepository(uow.session).compactar()
+    cache_reportes.invalidar()
+
+# Refresco de la foto de cohortes (si ya se usó en este proceso)
+
+def refrescar_snapshot_cohortes():
+    if not snapshot_cohortes.cargado:
+        return
+    with medir("scheduler refrescar_snapshot_cohortes"), UnidadDeTrabajo() as uow:
+        snapshot_cohortes.cargar(uow.session)
+
+# Limpieza de los archivos de reportes vencidos
+
+def limpiar_artefactos_reportes():
+    ReporteJobService().limpiar_artefactos()
+
+# Cierre de conexiones SMTP ociosas del pool
+
+def cerrar_conexiones_smtp_ociosas():
+    email_sender.close_idle()
+
+# Limpieza de correos ya enviados de la bandeja de salida
+
+def purgar_correos_enviados():
+    with medir("scheduler purgar_correos_enviados"), UnidadDeTrabajo() as uow:
+        OutboxRepository(uow.session).purgar_enviados(notificaciones_config.OUTBOX_RETENCION_DIAS)
 
 # Programar tareas
 scheduler.add_job(enviar_recordatorios_automaticos, 'interval', minutes=30)
 scheduler.add_job(alertar_reuniones_no_confirmadas, 'interval', hours=1)
+scheduler.add_job(reconstruir_indice_busqueda, 'interval', minutes=busqueda_config.INDICE_BUSQUEDA_REFRESCO_MINUTOS)
+scheduler.add_job(refrescar_snapshot_cohortes, 'interval', minutes=reportes_config.REPORTES_SNAPSHOT_REFRESCO_MINUTOS)
+scheduler.add_job(cerrar_conexiones_smtp_ociosas, 'interval', seconds=email_config.EMAIL_POOL_IDLE_SECONDS)
+scheduler.add_job(limpiar_artefactos_reportes, 'interval', hours=1)
+scheduler.add_job(purgar_correos_enviados, 'cron', hour=notificaciones_config.OUTBOX_PURGA_HORA, minute=30)
+scheduler.add_job(compactar_rollup_reuniones, 'cron', hour=reportes_config.REPORTES_ROLLUP_HORA_COMPACTACION)
 
 # Para iniciar el scheduler desde main.py:
 # from src.utils.scheduler import scheduler
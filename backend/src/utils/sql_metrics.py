@@ -0,0 +1,170 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from src.config import metricas as metricas_config
+
+# Instrumentación de SQL basada en eventos de SQLAlchemy.
+# Cada petición (o tarea programada) tiene su MedicionSQL en una ContextVar; los
+# eventos del cursor suman consultas y tiempo, y al cerrar la medición se agrega
+# en MetricasSQL por ruta. Una misma sentencia repetida muchas veces dentro de
+# una medición (p. ej. lazy loads de reunion.egresado) se marca como posible N+1.
+
+_medicion_actual = ContextVar("medicion_sql", default=None)
+
+
+def _texto_corto(sentencia, largo=300):
+    texto = " ".join(sentencia.split())
+    return texto if len(texto) <= largo else texto[:largo] + "..."
+
+
+class MedicionSQL:
+    def __init__(self, nombre):
+        self.nombre = nombre
+        self.consultas = 0
+        self.tiempo_ms = 0.0
+        self.lentas = []  # [(ms, sentencia)] ordenadas de mayor a menor
+        self.repeticiones = {}
+
+    def registrar(self, sentencia, ms):
+        self.consultas += 1
+        self.tiempo_ms += ms
+        self.repeticiones[sentencia] = self.repeticiones.get(sentencia, 0) + 1
+        if len(self.lentas) < metricas_config.SQL_CONSULTAS_LENTAS or ms > self.lentas[-1][0]:
+            self.lentas.append((ms, sentencia))
+            self.lentas.sort(key=lambda x: x[0], reverse=True)
+            del self.lentas[metricas_config.SQL_CONSULTAS_LENTAS:]
+
+    def repetidas(self):
+        return {
+            sentencia: veces for sentencia, veces in self.repeticiones.items()
+            if veces >= metricas_config.SQL_UMBRAL_REPETIDAS
+        }
+
+    def cabeceras(self):
+        return {
+            "X-DB-Query-Count": str(self.consultas),
+            "X-DB-Time-ms": f"{self.tiempo_ms:.2f}",
+            "X-DB-Repeated-Queries": str(len(self.repetidas())),
+        }
+
+
+class MetricasSQL:
+    """Acumulado por ruta desde el arranque (o el último reinicio)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rutas = {}
+        self._lentas = []
+
+    def agregar(self, medicion):
+        repetidas = medicion.repetidas()
+        with self._lock:
+            ruta = self._rutas.setdefault(medicion.nombre, {
+                "peticiones": 0, "consultas": 0, "tiempo_ms": 0.0,
+                "max_consultas": 0, "max_tiempo_ms": 0.0,
+                "peticiones_con_repetidas": 0, "sentencias_repetidas": {}
+            })
+            ruta["peticiones"] += 1
+            ruta["consultas"] += medicion.consultas
+            ruta["tiempo_ms"] += medicion.tiempo_ms
+            ruta["max_consultas"] = max(ruta["max_consultas"], medicion.consultas)
+            ruta["max_tiempo_ms"] = max(ruta["max_tiempo_ms"], medicion.tiempo_ms)
+            if repetidas:
+                ruta["peticiones_con_repetidas"] += 1
+                for sentencia, veces in repetidas.items():
+                    texto = _texto_corto(sentencia)
+                    ruta["sentencias_repetidas"][texto] = max(ruta["sentencias_repetidas"].get(texto, 0), veces)
+            for ms, sentencia in medicion.lentas:
+                self._lentas.append((ms, medicion.nombre, sentencia))
+            self._lentas.sort(key=lambda x: x[0], reverse=True)
+            del self._lentas[metricas_config.SQL_CONSULTAS_LENTAS:]
+
+    def resumen(self):
+        with self._lock:
+            rutas = []
+            for nombre, datos in self._rutas.items():
+                rutas.append({
+                    "ruta": nombre,
+                    "peticiones": datos["peticiones"],
+                    "consultas_promedio": round(datos["consultas"] / datos["peticiones"], 2),
+                    "tiempo_promedio_ms": round(datos["tiempo_ms"] / datos["peticiones"], 2),
+                    "max_consultas": datos["max_consultas"],
+                    "max_tiempo_ms": round(datos["max_tiempo_ms"], 2),
+                    "peticiones_con_repetidas": datos["peticiones_con_repetidas"],
+                    "sentencias_repetidas": dict(datos["sentencias_repetidas"]),
+                })
+            rutas.sort(key=lambda r: r["tiempo_promedio_ms"] * r["peticiones"], reverse=True)
+            lentas = [
+                {"tiempo_ms": round(ms, 2), "ruta": nombre, "sentencia": _texto_corto(sentencia)}
+                for ms, nombre, sentencia in self._lentas
+            ]
+            return {"rutas": rutas, "consultas_mas_lentas": lentas}
+
+    def reiniciar(self):
+        with self._lock:
+            self._rutas.clear()
+            self._lentas.clear()
+
+
+metricas_sql = MetricasSQL()
+
+
+def iniciar_medicion(nombre):
+    medicion = MedicionSQL(nombre)
+    return medicion, _medicion_actual.set(medicion)
+
+
+def finalizar_medicion(medicion, token, nombre=None, agregar=True):
+    _medicion_actual.reset(token)
+    if nombre:
+        medicion.nombre = nombre
+    if agregar:
+        metricas_sql.agregar(medicion)
+
+
+async def agregar_al_terminar(cuerpo, medicion):
+    """
+    Envuelve el cuerpo de una respuesta en streaming: sus consultas se siguen sumando
+    mientras se envía, así que la medición se agrega recién cuando termina (o se corta).
+    """
+    try:
+        async for fragmento in cuerpo:
+            yield fragmento
+    finally:
+        metricas_sql.agregar(medicion)
+
+
+@contextmanager
+def medir(nombre):
+    """Mide las consultas de un bloque fuera de una petición HTTP (tareas programadas, trabajos)."""
+    medicion, token = iniciar_medicion(nombre)
+    try:
+        yield medicion
+    finally:
+        finalizar_medicion(medicion, token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _antes_de_ejecutar(conn, cursor, statement, parameters, context, executemany):
+    if _medicion_actual.get() is not None:
+        conn.info.setdefault("inicio_consulta", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _despues_de_ejecutar(conn, cursor, statement, parameters, context, executemany):
+    medicion = _medicion_actual.get()
+    if medicion is None or not conn.info.get("inicio_consulta"):
+        return
+    ms = (time.perf_counter() - conn.info["inicio_consulta"].pop()) * 1000
+    medicion.registrar(statement, ms)
+
+
+@event.listens_for(Engine, "handle_error")
+def _error_al_ejecutar(contexto):
+    # La sentencia falló: after_cursor_execute no se dispara, se descarta su inicio
+    inicios = contexto.connection.info.get("inicio_consulta") if contexto.connection is not None else None
+    if inicios:
+        inicios.pop()
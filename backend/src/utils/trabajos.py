@@ -0,0 +1,135 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from uuid import uuid4
+
+# Trabajos en segundo plano con progreso, ETA y cancelación.
+# Cada GestorTrabajos tiene su propio pool acotado de hilos.
+
+TRABAJOS_FINALIZADOS = ("completado", "cancelado", "fallido")
+
+
+class TrabajoCancelado(Exception):
+    pass
+
+
+class Trabajo:
+    def __init__(self, tipo, total=None):
+        self.id = uuid4().hex
+        self.tipo = tipo
+        self.estado = "en_cola"  # en_cola, procesando, completado, cancelado, fallido
+        self.total = total
+        self.procesados = 0
+        self.exitosos = 0
+        self.rechazados = 0
+        self.resultado = None
+        self.error = None
+        self.creado_en = datetime.now()
+        self.iniciado_en = None
+        self.finalizado_en = None
+        self._inicio = None
+        self._cancelar = threading.Event()
+
+    @property
+    def cancelado(self):
+        return self._cancelar.is_set()
+
+    def cancelar(self):
+        self._cancelar.set()
+
+    def progreso(self, procesados, exitosos=None, rechazados=None):
+        self.procesados = procesados
+        if exitosos is not None:
+            self.exitosos = exitosos
+        if rechazados is not None:
+            self.rechazados = rechazados
+
+    def eta_segundos(self):
+        if self.estado != "procesando" or not self.total or not self.procesados:
+            return None
+        transcurrido = time.monotonic() - self._inicio
+        restantes = max(self.total - self.procesados, 0)
+        return round(transcurrido / self.procesados * restantes, 1)
+
+    def a_dict(self):
+        porcentaje = None
+        if self.total:
+            porcentaje = round(min(self.procesados / self.total, 1) * 100, 1)
+        return {
+            "id": self.id,
+            "tipo": self.tipo,
+            "estado": self.estado,
+            "total": self.total,
+            "procesados": self.procesados,
+            "exitosos": self.exitosos,
+            "rechazados": self.rechazados,
+            "porcentaje": porcentaje,
+            "eta_segundos": self.eta_segundos(),
+            "creado_en": self.creado_en,
+            "iniciado_en": self.iniciado_en,
+            "finalizado_en": self.finalizado_en,
+            "resultado": self.resultado,
+            "error": self.error
+        }
+
+
+class GestorTrabajos:
+    def __init__(self, max_workers, max_pendientes, retencion_segundos=3600):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="trabajo")
+        self.max_pendientes = max_pendientes
+        self.retencion_segundos = retencion_segundos
+        self._trabajos = {}
+        self._lock = threading.Lock()
+
+    def encolar(self, tipo, funcion, total=None, al_finalizar=None):
+        """
+        Encola funcion(trabajo); lanza ValueError si ya hay demasiados trabajos pendientes.
+        al_finalizar() se llama siempre al terminar, también si se canceló en cola y
+        funcion no llegó a ejecutarse (p. ej. para borrar el archivo subido).
+        """
+        with self._lock:
+            self._purgar()
+            pendientes = sum(1 for t in self._trabajos.values() if t.estado not in TRABAJOS_FINALIZADOS)
+            if pendientes >= self.max_pendientes:
+                raise ValueError("Hay demasiados trabajos en proceso, intente más tarde")
+            trabajo = Trabajo(tipo, total)
+            self._trabajos[trabajo.id] = trabajo
+        self.executor.submit(self._ejecutar, trabajo, funcion, al_finalizar)
+        return trabajo
+
+    def obtener(self, trabajo_id):
+        return self._trabajos.get(trabajo_id)
+
+    def cancelar(self, trabajo_id):
+        trabajo = self.obtener(trabajo_id)
+        if trabajo and trabajo.estado not in TRABAJOS_FINALIZADOS:
+            trabajo.cancelar()
+        return trabajo
+
+    def _ejecutar(self, trabajo, funcion, al_finalizar=None):
+        try:
+            # Cancelado mientras estaba en cola: no se abre sesión ni se crean archivos
+            if trabajo.cancelado:
+                trabajo.estado = "cancelado"
+                return
+            trabajo.estado = "procesando"
+            trabajo.iniciado_en = datetime.now()
+            trabajo._inicio = time.monotonic()
+            trabajo.resultado = funcion(trabajo)
+            trabajo.estado = "cancelado" if trabajo.cancelado else "completado"
+        except TrabajoCancelado:
+            trabajo.estado = "cancelado"
+        except Exception as ex:
+            trabajo.estado = "fallido"
+            trabajo.error = str(ex)
+        finally:
+            trabajo.finalizado_en = datetime.now()
+            if al_finalizar:
+                al_finalizar()
+
+    def _purgar(self):
+        limite = datetime.now().timestamp() - self.retencion_segundos
+        for trabajo_id, trabajo in list(self._trabajos.items()):
+            if trabajo.finalizado_en and trabajo.finalizado_en.timestamp() < limite:
+                del self._trabajos[trabajo_id]
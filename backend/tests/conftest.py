@@ -0,0 +1,22 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Sin DATABASE_URL las pruebas usan un SQLite temporal en lugar del MySQL de desarrollo
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_egresados.db")
+# Sin workers de entrega de correos en segundo plano: las pruebas llaman a procesar_lote()
+os.environ.setdefault("OUTBOX_WORKERS", "0")
+
+import pytest
+from src.config.db import Base, engine
+import src.create_tables  # registra todos los modelos en Base.metadata
+
+@pytest.fixture(scope="session", autouse=True)
+def crear_tablas():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+    if engine.url.get_backend_name() == "sqlite" and os.path.exists(engine.url.database):
+        os.remove(engine.url.database)
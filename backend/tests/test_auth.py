@@ -0,0 +1,111 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi.testclient import TestClient
+from main import app
+from src.config.db import SessionLocal
+from src.feacture.rol.model.rol import Rol
+from src.feacture.usuario.model.usuario import Usuario
+from src.utils.auth import AuthService, cache_usuarios
+from src.utils.limitador import LimitadorPorClave
+
+client = TestClient(app)
+
+def _crear_admin(email):
+    db = SessionLocal()
+    rol = db.query(Rol).filter_by(nombre="admin").first() or Rol(nombre="admin")
+    usuario = Usuario(username=email, email=email, password=AuthService().get_password_hash("clave123"), rol=rol)
+    db.add(usuario)
+    db.commit()
+    usuario_id = usuario.id
+    db.close()
+    return usuario_id
+
+def _token(email):
+    response = client.post("/usuario/login", json={"email": email, "password": "clave123"})
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+def test_rol_en_cache_y_suspension_invalida():
+    usuario_id = _crear_admin("admin.cache@correo.com")
+    # Token sin claims de rol/estado (emitido antes de que existieran): usa la caché
+    token = AuthService().create_access_token(data={"sub": str(usuario_id)})
+    cabeceras = {"Authorization": f"Bearer {token}"}
+    primera = client.get("/usuario/admin-only", headers=cabeceras)
+    assert primera.status_code == 200
+    # Segunda petición autorizada sin consultas a la BD
+    segunda = client.get("/usuario/admin-only", headers=cabeceras)
+    assert segunda.status_code == 200
+    assert segunda.headers["X-DB-Query-Count"] == "0"
+    assert cache_usuarios.obtener(usuario_id).rol == "admin"
+
+    assert client.put(f"/usuario/suspender/{usuario_id}").status_code == 200
+    assert cache_usuarios.obtener(usuario_id) is None
+    assert client.get("/usuario/admin-only", headers=cabeceras).status_code == 403
+
+def test_claims_del_token_y_revocacion_al_suspender():
+    usuario_id = _crear_admin("admin.claims@correo.com")
+    cabeceras = _token("admin.claims@correo.com")
+    client.get("/usuario/admin-only", headers=cabeceras)
+    response = client.get("/usuario/admin-only", headers=cabeceras)
+    assert response.status_code == 200
+    assert response.headers["X-DB-Query-Count"] == "0"
+    assert client.get("/usuario/me", headers=cabeceras).json()["email"] == "admin.claims@correo.com"
+
+    assert client.put(f"/usuario/suspender/{usuario_id}").status_code == 200
+    response = client.get("/usuario/admin-only", headers=cabeceras)
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Token revocado"
+    response = client.post("/usuario/login", json={"email": "admin.claims@correo.com", "password": "clave123"})
+    assert response.status_code == 403
+
+def test_token_invalido():
+    assert client.get("/usuario/me", headers={"Authorization": "Bearer x"}).status_code == 401
+
+def test_login_limitado_por_cuenta_antes_de_bcrypt():
+    _crear_admin("admin.limite@correo.com")
+    respuestas = [
+        client.post("/usuario/login", json={"email": "admin.limite@correo.com", "password": "incorrecta"})
+        for _ in range(6)
+    ]
+    assert [r.status_code for r in respuestas] == [401] * 5 + [429]
+    assert int(respuestas[-1].headers["Retry-After"]) >= 1
+
+def test_cubo_tokens_recarga():
+    ahora = [0.0]
+    limitador = LimitadorPorClave(2, 1, 3, 0.5, reloj=lambda: ahora[0])
+    assert [limitador.permitir("a")[0] for _ in range(3)] == [True, True, False]
+    assert limitador.permitir("b") == (True, 0)
+    assert limitador.permitir("c")[0] is False  # cubo global agotado
+    ahora[0] = 2.0
+    assert limitador.permitir("a")[0] is True
+
+def test_primera_carga_de_revocaciones_bloquea_y_refresco_no():
+    import threading
+    import time
+    from src.utils.auth import ListaRevocacion
+
+    lista = ListaRevocacion(refresco_segundos=60)
+    cargando = threading.Event()
+    def cargar_lento():
+        cargando.set()
+        time.sleep(0.2)
+        return {7: 3}
+    hilo = threading.Thread(target=lista.recargar_si_vencida, args=(cargar_lento,))
+    hilo.start()
+    cargando.wait()
+    # Mientras la primera carga está en curso, otro hilo espera en lugar de aceptar todo
+    lista.recargar_si_vencida(lambda: {})
+    assert not lista.vigente(7, 2)
+    hilo.join()
+
+    lista.actualizada_en -= 120
+    hilo = threading.Thread(target=lista.recargar_si_vencida, args=(cargar_lento,))
+    cargando.clear()
+    hilo.start()
+    cargando.wait()
+    inicio = time.perf_counter()
+    lista.recargar_si_vencida(lambda: {})
+    assert time.perf_counter() - inicio < 0.1 and not lista.vigente(7, 2)
+    hilo.join()
@@ -0,0 +1,42 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import asyncio
+from datetime import date
+from src.config.db import SessionLocal
+from src.config.db_async import crear_async_engine, _url_async
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from src.feacture.egresado.model.egresado import Egresado
+from src.feacture.egresado.repository.egresado_repository_async import EgresadoRepositoryAsync
+from src.feacture.reporte.repository.reporte_repository_async import ReporteRepositoryAsync
+
+def test_url_async():
+    assert _url_async("mysql+pymysql://u:p@localhost/db") == "mysql+aiomysql://u:p@localhost/db"
+    assert _url_async("sqlite:///./x.db") == "sqlite+aiosqlite:///./x.db"
+
+def test_repositorios_async_con_aiosqlite():
+    db = SessionLocal()
+    db.add(Egresado(
+        id="async-1", usuario_dni="90000001", nombres="Ana", apellidos="Ríos", email="ana.async@correo.com",
+        password="123456", carrera_profesional="Derecho", anio_egreso=2019, genero="Femenino",
+        fecha_nacimiento=date(1996, 5, 1), ciudad="Arequipa"
+    ))
+    db.commit()
+    db.close()
+
+    async def consultar():
+        engine = crear_async_engine(_url_async(os.environ["DATABASE_URL"]))
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+                filtrados, _ = await EgresadoRepositoryAsync(session).filtrar(
+                    {"carrera": "Derecho", "genero": None, "anio_egreso": None, "ciudad": "Arequipa"}
+                )
+                resumen = await ReporteRepositoryAsync(session).resumen_reuniones()
+                return filtrados, resumen
+        finally:
+            await engine.dispose()
+
+    filtrados, resumen = asyncio.run(consultar())
+    assert [e["usuario_dni"] for e in filtrados] == ["90000001"]
+    assert resumen == {"agendadas": 0, "realizadas": 0, "canceladas": 0, "confirmadas": 0}
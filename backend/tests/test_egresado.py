@@ -2,12 +2,26 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+import json
 import pytest
 from fastapi.testclient import TestClient
 from main import app
 
 client = TestClient(app)
 
+def _cabeceras_admin(email):
+    from src.config.db import SessionLocal
+    from src.feacture.rol.model.rol import Rol
+    from src.feacture.usuario.model.usuario import Usuario
+    from src.utils.auth import AuthService
+    db = SessionLocal()
+    rol = db.query(Rol).filter_by(nombre="admin").first() or Rol(nombre="admin")
+    db.add(Usuario(username=email, email=email, password=AuthService().get_password_hash("clave123"), rol=rol))
+    db.commit()
+    db.close()
+    token = client.post("/usuario/login", json={"email": email, "password": "clave123"}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
 def test_registro_egresado():
     data = {
         "nombres": "Juan",
@@ -59,6 +73,69 @@ def test_filtrar_egresados():
     assert response.status_code == 200
     assert isinstance(response.json(), list)
 
+def test_filtrar_egresados_paginado_y_proyectado():
+    for i in range(3):
+        data = {
+            "nombres": "Pag", "apellidos": "Inado", "dni": f"7000000{i}", "email": f"pag{i}@correo.com",
+            "password": "123456", "carrera_profesional": "Paginación", "anio_egreso": 2021,
+            "genero": "Femenino", "fecha_nacimiento": "1998-03-03", "ciudad": "Cusco"
+        }
+        assert client.post("/egresado/registro", json=data).status_code == 201
+    response = client.get("/egresado/?carrera=Paginación&limite=2&campos=nombres,email")
+    assert response.status_code == 200
+    primera = response.json()
+    assert [set(e) for e in primera] == [{"id", "nombres", "email"}] * 2
+    response = client.get(f"/egresado/?carrera=Paginación&limite=2&cursor={response.headers['X-Next-Cursor']}")
+    assert [e["id"] for e in response.json()] == ["70000002"]
+    assert "X-Next-Cursor" not in response.headers
+    assert "cv" not in response.json()[0] and "password" not in response.json()[0]
+    assert client.get("/egresado/?campos=password").status_code == 400
+    assert client.get("/egresado/?cursor=xyz").status_code == 400
+
+def test_exportar_egresados_csv_y_ndjson():
+    assert client.get("/egresado/exportar?carrera=Paginación").status_code in (401, 403)
+    admin = _cabeceras_admin("admin.exportar@correo.com")
+    response = client.get("/egresado/exportar?carrera=Paginación&campos=nombres,fecha_nacimiento", headers=admin)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    lineas = response.text.splitlines()
+    assert lineas[0] == "id,nombres,fecha_nacimiento"
+    assert lineas[1:] == ["70000000,Pag,1998-03-03", "70000001,Pag,1998-03-03", "70000002,Pag,1998-03-03"]
+    response = client.get("/egresado/exportar?formato=ndjson&carrera=Paginación", headers=admin)
+    filas = [json.loads(linea) for linea in response.text.splitlines()]
+    assert [f["id"] for f in filas] == ["70000000", "70000001", "70000002"]
+    assert "password" not in filas[0] and "cv" not in filas[0]
+    assert client.get("/egresado/exportar?formato=xml", headers=admin).status_code == 400
+
+def test_facetas_egresados_se_invalidan_al_registrar():
+    facetas = client.get("/egresado/facetas?ciudad=Arequipa&genero=Masculino").json()
+    assert facetas == {"total": 0, "facetas": {"carrera_profesional": [], "genero": [], "ciudad": [], "anio_egreso": []}}
+    data = {
+        "nombres": "Facundo", "apellidos": "Faceta", "dni": "80000001", "email": "facundo@correo.com",
+        "password": "123456", "carrera_profesional": "Economía", "anio_egreso": 2018,
+        "genero": "Masculino", "fecha_nacimiento": "1994-04-04", "ciudad": "Arequipa"
+    }
+    assert client.post("/egresado/registro", json=data).status_code == 201
+    facetas = client.get("/egresado/facetas?ciudad=Arequipa&genero=Masculino").json()
+    assert facetas["total"] == 1
+    assert facetas["facetas"]["carrera_profesional"] == [{"valor": "Economía", "total": 1}]
+    assert facetas["facetas"]["anio_egreso"] == [{"valor": "2018", "total": 1}]
+
+def test_buscar_egresados_por_nombre_parcial_y_dni():
+    response = client.get("/egresado/buscar?q=perez")
+    assert response.status_code == 200
+    assert response.json()[0]["usuario_dni"] == "12345678"
+    # Alta posterior a la carga del índice: se incorpora por evento
+    data = {
+        "nombres": "Valentina", "apellidos": "Quispe Mamani", "dni": "45678912", "email": "valentina@correo.com",
+        "password": "123456", "carrera_profesional": "Derecho", "anio_egreso": 2019,
+        "genero": "Femenino", "fecha_nacimiento": "1997-07-07", "ciudad": "Puno"
+    }
+    assert client.post("/egresado/registro", json=data).status_code == 201
+    assert client.get("/egresado/buscar?q=valen quispe").json()[0]["usuario_dni"] == "45678912"
+    assert client.get("/egresado/buscar?q=quipse").json()[0]["usuario_dni"] == "45678912"
+    assert client.get("/egresado/buscar?q=456789").json()[0]["usuario_dni"] == "45678912"
+
 def test_recuperar_password():
     data = {"email": "juan@correo.com"}
     response = client.post("/egresado/recuperar-password", json=data)
@@ -0,0 +1,88 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import socket
+import socketserver
+import threading
+import time
+import pytest
+from src.utils.email_sender import PooledEmailSender
+
+class _SesionSMTP(socketserver.StreamRequestHandler):
+    # Servidor SMTP mínimo (sin TLS) para probar el pool sin red
+    def responder(self, linea):
+        self.wfile.write((linea + "\r\n").encode())
+
+    def handle(self):
+        servidor = self.server
+        servidor.conexiones.append(self.connection)
+        self.responder("220 stub")
+        while True:
+            linea = self.rfile.readline().decode().strip()
+            if not linea:
+                return
+            comando = linea.split(" ")[0].upper()
+            if comando == "EHLO":
+                self.responder("250-stub")
+                self.responder("250 AUTH PLAIN")
+            elif comando == "AUTH":
+                servidor.logins += 1
+                self.responder("235 ok")
+            elif comando == "RCPT" and "rechazado" in linea:
+                self.responder("550 no existe")
+            elif comando == "DATA":
+                self.responder("354 fin con .")
+                while self.rfile.readline().decode().rstrip("\r\n") != ".":
+                    pass
+                servidor.mensajes += 1
+                self.responder("250 ok")
+            elif comando == "QUIT":
+                self.responder("221 bye")
+                return
+            else:  # MAIL, RCPT, NOOP, RSET
+                self.responder("250 ok")
+
+@pytest.fixture
+def servidor_smtp():
+    socketserver.ThreadingTCPServer.allow_reuse_address = True
+    servidor = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _SesionSMTP)
+    servidor.daemon_threads = True
+    servidor.conexiones, servidor.logins, servidor.mensajes = [], 0, 0
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    yield servidor
+    servidor.shutdown()
+    servidor.server_close()
+
+def _sender(servidor, **opciones):
+    return PooledEmailSender(
+        "127.0.0.1", servidor.server_address[1], "sistema@correo.com", "clave",
+        starttls=False, timeout=5, **opciones
+    )
+
+def test_pool_reutiliza_conexiones_y_reconecta(servidor_smtp):
+    sender = _sender(servidor_smtp, pool_size=2, check_seconds=60)
+    mensajes = [(f"egresado{i}@correo.com", "Aviso", "<p>Hola</p>") for i in range(5)]
+    assert sender.send_many(mensajes) == [True] * 5
+    assert sender.send_email("otro@correo.com", "Aviso", "Hola") is True
+    assert (len(servidor_smtp.conexiones), servidor_smtp.logins, servidor_smtp.mensajes) == (1, 1, 6)
+
+    # Un rechazo de destinatario no invalida la conexión
+    assert sender.send_many([("rechazado@correo.com", "A", "B"), ("ok@correo.com", "A", "B")]) == [False, True]
+    assert len(servidor_smtp.conexiones) == 1
+
+    # El servidor corta la conexión: se descarta y se reintenta con una nueva
+    servidor_smtp.conexiones[0].shutdown(socket.SHUT_RDWR)
+    time.sleep(0.1)
+    assert sender.send_email("tras.corte@correo.com", "Aviso", "Hola") is True
+    assert sender.stats()["reconexiones"] == 1 and len(servidor_smtp.conexiones) == 2
+    sender.close()
+
+def test_pool_cierra_conexiones_ociosas(servidor_smtp):
+    sender = _sender(servidor_smtp, idle_seconds=0.1, check_seconds=0)
+    assert sender.send_email("a@correo.com", "Aviso", "Hola") is True
+    time.sleep(0.2)
+    assert sender.close_idle() == 1 and sender.stats()["conexiones_abiertas"] == 0
+    assert sender.send_email("b@correo.com", "Aviso", "Hola") is True
+    assert len(servidor_smtp.conexiones) == 2
+    sender.close()
@@ -0,0 +1,102 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pandas as pd
+from src.feacture.egresado.service.importacion_validador import validar_dataframe, filas_rechazadas, hash_filas
+
+def _fila(**kwargs):
+    fila = {
+        "dni": "12345678",
+        "nombres": "Juan",
+        "apellidos": "Pérez",
+        "email": "juan@correo.com",
+        "carrera_profesional": "Ingeniería",
+        "anio_egreso": 2020,
+        "genero": "Masculino",
+        "fecha_nacimiento": "1995-01-01",
+        "ciudad": "Lima"
+    }
+    fila.update(kwargs)
+    return fila
+
+def test_validar_dataframe_filas_validas():
+    df = pd.DataFrame([_fila(), _fila(dni="87654321", email="ana@correo.com", genero="Femenino")])
+    normalizado, mascara_error, motivos = validar_dataframe(df)
+    assert not mascara_error.any()
+    assert normalizado.loc[0, "password"] == "123456"
+    assert str(normalizado.loc[1, "fecha_nacimiento"]) == "1995-01-01"
+
+def test_validar_dataframe_motivos():
+    df = pd.DataFrame([
+        _fila(nombres="  "),
+        _fila(dni="11111111", email="a@correo.com", anio_egreso="dos mil"),
+        _fila(dni="22222222", email="b@correo.com", fecha_nacimiento="no es fecha"),
+        _fila(dni="33333333", email="c@correo.com", genero="X"),
+        _fila(dni="44444444", email="d@correo.com"),
+        _fila(dni="44444444", email="e@correo.com"),
+        _fila(dni="55555555", email="D@correo.com"),
+    ])
+    _, mascara_error, motivos = validar_dataframe(df)
+    assert motivos.tolist() == [
+        "Campo obligatorio vacío: nombres",
+        "Año de egreso inválido",
+        "Fecha de nacimiento inválida",
+        "Género inválido",
+        None,
+        "DNI duplicado en el archivo",
+        "Email duplicado en el archivo",
+    ]
+    assert mascara_error.sum() == 6
+
+def test_duplicado_no_rechaza_si_la_primera_fila_es_invalida():
+    df = pd.DataFrame([_fila(email="invalido"), _fila()])
+    _, mascara_error, motivos = validar_dataframe(df)
+    assert motivos.tolist() == ["Email inválido", None]
+
+def test_columna_faltante_y_filas_rechazadas():
+    df = pd.DataFrame([_fila()]).drop(columns=["genero"])
+    _, _, motivos = validar_dataframe(df)
+    errores = filas_rechazadas(df, motivos)
+    assert errores[0]["motivo_error"] == "Campo obligatorio vacío: genero"
+    assert errores[0]["dni"] == "12345678"
+
+def test_hash_filas_detecta_cambios_e_ignora_password():
+    original, _, _ = validar_dataframe(pd.DataFrame([_fila(), _fila(dni="87654321", email="ana@correo.com")]))
+    cambiado, _, _ = validar_dataframe(pd.DataFrame([_fila(password="otra123"), _fila(dni="87654321", email="ana@correo.com", ciudad="Cusco")]))
+    hash_original = hash_filas(original)
+    hash_cambiado = hash_filas(cambiado)
+    assert hash_original[0] == hash_cambiado[0]
+    assert hash_original[1] != hash_cambiado[1]
+
+def test_sin_columnas_dni_ni_email_se_rechaza_cada_fila():
+    df = pd.DataFrame([_fila(), _fila(nombres="Ana")]).drop(columns=["dni", "email"])
+    _, mascara_error, motivos = validar_dataframe(df)
+    assert mascara_error.all()
+    assert motivos.tolist() == ["Campo obligatorio vacío: dni"] * 2
+
+def test_reimportar_fila_sin_cambios_en_lote_con_anio_vacio():
+    from src.feacture.egresado.service.importacion_egresado_service import ImportacionEgresadoService
+
+    def upsert(filas):
+        normalizado, mascara_error, motivos = validar_dataframe(pd.DataFrame(filas))
+        return service._upsert_lote(normalizado.loc[~mascara_error], motivos)
+
+    service = ImportacionEgresadoService()
+    fila = _fila(dni="91000001", email="hash.estable@correo.com")
+    assert upsert([fila]) == (1, 0, 0)
+    # El año vacío de otra fila vuelve float64 la columna; la fila intacta sigue igual
+    assert upsert([fila, _fila(dni="91000002", email="otra.fila@correo.com", anio_egreso=None)]) == (0, 0, 1)
+    service.repository.db.close()
+
+def test_buscar_existentes_compara_emails_sin_mayusculas():
+    from src.config.db import SessionLocal
+    from src.feacture.egresado.model.egresado import Egresado
+    from src.feacture.egresado.repository.egresado_repository import EgresadoRepository
+
+    db = SessionLocal()
+    db.add(Egresado(id="91000003", usuario_dni="91000003", nombres="Ana", apellidos="Caso", email="Ana.Caso@Correo.com", password="x"))
+    db.commit()
+    _, emails = EgresadoRepository(db).buscar_existentes([], ["ana.caso@correo.com", "ANA.CASO@correo.com"])
+    assert emails == {"ana.caso@correo.com"}
+    db.close()
@@ -0,0 +1,48 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine, inspect, text
+from src.config.db import Base
+from src.migrations.runner import migrar, estado
+
+def test_migrar_base_existente_agrega_columnas_e_indices(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migraciones.db'}")
+    # Base creada antes de las columnas incrementales y de los índices
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_reuniones_fecha_hora_estado"))
+        conn.execute(text("DROP INDEX ix_importaciones_egresado_hash_archivo"))
+        conn.execute(text("ALTER TABLE importaciones_egresado DROP COLUMN hash_archivo"))
+        conn.execute(text("ALTER TABLE egresados DROP COLUMN hash_importacion"))
+        conn.execute(text("ALTER TABLE usuarios DROP COLUMN token_version"))
+
+    assert migrar(engine) == [1, 2, 3, 4, 5, 6, 7]
+    inspector = inspect(engine)
+    assert "hash_importacion" in {c["name"] for c in inspector.get_columns("egresados")}
+    assert "hash_archivo" in {c["name"] for c in inspector.get_columns("importaciones_egresado")}
+    assert "token_version" in {c["name"] for c in inspector.get_columns("usuarios")}
+    assert "ix_reuniones_fecha_hora_estado" in {i["name"] for i in inspector.get_indexes("reuniones")}
+    assert all(m["aplicada"] for m in estado(engine))
+    assert migrar(engine) == []
+    engine.dispose()
+
+def test_migrar_base_vacia_coincide_con_los_modelos(tmp_path):
+    # Las migraciones congeladas, aplicadas desde cero, dan el mismo esquema que los modelos actuales
+    migrada = create_engine(f"sqlite:///{tmp_path / 'migrada.db'}")
+    modelos = create_engine(f"sqlite:///{tmp_path / 'modelos.db'}")
+    migrar(migrada)
+    Base.metadata.create_all(modelos)
+
+    def esquema(engine):
+        inspector = inspect(engine)
+        return {
+            tabla: (
+                {(c["name"], str(c["type"]), c["nullable"]) for c in inspector.get_columns(tabla)},
+                {(i["name"], tuple(i["column_names"]), bool(i["unique"])) for i in inspector.get_indexes(tabla)},
+            )
+            for tabla in inspector.get_table_names() if tabla != "schema_migrations"
+        }
+    assert esquema(migrada) == esquema(modelos)
+    migrada.dispose()
+    modelos.dispose()
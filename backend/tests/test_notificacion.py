@@ -0,0 +1,103 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import smtplib
+from datetime import date, time
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.config.db import Base, opciones_engine
+from src.feacture.egresado.model.egresado import Egresado
+from src.feacture.reunion.model.reunion import Reunion
+from src.feacture.notificacion.model.notificacion import Notificacion
+from src.feacture.notificacion.model.correo_saliente import CorreoSaliente
+from src.feacture.notificacion.repository.outbox_repository import OutboxRepository
+from src.feacture.notificacion.service.entrega_correos import EntregaCorreos
+from src.feacture.reunion.repository.reunion_repository import ReunionRepository
+from src.feacture.reunion.service.reunion_service import ReunionService
+
+class SenderFalso:
+    # Responde con el error configurado por destinatario (None = enviado)
+    def __init__(self, errores=None):
+        self.errores = errores or {}
+        self.enviados = []
+
+    def send_many(self, messages, errors):
+        for to_email, subject, body in messages:
+            error = self.errores.get(to_email)
+            errors.append(error)
+            if error is None:
+                self.enviados.append(to_email)
+        return [e is None for e in errors]
+
+@pytest.fixture
+def sesiones(tmp_path):
+    # Base propia por prueba: los workers confirman en sesiones separadas y las
+    # reuniones creadas aquí no alteran los conteos globales de otras pruebas
+    url = f"sqlite:///{tmp_path / 'outbox.db'}"
+    engine = create_engine(url, **opciones_engine(url))
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+def _correos(db, **filtros):
+    db.expire_all()
+    return db.query(CorreoSaliente).filter_by(**filtros).all()
+
+def test_reunion_y_correo_se_guardan_juntos_y_se_entregan_despues(sesiones):
+    db = sesiones()
+    db.add(Egresado(id="N1", usuario_dni="90000101", nombres="Nora", apellidos="Outbox", email="nora@correo.com", password="x"))
+    db.commit()
+    service = ReunionService(ReunionRepository(db))
+    reunion = service.solicitar_reunion("N1", date(2025, 6, 2), time(9, 0), email_egresado="nora@correo.com")
+    service.cancelar_reunion(reunion.id, date(2025, 6, 2), time(9, 0), email_egresado="nora@correo.com", egresado_id="N1")
+    assert [c.asunto for c in _correos(db, referencia_id=reunion.id)] == ["Reunión agendada", "Reunión cancelada"]
+    assert db.query(Notificacion).filter_by(referencia_id=reunion.id).count() == 3
+
+    # Si algo falla antes del commit no queda ni la reunión ni el correo
+    def fallar(*args, **kwargs):
+        raise RuntimeError("falla")
+    service.notificacion_service.agregar_notificacion = fallar
+    with pytest.raises(RuntimeError):
+        service.solicitar_reunion("N1", date(2025, 6, 3), time(9, 0), email_egresado="nora@correo.com")
+    db.rollback()
+    assert db.query(Reunion).filter_by(egresado_id="N1").count() == 1
+    assert len(_correos(db, destinatario="nora@correo.com")) == 2
+
+    sender = SenderFalso()
+    assert EntregaCorreos(sender, lote=1, session_factory=sesiones).procesar_lote() == 1
+    assert EntregaCorreos(sender, session_factory=sesiones).procesar_lote() == 1
+    assert sender.enviados == ["nora@correo.com"] * 2
+    assert {c.estado for c in _correos(db, referencia_id=reunion.id)} == {"enviado"}
+    db.close()
+
+def test_reintentos_con_backoff_y_dead_letter(sesiones):
+    db = sesiones()
+    outbox = OutboxRepository(db)
+    for destinatario in ("caido@correo.com", "inexistente@correo.com"):
+        outbox.encolar(destinatario, "Aviso", "Hola")
+    db.commit()
+    sender = SenderFalso({
+        "caido@correo.com": smtplib.SMTPServerDisconnected("conexión cerrada"),
+        "inexistente@correo.com": smtplib.SMTPRecipientsRefused({"inexistente@correo.com": (550, b"no existe")}),
+    })
+    entrega = EntregaCorreos(sender, max_intentos=3, backoff_segundos=3600, session_factory=sesiones)
+    assert entrega.procesar_lote() == 2
+    caido, = _correos(db, destinatario="caido@correo.com")
+    inexistente, = _correos(db, destinatario="inexistente@correo.com")
+    assert (caido.estado, caido.intentos) == ("pendiente", 1) and caido.proximo_intento > caido.creado_en
+    assert (inexistente.estado, inexistente.intentos) == ("fallido", 1) and "550" in inexistente.ultimo_error
+    # Con backoff en curso no se vuelve a reclamar
+    assert entrega.procesar_lote() == 0
+
+    db.query(CorreoSaliente).filter_by(id=caido.id).update({"proximo_intento": caido.creado_en})
+    db.commit()
+    entrega.backoff = lambda intentos: 0
+    assert entrega.procesar_lote() == 1 and entrega.procesar_lote() == 1
+    assert (_correos(db, id=caido.id)[0].estado, entrega.estadisticas()["fallidos"]) == ("fallido", 2)
+
+    assert outbox.reintentar(caido.id)["estado"] == "pendiente"
+    sender.errores.clear()
+    assert entrega.procesar_lote() == 1 and _correos(db, id=caido.id)[0].estado == "enviado"
+    db.close()
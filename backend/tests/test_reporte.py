@@ -0,0 +1,200 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from datetime import date, time
+from sqlalchemy import func
+from src.config.db import SessionLocal
+from src.feacture.egresado.model.egresado import Egresado
+from src.feacture.reunion.model.reunion import Reunion
+from src.feacture.reunion.repository.reunion_repository import ReunionRepository
+from src.feacture.calendario_encargado.repository.calendario_repository import CalendarioRepository
+from src.feacture.reporte.repository.reporte_repository import ReporteRepository
+from src.feacture.reporte.repository.resumen_reunion_repository import ResumenReunionRepository
+
+def _conteos_reales(db):
+    return dict(db.query(Reunion.estado, func.count(Reunion.id)).group_by(Reunion.estado).all())
+
+def test_contadores_de_reuniones_se_mantienen_en_cada_cambio():
+    db = SessionLocal()
+    db.add(Egresado(id="R1", usuario_dni="60000001", nombres="Rosa", apellidos="Reunión", email="rosa@correo.com", password="x"))
+    db.commit()
+    ResumenReunionRepository(db).reconstruir()
+    reuniones = ReunionRepository(db)
+    calendario = CalendarioRepository(db)
+    a = reuniones.solicitar_reunion("R1", date(2025, 1, 10), time(9, 0))
+    b = calendario.reservar_reunion("R1", date(2025, 1, 11), time(10, 0))
+    c = calendario.reservar_reunion("R1", date(2025, 1, 12), time(11, 0))
+    calendario.cambiar_estado_reunion(a.id, "confirmada")
+    calendario.cambiar_estado_reunion(a.id, "realizada")
+    reuniones.cancelar_reunion(b.id)
+    reuniones.modificar_reunion(b.id, date(2025, 1, 13), time(12, 0))
+    calendario.cambiar_estado_reunion(c.id, "realizada")
+
+    conteos = ResumenReunionRepository(db).conteos()
+    assert {e: n for e, n in conteos.items() if n} == _conteos_reales(db)
+    reporte = ReporteRepository(db)
+    assert reporte.resumen_reuniones() == {"agendadas": 1, "realizadas": 2, "canceladas": 0, "confirmadas": 0}
+    assert round(reporte.porcentaje_asistencia(), 2) == 66.67
+
+    # Un desajuste (p. ej. SQL manual) se corrige con la reconstrucción
+    db.query(Reunion).filter_by(id=c.id).update({"estado": "cancelada"})
+    db.commit()
+    assert ResumenReunionRepository(db).reconstruir()["cancelada"] == 1
+    db.close()
+
+def test_cache_de_reportes_agrupa_calculos_e_invalida_con_escrituras():
+    import threading
+    import time as reloj
+    from src.feacture.reporte.service.reporte_service import ReporteService, cache_reportes
+
+    class RepositorioLento:
+        llamadas = 0
+        def egresados_atendidos(self):
+            RepositorioLento.llamadas += 1
+            reloj.sleep(0.2)
+            return 7
+
+    cache_reportes.invalidar()
+    service = ReporteService(RepositorioLento())
+    resultados = []
+    hilos = [threading.Thread(target=lambda: resultados.append(service.egresados_atendidos())) for _ in range(5)]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    assert resultados == [7] * 5 and RepositorioLento.llamadas == 1
+    assert service.egresados_atendidos() == 7 and RepositorioLento.llamadas == 1
+
+    # Una escritura de reuniones invalida los resultados
+    db = SessionLocal()
+    db.add(Egresado(id="R2", usuario_dni="60000002", nombres="Raúl", apellidos="Reporte", email="raul@correo.com", password="x"))
+    db.commit()
+    ReunionRepository(db).solicitar_reunion("R2", date(2025, 2, 1), time(9, 0))
+    db.close()
+    assert service.egresados_atendidos() == 7 and RepositorioLento.llamadas == 2
+
+def test_exportacion_en_memoria_y_derivada_a_disco():
+    from src.feacture.reporte.service.exportacion_reportes import PoolExportacion, fragmentos_archivo
+
+    pool = PoolExportacion(workers=2, max_pendientes=4, memoria_bytes=64 * 1024)
+    pdf = pool.renderizar_sync("pdf", [{"agendadas": 1}])
+    assert b"".join(fragmentos_archivo(pdf)).startswith(b"%PDF") and pdf.closed
+    grande = pool.renderizar_sync("xlsx", [{"carrera_profesional": f"Carrera {i}", "total": i} for i in range(20000)])
+    assert b"".join(fragmentos_archivo(grande)).startswith(b"PK")
+    assert pool.estadisticas()["derivados_a_disco"] == 1
+
+def test_rollup_diario_por_carrera_y_consultas_de_rango():
+    from src.feacture.reporte.model.reunion_diaria import ReunionDiaria
+    from src.feacture.reporte.repository.reunion_diaria_repository import ReunionDiariaRepository
+
+    def rollup(db):
+        return {(f.dia, f.carrera_profesional, f.estado): f.total for f in db.query(ReunionDiaria).all() if f.total}
+
+    db = SessionLocal()
+    db.add(Egresado(id="R3", usuario_dni="60000003", nombres="Rita", apellidos="Rollup", email="rita@correo.com", password="x", carrera_profesional="Enfermería"))
+    db.add(Egresado(id="R4", usuario_dni="60000004", nombres="Rodrigo", apellidos="Rollup", email="rodrigo@correo.com", password="x", carrera_profesional="Contabilidad"))
+    db.commit()
+    ReunionDiariaRepository(db).compactar()
+    reuniones = ReunionRepository(db)
+    calendario = CalendarioRepository(db)
+    a = calendario.reservar_reunion("R3", date(2024, 3, 4), time(9, 0))
+    b = calendario.reservar_reunion("R3", date(2024, 3, 5), time(9, 0))
+    c = reuniones.solicitar_reunion("R4", date(2024, 4, 2), time(9, 0))
+    calendario.cambiar_estado_reunion(a.id, "realizada")
+    reuniones.modificar_reunion(b.id, date(2024, 4, 1), time(10, 0))
+    calendario.cambiar_estado_reunion(c.id, "realizada")
+
+    incremental = rollup(db)
+    ReunionDiariaRepository(db).compactar()
+    assert rollup(db) == incremental
+
+    reporte = ReporteRepository(db)
+    rango = reporte.reuniones_en_rango(date(2024, 3, 1), date(2024, 4, 30))
+    assert (rango["agendadas"], rango["realizadas"], round(rango["porcentaje_asistencia"], 2)) == (1, 2, 66.67)
+    meses = reporte.tendencia_asistencia(date(2024, 3, 1), date(2024, 4, 30), "mes")
+    assert [(m["periodo"], m["agendadas"], m["realizadas"]) for m in meses] == [(date(2024, 3, 1), 0, 1), (date(2024, 4, 1), 1, 1)]
+    semanas = reporte.tendencia_asistencia(date(2024, 3, 1), date(2024, 4, 30), "semana", carrera="Enfermería")
+    assert [s["periodo"] for s in semanas] == [date(2024, 3, 4), date(2024, 4, 1)]
+    carreras = reporte.participacion_carreras(date(2024, 4, 1), date(2024, 4, 30), "mes")
+    assert {(f["carrera_profesional"], f["total"]) for f in carreras} == {("Enfermería", 1), ("Contabilidad", 1)}
+    db.close()
+
+def test_cohortes_sobre_snapshot_columnar():
+    from src.feacture.reporte.service.snapshot_cohortes import SnapshotCohortes
+
+    db = SessionLocal()
+    db.add(Egresado(id="R5", usuario_dni="60000005", nombres="Rocío", apellidos="Cohorte", email="rocio@correo.com", password="x", anio_egreso=1999, genero="F", ciudad="Lima"))
+    db.add(Egresado(id="R6", usuario_dni="60000006", nombres="Ramiro", apellidos="Cohorte", email="ramiro@correo.com", password="x", anio_egreso=1999, genero="M"))
+    db.commit()
+    calendario = CalendarioRepository(db)
+    a = calendario.reservar_reunion("R5", date(2024, 5, 6), time(9, 0))
+    calendario.reservar_reunion("R5", date(2024, 5, 7), time(9, 0))
+    calendario.cambiar_estado_reunion(a.id, "realizada")
+
+    snapshot = SnapshotCohortes()
+    snapshot.asegurar_cargado(db)
+    db.close()
+    resultado = snapshot.cohortes(["anio_egreso", "ciudad"], anio_desde=1999, anio_hasta=1999)
+    assert resultado["snapshot_edad_segundos"] >= 0
+    assert resultado["filas"] == [
+        {"anio_egreso": 1999, "ciudad": "Lima", "egresados": 1, "egresados_atendidos": 1, "reuniones": 2,
+         "agendadas": 1, "confirmadas": 0, "realizadas": 1, "canceladas": 0, "porcentaje_asistencia": 50.0},
+        {"anio_egreso": 1999, "ciudad": None, "egresados": 1, "egresados_atendidos": 0, "reuniones": 0,
+         "agendadas": 0, "confirmadas": 0, "realizadas": 0, "canceladas": 0, "porcentaje_asistencia": 0.0},
+    ]
+
+def test_reporte_en_segundo_plano_genera_artefacto_y_lo_vence(tmp_path):
+    import time as reloj
+    from src.feacture.reporte.service.reporte_job_service import ReporteJobService
+    from src.utils.trabajos import GestorTrabajos, TRABAJOS_FINALIZADOS
+
+    service = ReporteJobService(GestorTrabajos(1, 2, retencion_segundos=60), str(tmp_path))
+    trabajos = [service.encolar("historial", "csv"), service.encolar("carreras", "xlsx")]
+    for trabajo in trabajos:
+        while trabajo.estado not in TRABAJOS_FINALIZADOS:
+            reloj.sleep(0.05)
+    historial, carreras = (service.estado(t.id) for t in trabajos)
+    assert historial["estado"] == "completado" and historial["porcentaje"] == 100.0
+    _, ruta = service.artefacto(trabajos[0].id)
+    with open(ruta, encoding="utf-8") as f:
+        lineas = f.read().splitlines()
+    assert lineas[0].startswith("reunion_id,dni,nombres") and len(lineas) == historial["total"] + 1
+    assert carreras["estado"] == "completado" and service.artefacto(trabajos[1].id)[1].endswith(".xlsx")
+
+    assert service.limpiar_artefactos() == 0
+    assert service.limpiar_artefactos(ahora=reloj.time() + 120) == 2
+    assert service.artefacto(trabajos[0].id)[1] is None
+
+def test_trabajo_cancelado_en_cola_no_se_ejecuta():
+    import threading
+    from src.utils.trabajos import GestorTrabajos
+
+    gestor = GestorTrabajos(1, 3)
+    liberar = threading.Event()
+    llamadas, finalizados = [], []
+    gestor.encolar("ocupado", lambda t: liberar.wait(5))
+    en_cola = gestor.encolar("en_cola", llamadas.append, al_finalizar=lambda: finalizados.append(True))
+    gestor.cancelar(en_cola.id)
+    liberar.set()
+    gestor.executor.shutdown(wait=True)
+    assert (en_cola.estado, en_cola.iniciado_en, llamadas, finalizados) == ("cancelado", None, [], [True])
+
+def test_rollup_compacta_reuniones_sin_egresado_como_sin_carrera(tmp_path):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from src.config.db import Base
+    from src.feacture.reporte.model.reunion_diaria import ReunionDiaria
+    from src.feacture.reporte.repository.reunion_diaria_repository import ReunionDiariaRepository, SIN_CARRERA
+
+    # Base propia: la reunión huérfana no debe alterar los conteos de las demás pruebas
+    engine = create_engine(f"sqlite:///{tmp_path / 'huerfana.db'}")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    ReunionRepository(db).solicitar_reunion("HUERFANO", date(2024, 6, 3), time(9, 0))
+    incremental = [(f.carrera_profesional, f.total) for f in db.query(ReunionDiaria).all()]
+    assert incremental == [(SIN_CARRERA, 1)]
+    ReunionDiariaRepository(db).compactar()
+    assert [(f.carrera_profesional, f.total) for f in db.query(ReunionDiaria).all()] == incremental
+    db.close()
+    engine.dispose()
@@ -0,0 +1,49 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from main import app
+from src.config.db import SessionLocal
+from src.utils.sql_metrics import medir, metricas_sql
+
+client = TestClient(app)
+
+def test_medir_detecta_sentencias_repetidas():
+    db = SessionLocal()
+    with medir("prueba n+1") as medicion:
+        for i in range(6):
+            db.execute(text("SELECT :i"), {"i": i})
+        db.execute(text("SELECT 1"))
+    db.close()
+    assert medicion.consultas == 7
+    assert medicion.repetidas() == {"SELECT ?": 6}
+    assert medicion.cabeceras()["X-DB-Repeated-Queries"] == "1"
+    ruta = next(r for r in metricas_sql.resumen()["rutas"] if r["ruta"] == "prueba n+1")
+    assert ruta["peticiones_con_repetidas"] == 1
+
+def test_cabeceras_por_peticion():
+    response = client.get("/egresado/")
+    assert response.status_code == 200
+    assert int(response.headers["X-DB-Query-Count"]) >= 1
+    assert float(response.headers["X-DB-Time-ms"]) >= 0
+    assert any(r["ruta"] == "GET /egresado/" for r in metricas_sql.resumen()["rutas"])
+
+def test_respuesta_en_streaming_se_mide_al_terminar_sin_cabeceras():
+    from src.feacture.rol.model.rol import Rol
+    from src.feacture.usuario.model.usuario import Usuario
+    from src.utils.auth import AuthService
+    db = SessionLocal()
+    rol = db.query(Rol).filter_by(nombre="admin").first() or Rol(nombre="admin")
+    db.add(Usuario(username="admin.metricas@correo.com", email="admin.metricas@correo.com", password=AuthService().get_password_hash("clave123"), rol=rol))
+    db.commit()
+    db.close()
+    token = client.post("/usuario/login", json={"email": "admin.metricas@correo.com", "password": "clave123"}).json()["access_token"]
+
+    metricas_sql.reiniciar()
+    response = client.get("/egresado/exportar?formato=ndjson", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200 and "X-DB-Query-Count" not in response.headers
+    # Las consultas del cuerpo (lotes de egresados) quedan en el acumulado de la ruta
+    ruta = next(r for r in metricas_sql.resumen()["rutas"] if r["ruta"] == "GET /egresado/exportar")
+    assert ruta["peticiones"] == 1 and ruta["max_consultas"] >= 1